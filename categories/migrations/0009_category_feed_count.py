@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-18 11:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("categories", "0008_alter_category_options"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="feed_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -9,6 +9,10 @@ class Category(CommonModel):
         on_delete=models.CASCADE,
         related_name="categories",
     )
+    feed_count = models.PositiveIntegerField(
+        editable=False,
+        default=0,
+    )
 
     def __str__(self) -> str:
         return f"{self.group}의 {self.name}"
@@ -23,10 +27,6 @@ class Category(CommonModel):
             )
         ]
 
-    @property
-    def feed_count(self):
-        return self.feeds.count()
-
     # def add_default_data():
     #     Category.objects.get_or_create(name='전체글')
 
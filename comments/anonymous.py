@@ -0,0 +1,38 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Max
+from .models import AnonymousNumber
+
+FEED_WRITER_LABEL = "익명(작성자)"
+ALLOCATE_ATTEMPTS = 5
+
+
+def allocate_anonymous_number(feed_pk, user_pk):
+    # (feed, user) 마다 처음 한번만 다음 번호를 매기고 이후에는 저장된 번호를 사용합니다.
+    # 동시에 같은 번호를 매기려 하면 unique 제약에 걸린 쪽이 다시 시도합니다.
+    for attempt in range(ALLOCATE_ATTEMPTS):
+        number = (
+            AnonymousNumber.objects.filter(feed_id=feed_pk, user_id=user_pk)
+            .values_list("number", flat=True)
+            .first()
+        )
+        if number is not None:
+            return number
+        last = AnonymousNumber.objects.filter(feed_id=feed_pk).aggregate(
+            last=Max("number")
+        )["last"]
+        number = (last or 0) + 1
+        try:
+            with transaction.atomic():
+                AnonymousNumber.objects.create(
+                    feed_id=feed_pk, user_id=user_pk, number=number
+                )
+            return number
+        except IntegrityError:
+            if attempt == ALLOCATE_ATTEMPTS - 1:
+                raise
+
+
+def anonymous_label(number, is_feed_writer):
+    if is_feed_writer:
+        return FEED_WRITER_LABEL
+    return f"익명{number or ''}"
@@ -0,0 +1,149 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+from feeds.caches import bump_group_version
+from feeds.models import Feed
+from .models import Comment, TopComment
+
+# 그룹마다 저장해둘 상위 댓글 수
+TOP_COMMENT_LIMIT = 20
+
+
+def refresh_best_comment(feed_pk):
+    best_pk = (
+        Comment.objects.filter(feed_id=feed_pk, like_count__gt=0)
+        .order_by("-like_count", "id")
+        .values_list("pk", flat=True)
+        .first()
+    )
+    Feed.objects.filter(pk=feed_pk).update(best_comment_id=best_pk)
+
+
+def update_best_comment(feed_pk, comment_pk, like_count, delta):
+    best_pk = (
+        Feed.objects.filter(pk=feed_pk)
+        .values_list("best_comment_id", flat=True)
+        .first()
+    )
+    if best_pk == comment_pk:
+        # 베스트 댓글의 좋아요가 줄었다면 다른 댓글이 앞설 수 있습니다.
+        if delta < 0:
+            refresh_best_comment(feed_pk)
+        return True
+    if delta < 0:
+        return False
+    # 좋아요 수가 같다면 먼저 작성된 댓글이 베스트 댓글로 남습니다.
+    return bool(
+        Feed.objects.filter(pk=feed_pk)
+        .filter(
+            Q(best_comment__isnull=True)
+            | Q(best_comment__like_count__lt=like_count)
+            | Q(best_comment__like_count=like_count, best_comment__id__gt=comment_pk)
+        )
+        .update(best_comment_id=comment_pk)
+    )
+
+
+def fill_top_comments(group_pk):
+    # 상위 TOP_COMMENT_LIMIT 개만 남기고, 빈 자리나 더 앞서는 댓글이 있다면 채워 넣습니다.
+    entries = TopComment.objects.filter(group_id=group_pk)
+    ranked = list(
+        entries.order_by("-like_count", "comment_id").values_list(
+            "comment_id", "like_count"
+        )
+    )
+    outsiders = list(
+        Comment.objects.filter(feed__group_id=group_pk, like_count__gt=0)
+        .exclude(pk__in=[comment_pk for comment_pk, _ in ranked])
+        .order_by("-like_count", "id")
+        .values_list("pk", "like_count")[: max(TOP_COMMENT_LIMIT - len(ranked), 1)]
+    )
+    merged = sorted(ranked + outsiders, key=lambda entry: (-entry[1], entry[0]))
+    keep = {comment_pk for comment_pk, _ in merged[:TOP_COMMENT_LIMIT]}
+    entries.exclude(comment_id__in=keep).delete()
+    TopComment.objects.bulk_create(
+        [
+            TopComment(group_id=group_pk, comment_id=comment_pk, like_count=like_count)
+            for comment_pk, like_count in outsiders
+            if comment_pk in keep
+        ]
+    )
+
+
+def update_top_comments(group_pk, comment_pk, like_count, delta):
+    entries = TopComment.objects.filter(group_id=group_pk)
+    ranked = list(
+        entries.order_by("-like_count", "comment_id").values_list(
+            "comment_id", "like_count"
+        )
+    )
+    listed = comment_pk in {entry_pk for entry_pk, _ in ranked}
+    full = len(ranked) >= TOP_COMMENT_LIMIT
+    # 꽉 찼다면 마지막 (경계) 행보다 앞서야 상위 댓글에 들어갑니다.
+    above = not full or (-like_count, comment_pk) < (-ranked[-1][1], ranked[-1][0])
+    if like_count <= 0:
+        if listed:
+            entries.filter(comment_id=comment_pk).delete()
+            fill_top_comments(group_pk)
+        return
+    if listed:
+        entries.filter(comment_id=comment_pk).update(like_count=like_count)
+        # 경계 행이거나 경계 밑으로 내려갔다면 밖의 댓글이 앞설 수 있습니다.
+        if full and delta < 0 and (ranked[-1][0] == comment_pk or not above):
+            fill_top_comments(group_pk)
+        return
+    if not above:
+        return
+    try:
+        with transaction.atomic():
+            TopComment.objects.create(
+                group_id=group_pk, comment_id=comment_pk, like_count=like_count
+            )
+    except IntegrityError:
+        # 동시에 들어온 좋아요가 먼저 추가한 경우
+        entries.filter(comment_id=comment_pk).update(like_count=like_count)
+    if full:
+        fill_top_comments(group_pk)
+
+
+def comment_like_changed(comment_pk, delta):
+    # 댓글 좋아요 수는 좋아요와 같은 트랜잭션에서 갱신하고,
+    # 베스트 댓글 / 그룹 상위 댓글은 커밋된 뒤에 반영합니다.
+    if delta > 0:
+        like_count = F("like_count") + delta
+    else:
+        like_count = Greatest(F("like_count") + delta, 0)
+    Comment.objects.filter(pk=comment_pk).update(like_count=like_count)
+    transaction.on_commit(lambda: update_comment_rankings(comment_pk, delta))
+
+
+def update_comment_rankings(comment_pk, delta):
+    with transaction.atomic():
+        comment = (
+            Comment.objects.filter(pk=comment_pk)
+            .values("feed_id", "feed__group_id", "like_count")
+            .first()
+        )
+        if comment is None:
+            return
+        feed_pk, group_pk = comment["feed_id"], comment["feed__group_id"]
+        if update_best_comment(feed_pk, comment_pk, comment["like_count"], delta):
+            # 피드 목록에 베스트 댓글이 함께 캐시되므로 그룹 캐시를 무효화합니다.
+            bump_group_version(group_pk)
+        update_top_comments(group_pk, comment_pk, comment["like_count"], delta)
+
+
+def comment_deleted(comment):
+    # 베스트 댓글이 지워졌다면 (SET_NULL) 다시 찾고, 그룹 상위 댓글의 빈 자리를 채웁니다.
+    if comment.like_count <= 0:
+        return
+    feed = (
+        Feed.objects.filter(pk=comment.feed_id)
+        .values("best_comment_id", "group_id")
+        .first()
+    )
+    if feed is None:
+        return
+    if feed["best_comment_id"] is None:
+        refresh_best_comment(comment.feed_id)
+    fill_top_comments(feed["group_id"])
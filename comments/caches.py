@@ -0,0 +1,75 @@
+import time
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from likes.models import Commentlike
+from common.serializers import is_field_requested
+
+COMMENT_THREAD_CACHE_TIMEOUT = 60 * 5
+
+
+def thread_version_key(feed_pk):
+    return f"comments:thread_version:{feed_pk}"
+
+
+def get_thread_version(feed_pk):
+    key = thread_version_key(feed_pk)
+    version = cache.get(key)
+    if version is None:
+        # 캐시가 비워져도 이전 버전과 겹치지 않도록 시간값으로 시작합니다.
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def _incr_thread_version(feed_pk):
+    key = thread_version_key(feed_pk)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+
+
+def bump_thread_version(feed_pk):
+    # 댓글 / 대댓글 / 댓글 좋아요가 바뀌면 게시글의 댓글 캐시를 모두 무효화합니다.
+    if feed_pk is None:
+        return
+    _incr_thread_version(feed_pk)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _incr_thread_version(feed_pk))
+
+
+def thread_cache_key(feed_pk, page_key):
+    version = get_thread_version(feed_pk)
+    return f"comments:thread:{feed_pk}:v{version}:{page_key}"
+
+
+def overlay_comment_viewer_fields(comments, request):
+    # 캐시된 댓글 / 대댓글에 요청 유저의 is_like / is_writer 값을 한번의 쿼리로 채워 넣습니다.
+    user = request.user
+    comment_ids = []
+    if is_field_requested(request, "is_like"):
+        comment_ids = [comment["id"] for comment in comments]
+    recomment_ids = [
+        recomment["pk"]
+        for comment in comments
+        for recomment in comment.get("recomment", ())
+    ]
+    liked_comment_ids = set()
+    liked_recomment_ids = set()
+    if comment_ids or recomment_ids:
+        likes = Commentlike.objects.filter(user=user).filter(
+            Q(comment_id__in=comment_ids) | Q(recomment_id__in=recomment_ids)
+        )
+        for comment_id, recomment_id in likes.values_list("comment_id", "recomment_id"):
+            if comment_id:
+                liked_comment_ids.add(comment_id)
+            if recomment_id:
+                liked_recomment_ids.add(recomment_id)
+    for comment in comments:
+        comment["is_like"] = comment["id"] in liked_comment_ids
+        comment["is_writer"] = comment["user"]["pk"] == user.pk
+        for recomment in comment.get("recomment", ()):
+            recomment["is_like"] = recomment["pk"] in liked_recomment_ids
+            recomment["is_writer"] = recomment["user"]["pk"] == user.pk
+    return comments
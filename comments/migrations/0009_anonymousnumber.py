@@ -0,0 +1,118 @@
+# Generated by Django 4.2 on 2026-10-18 12:08
+
+from collections import defaultdict
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Min
+import django.db.models.deletion
+
+
+def fill_anonymous_numbers(apps, schema_editor):
+    # 기존 댓글은 게시글에 처음 댓글 / 대댓글을 작성한 순서대로 번호를 매깁니다.
+    Comment = apps.get_model("comments", "Comment")
+    Recomment = apps.get_model("comments", "Recomment")
+    AnonymousNumber = apps.get_model("comments", "AnonymousNumber")
+    Feed = apps.get_model("feeds", "Feed")
+
+    first_written = defaultdict(dict)
+    for queryset, feed_field in (
+        (Comment.objects.all(), "feed_id"),
+        (Recomment.objects.all(), "comment__feed_id"),
+    ):
+        rows = (
+            queryset.order_by()
+            .values(feed_field, "user_id")
+            .annotate(first=Min("created_at"))
+            .values_list(feed_field, "user_id", "first")
+        )
+        for feed_pk, user_pk, created_at in rows.iterator():
+            written = first_written[feed_pk]
+            if user_pk not in written or created_at < written[user_pk]:
+                written[user_pk] = created_at
+
+    writers = dict(
+        Feed.objects.filter(pk__in=first_written).values_list("pk", "user_id")
+    )
+    numbers = []
+    for feed_pk, written in first_written.items():
+        participants = sorted(
+            (user_pk for user_pk in written if user_pk != writers[feed_pk]),
+            key=lambda user_pk: (written[user_pk], user_pk),
+        )
+        for number, user_pk in enumerate(participants, start=1):
+            numbers.append(
+                AnonymousNumber(feed_id=feed_pk, user_id=user_pk, number=number)
+            )
+    AnonymousNumber.objects.bulk_create(numbers, batch_size=1000)
+
+    for number in numbers:
+        Comment.objects.filter(feed_id=number.feed_id, user_id=number.user_id).update(
+            anonymous_number=number.number
+        )
+        Recomment.objects.filter(
+            comment__feed_id=number.feed_id, user_id=number.user_id
+        ).update(anonymous_number=number.number)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("feeds", "0019_fill_group_category_feed_count"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("comments", "0008_alter_comment_options"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="anonymous_number",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="recomment",
+            name="anonymous_number",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name="AnonymousNumber",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("number", models.PositiveIntegerField()),
+                (
+                    "feed",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="anonymous_numbers",
+                        to="feeds.feed",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="anonymousnumber",
+            constraint=models.UniqueConstraint(
+                fields=("feed", "user"), name="unique_feed_anonymous_user"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="anonymousnumber",
+            constraint=models.UniqueConstraint(
+                fields=("feed", "number"), name="unique_feed_anonymous_number"
+            ),
+        ),
+        migrations.RunPython(fill_anonymous_numbers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,108 @@
+# Generated by Django 4.2 on 2026-10-18 12:15
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+
+TOP_COMMENT_LIMIT = 20
+
+
+def fill_comment_like_counts(apps, schema_editor):
+    Comment = apps.get_model("comments", "Comment")
+    Commentlike = apps.get_model("likes", "Commentlike")
+    TopComment = apps.get_model("comments", "TopComment")
+    Group = apps.get_model("groups", "Group")
+    Comment.objects.update(
+        like_count=Coalesce(
+            Subquery(
+                Commentlike.objects.filter(comment=OuterRef("pk"))
+                .order_by()
+                .values("comment")
+                .annotate(count=Count("pk"))
+                .values("count")
+            ),
+            Value(0),
+        )
+    )
+    group_pks = [None, *Group.objects.values_list("pk", flat=True)]
+    for group_pk in group_pks:
+        comments = (
+            Comment.objects.filter(feed__group_id=group_pk, like_count__gt=0)
+            .order_by("-like_count", "id")
+            .values_list("pk", "like_count")[:TOP_COMMENT_LIMIT]
+        )
+        TopComment.objects.bulk_create(
+            [
+                TopComment(group_id=group_pk, comment_id=pk, like_count=like_count)
+                for pk, like_count in comments
+            ]
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("groups", "0005_group_feed_count"),
+        ("comments", "0009_anonymousnumber"),
+        ("likes", "0006_alter_commentlike_comment_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TopComment",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("like_count", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="like_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["feed", "-like_count", "id"], name="comment_feed_like_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(fields=["-like_count", "id"], name="comment_like_idx"),
+        ),
+        migrations.AddField(
+            model_name="topcomment",
+            name="comment",
+            field=models.OneToOneField(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="top_entry",
+                to="comments.comment",
+            ),
+        ),
+        migrations.AddField(
+            model_name="topcomment",
+            name="group",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="groups.group",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="topcomment",
+            index=models.Index(
+                fields=["group", "-like_count", "comment"],
+                name="top_comment_group_like_idx",
+            ),
+        ),
+        migrations.RunPython(fill_comment_like_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2 on 2026-10-18 12:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("comments", "0010_comment_like_count_topcomment"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"], name="comment_user_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="recomment",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"], name="recomment_user_created_idx"
+            ),
+        ),
+    ]
@@ -16,16 +16,37 @@ class Comment(CommonModel):
     description = models.TextField(
         max_length=255,
     )
+    # 게시글 작성자는 번호 없이 "익명(작성자)" 로 표시합니다.
+    anonymous_number = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    # 댓글 좋아요 생성 / 삭제시 signals 에서 갱신합니다.
+    like_count = models.PositiveIntegerField(
+        editable=False,
+        default=0,
+    )
 
     def __str__(self) -> str:
         return f"{self.description}"
 
     @property
     def commentlikeCount(self):
-        return self.commentlike.count()
+        return self.like_count
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [
+            models.Index(
+                fields=["feed", "-like_count", "id"], name="comment_feed_like_idx"
+            ),
+            models.Index(fields=["-like_count", "id"], name="comment_like_idx"),
+            # 유저의 댓글 목록 (최신순)
+            models.Index(
+                fields=["user", "-created_at", "-id"], name="comment_user_created_idx"
+            ),
+        ]
 
 
 class Recomment(CommonModel):
@@ -39,10 +60,83 @@ class Recomment(CommonModel):
         related_name="recomment",
     )
     description = models.TextField()
+    anonymous_number = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+    )
 
     @property
     def commentlikeCount(self):
+        # with_like_count() 로 조회한 경우 annotate 된 값을 사용합니다.
+        if hasattr(self, "like_count"):
+            return self.like_count
         return self.recommentlike.count()
 
     def __str__(self) -> str:
         return f"{self.description}"
+
+    class Meta:
+        indexes = [
+            # 유저의 대댓글 목록 (최신순)
+            models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="recomment_user_created_idx",
+            ),
+        ]
+
+
+class AnonymousNumber(models.Model):
+    # 게시글에 처음 댓글 / 대댓글을 작성할 때 매긴 익명 번호
+    feed = models.ForeignKey(
+        "feeds.Feed",
+        on_delete=models.CASCADE,
+        related_name="anonymous_numbers",
+    )
+    user = models.ForeignKey(
+        "users.User",
+        on_delete=models.CASCADE,
+    )
+    number = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["feed", "user"],
+                name="unique_feed_anonymous_user",
+            ),
+            models.UniqueConstraint(
+                fields=["feed", "number"],
+                name="unique_feed_anonymous_number",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.feed_id} - 익명{self.number}"
+
+
+class TopComment(models.Model):
+    # 그룹별 좋아요순 상위 댓글 (댓글 좋아요가 바뀔 때마다 갱신)
+    group = models.ForeignKey(
+        "groups.Group",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+    )
+    comment = models.OneToOneField(
+        "comments.Comment",
+        on_delete=models.CASCADE,
+        related_name="top_entry",
+    )
+    like_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.group_id} 그룹 베스트 댓글 {self.comment_id}"
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["group", "-like_count", "comment"],
+                name="top_comment_group_like_idx",
+            ),
+        ]
@@ -0,0 +1,20 @@
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from likes.models import Commentlike
+
+
+def with_like_count(queryset):
+    # 대댓글마다 commentlikeCount 를 COUNT 하지 않도록 좋아요 수를 함께 조회합니다.
+    # (댓글은 like_count 컬럼에 좋아요 수를 저장합니다)
+    return queryset.annotate(
+        like_count=Coalesce(
+            Subquery(
+                Commentlike.objects.filter(recomment=OuterRef("pk"))
+                .order_by()
+                .values("recomment")
+                .annotate(count=Count("pk"))
+                .values("count")
+            ),
+            Value(0),
+        )
+    )
@@ -1,16 +1,19 @@
 from rest_framework.serializers import ModelSerializer
 from .models import Comment, Recomment
+from .anonymous import anonymous_label
 from users.serializers import TinyUserSerializer
 from rest_framework.serializers import SerializerMethodField
 from likes.models import Commentlike
 from . import serializers
+from common.serializers import DynamicFieldsMixin, LikeBatchListSerializer
+from django.db.models import Q
 
 
 class RecommentSerializer(ModelSerializer):
     user = TinyUserSerializer(read_only=True)
     is_like = SerializerMethodField()
     is_writer = SerializerMethodField()
-    # anonymous_number = SerializerMethodField()
+    anonymous_number = SerializerMethodField()
     feed_writer = SerializerMethodField()
 
     class Meta:
@@ -23,14 +26,36 @@ class RecommentSerializer(ModelSerializer):
             "commentlikeCount",
             "description",
             "feed_writer",
+            "anonymous_number",
             "is_like",
             "is_writer",
         )
+        list_serializer_class = LikeBatchListSerializer
+
+    def load_likes(self, recomments, user):
+        # 댓글 목록에서 이미 함께 조회한 경우 다시 조회하지 않습니다.
+        if self.context.get("recomment_likes_loaded"):
+            return
+        liked_recomment_ids = self.context.setdefault("liked_recomment_ids", set())
+        liked_recomment_ids.update(
+            Commentlike.objects.filter(user=user, recomment__in=recomments).values_list(
+                "recomment_id", flat=True
+            )
+        )
+
+    def get_feed_writer_id(self, obj):
+        # 한 게시글의 댓글을 직렬화할 때는 context 로 게시글 작성자를 넘겨받습니다.
+        if "feed_writer_id" in self.context:
+            return self.context["feed_writer_id"]
+        return obj.comment.feed.user_id
 
     def get_feed_writer(self, obj):
-        return obj.user == obj.comment.feed.user
+        return obj.user_id == self.get_feed_writer_id(obj)
 
     def get_is_like(self, data):
+        liked_recomment_ids = self.context.get("liked_recomment_ids")
+        if liked_recomment_ids is not None:
+            return data.pk in liked_recomment_ids
         request = self.context.get("request")
         if request:
             if request.user.is_authenticated:
@@ -44,26 +69,22 @@ class RecommentSerializer(ModelSerializer):
         request = self.context.get("request")
         if request:
             if request.user.is_authenticated:
-                return request.user == data.user
+                return request.user.pk == data.user_id
         return False
 
-    # def get_anonymous_number(self, obj):
-    #     comments = Comment.objects.filter(feed=obj.comment.feed)
-    #     recomments = Recomment.objects.filter(comment__in=comments)
-    #     queryset = list(obj.comment for obj in recomments) + list(comments)
-    #     queryset.sort(key=lambda obj: obj.created_at)
-    #     for i in queryset:
-    #         print(i.user)
-    #     return False
+    def get_anonymous_number(self, obj):
+        return anonymous_label(
+            obj.anonymous_number, obj.user_id == self.get_feed_writer_id(obj)
+        )
 
 
-class CommentSerializer(ModelSerializer):
+class CommentSerializer(DynamicFieldsMixin, ModelSerializer):
     user = TinyUserSerializer(read_only=True)
     recomment = serializers.RecommentSerializer(read_only=True, many=True)
     is_like = SerializerMethodField()
     is_writer = SerializerMethodField()
     feed_writer = SerializerMethodField()
-    # annoy_number = SerializerMethodField()
+    anonymous_number = SerializerMethodField()
 
     class Meta:
         model = Comment
@@ -77,19 +98,47 @@ class CommentSerializer(ModelSerializer):
             "is_like",
             "is_writer",
             "feed_writer",
-            # "annoy_number",
+            "anonymous_number",
         )
+        list_serializer_class = LikeBatchListSerializer
+
+    def load_likes(self, comments, user):
+        if not (
+            self.is_field_requested("is_like") or self.is_field_requested("recomment")
+        ):
+            return
+        # 댓글과 대댓글의 좋아요 여부를 한번의 쿼리로 조회
+        likes = Commentlike.objects.filter(user=user).filter(
+            Q(comment__in=comments) | Q(recomment__comment__in=comments)
+        )
+        liked_comment_ids = set()
+        liked_recomment_ids = set()
+        for comment_id, recomment_id in likes.values_list("comment_id", "recomment_id"):
+            if comment_id:
+                liked_comment_ids.add(comment_id)
+            if recomment_id:
+                liked_recomment_ids.add(recomment_id)
+        self.context["liked_comment_ids"] = liked_comment_ids
+        self.context["liked_recomment_ids"] = liked_recomment_ids
+        self.context["recomment_likes_loaded"] = True
+
+    def get_feed_writer_id(self, obj):
+        if "feed_writer_id" in self.context:
+            return self.context["feed_writer_id"]
+        return obj.feed.user_id
 
     def get_feed_writer(self, obj):
-        return obj.user == obj.feed.user
+        return obj.user_id == self.get_feed_writer_id(obj)
 
-    # def get_annoy_number(self, obj):
-    #     if self.get_feed_writer(obj):
-    #         return "익명(작성자)"
-    #     else:
-    #         return "익명1"
+    def get_anonymous_number(self, obj):
+        return anonymous_label(
+            obj.anonymous_number, obj.user_id == self.get_feed_writer_id(obj)
+        )
 
     def get_is_like(self, data):
+        liked_comment_ids = self.context.get("liked_comment_ids")
+        if liked_comment_ids is not None:
+            return data.pk in liked_comment_ids
         request = self.context.get("request")
         if request:
             if request.user.is_authenticated:
@@ -103,7 +152,7 @@ class CommentSerializer(ModelSerializer):
         request = self.context.get("request")
         if request:
             if request.user.is_authenticated:
-                return request.user == data.user
+                return request.user.pk == data.user_id
         return False
 
 
@@ -0,0 +1,44 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from feeds.models import Feed
+from likes.models import Commentlike
+from .models import Comment, Recomment
+from .anonymous import allocate_anonymous_number
+from .best import comment_deleted, comment_like_changed
+
+
+def assign_anonymous_number(instance, feed):
+    if not instance._state.adding or instance.anonymous_number is not None:
+        return
+    if instance.user_id != feed.user_id:
+        instance.anonymous_number = allocate_anonymous_number(feed.pk, instance.user_id)
+
+
+@receiver(pre_save, sender=Comment)
+def assign_comment_anonymous_number(sender, instance, **kwargs):
+    assign_anonymous_number(instance, instance.feed)
+
+
+@receiver(pre_save, sender=Recomment)
+def assign_recomment_anonymous_number(sender, instance, **kwargs):
+    assign_anonymous_number(instance, instance.comment.feed)
+
+
+@receiver(post_save, sender=Commentlike)
+def count_comment_like(sender, instance, created, **kwargs):
+    if created and instance.comment_id:
+        comment_like_changed(instance.comment_id, 1)
+
+
+@receiver(post_delete, sender=Commentlike)
+def uncount_comment_like(sender, instance, origin=None, **kwargs):
+    # 댓글 / 게시글과 함께 지워지는 좋아요는 다시 계산하지 않습니다.
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if instance.comment_id and origin_model not in (Comment, Feed):
+        comment_like_changed(instance.comment_id, -1)
+
+
+@receiver(post_delete, sender=Comment)
+def update_best_comment_on_delete(sender, instance, **kwargs):
+    comment_deleted(instance)
@@ -1,9 +1,15 @@
+from unittest import mock
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APITestCase
-from .models import Comment, Recomment
+from .best import TOP_COMMENT_LIMIT
+from .models import AnonymousNumber, Comment, Recomment, TopComment
 from users.models import User
 from groups.models import Group
 from feeds.models import Feed
 from categories.models import Category
+from likes.models import Commentlike
 
 
 class CommentDelete(APITestCase):
@@ -161,3 +167,219 @@ class CommentTest(APITestCase):
         response = self.client.delete("/api/v1/comments/recomment/3")
         self.assertEqual(response.status_code, 404, "does not exist pk")
         self.client.logout()
+
+
+class AnonymousNumberAssign(APITestCase):
+    def setUp(self):
+        self.group = Group.objects.create(name="TestGroup")
+        self.category = Category.objects.create(name="TestCategory", group=self.group)
+        self.writer, self.first, self.second = [
+            User.objects.create(
+                username=f"Anonymous{index}",
+                group=self.group,
+                email=f"Anonymous{index}@Test.com",
+            )
+            for index in range(3)
+        ]
+        self.feed = Feed.objects.create(
+            user=self.writer,
+            title="TestTitle",
+            category=self.category,
+            group=self.group,
+        )
+
+    def test_numbers_follow_first_participation(self):
+        comment = Comment.objects.create(
+            description="first", user=self.first, feed=self.feed
+        )
+        recomment = Recomment.objects.create(
+            description="second", user=self.second, comment=comment
+        )
+        writer_comment = Comment.objects.create(
+            description="writer", user=self.writer, feed=self.feed
+        )
+        again = Comment.objects.create(
+            description="again", user=self.first, feed=self.feed
+        )
+        self.assertEqual(
+            (
+                comment.anonymous_number,
+                recomment.anonymous_number,
+                writer_comment.anonymous_number,
+                again.anonymous_number,
+            ),
+            (1, 2, None, 1),
+        )
+        # 댓글을 지워도 이미 매긴 번호는 바뀌지 않습니다.
+        comment.delete()
+        third = Comment.objects.create(
+            description="third", user=self.second, feed=self.feed
+        )
+        self.assertEqual(third.anonymous_number, 2)
+        self.assertEqual(AnonymousNumber.objects.filter(feed=self.feed).count(), 2)
+
+    def test_post_returns_label(self):
+        self.client.force_login(self.first)
+        response = self.client.post(
+            f"/api/v1/feeds/{self.feed.pk}/comment/", {"description": "first"}
+        )
+        self.assertEqual(response.data["anonymous_number"], "익명1")
+        self.client.force_login(self.writer)
+        response = self.client.post(
+            f"/api/v1/feeds/{self.feed.pk}/comment/{response.data['id']}/recomment/",
+            {"description": "writer"},
+        )
+        self.assertEqual(response.data["anonymous_number"], "익명(작성자)")
+
+
+class BestComment(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.group = Group.objects.create(name="TestGroup")
+        self.other_group = Group.objects.create(name="OtherGroup")
+        self.writer, self.first, self.second = [
+            User.objects.create(
+                username=f"Best{index}",
+                group=self.group,
+                email=f"Best{index}@Test.com",
+            )
+            for index in range(3)
+        ]
+        self.feed = Feed.objects.create(
+            user=self.writer,
+            title="TestTitle",
+            category=Category.objects.get(group=self.group, name="일반글"),
+            group=self.group,
+        )
+        self.comments = [
+            Comment.objects.create(description=str(index), user=user, feed=self.feed)
+            for index, user in enumerate([self.first, self.second])
+        ]
+
+    def toggle(self, user, comment):
+        self.client.force_login(user)
+        # 베스트 댓글 / 상위 댓글은 커밋된 뒤에 반영됩니다.
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(f"/api/v1/likes/commentlike/{comment.pk}")
+
+    def best_comment_id(self):
+        self.feed.refresh_from_db()
+        return self.feed.best_comment_id
+
+    def test_best_comment_follows_likes(self):
+        self.assertIsNone(self.best_comment_id())
+        self.toggle(self.writer, self.comments[1])
+        self.assertEqual(self.best_comment_id(), self.comments[1].pk)
+        # 좋아요 수가 같다면 먼저 작성된 댓글이 베스트 댓글입니다.
+        self.toggle(self.writer, self.comments[0])
+        self.assertEqual(self.best_comment_id(), self.comments[0].pk)
+        self.toggle(self.first, self.comments[1])
+        self.assertEqual(self.best_comment_id(), self.comments[1].pk)
+        self.toggle(self.first, self.comments[1])
+        self.assertEqual(self.best_comment_id(), self.comments[0].pk)
+        self.assertEqual(Comment.objects.get(pk=self.comments[1].pk).like_count, 1)
+
+        self.client.force_login(self.first)
+        self.client.delete(f"/api/v1/comments/{self.comments[0].pk}")
+        self.assertEqual(self.best_comment_id(), self.comments[1].pk)
+
+    def test_top_comments(self):
+        other_feed = Feed.objects.create(
+            user=self.writer,
+            title="Other",
+            category=Category.objects.get(group=self.other_group, name="일반글"),
+            group=self.other_group,
+        )
+        other_comment = Comment.objects.create(
+            description="other", user=self.writer, feed=other_feed
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            Commentlike.objects.create(user=self.writer, comment=other_comment)
+        self.toggle(self.writer, self.comments[1])
+        self.toggle(self.first, self.comments[1])
+        self.toggle(self.writer, self.comments[0])
+        response = self.client.get("/api/v1/comments/toplike")
+        self.assertEqual(
+            [
+                (comment["id"], comment["commentlikeCount"], comment["feed"])
+                for comment in response.data
+            ],
+            [
+                (self.comments[1].pk, 2, self.feed.pk),
+                (self.comments[0].pk, 1, self.feed.pk),
+            ],
+        )
+        self.assertTrue(response.data[1]["is_like"])
+        self.assertNotIn("recomment", response.data[0])
+
+    def test_top_comments_refill_only_at_cutoff(self):
+        users = [
+            User.objects.create(
+                username=f"Top{index}",
+                group=self.group,
+                email=f"Top{index}@Test.com",
+            )
+            for index in range(3)
+        ]
+        comments = [
+            Comment.objects.create(
+                description=str(index), user=self.writer, feed=self.feed
+            )
+            for index in range(TOP_COMMENT_LIMIT + 1)
+        ]
+        for comment in comments[:TOP_COMMENT_LIMIT]:
+            with self.captureOnCommitCallbacks(execute=True):
+                Commentlike.objects.create(user=users[0], comment=comment)
+                Commentlike.objects.create(user=users[1], comment=comment)
+        boundary, outsider = comments[TOP_COMMENT_LIMIT - 1], comments[-1]
+
+        with mock.patch("comments.best.fill_top_comments") as fill:
+            # 상위권 안에서 오르내리거나, 밖에 머무는 경우는 그 자리에서 갱신합니다.
+            self.toggle(users[2], comments[0])
+            self.toggle(users[2], comments[0])
+            self.toggle(users[2], outsider)
+            fill.assert_not_called()
+            # 경계 행이 줄어든 경우
+            self.toggle(users[0], boundary)
+            fill.assert_called_once()
+        self.assertEqual(TopComment.objects.get(comment=comments[0]).like_count, 2)
+
+        # 밖의 댓글이 경계를 넘으면 상위 댓글이 다시 채워집니다.
+        self.toggle(users[0], outsider)
+        self.assertTrue(TopComment.objects.filter(comment=outsider).exists())
+        self.assertFalse(TopComment.objects.filter(comment=boundary).exists())
+        self.assertEqual(
+            TopComment.objects.filter(group=self.group).count(), TOP_COMMENT_LIMIT
+        )
+
+    def test_rankings_wait_for_commit(self):
+        self.client.force_login(self.writer)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.client.post(f"/api/v1/likes/commentlike/{self.comments[0].pk}")
+        self.assertEqual(Comment.objects.get(pk=self.comments[0].pk).like_count, 1)
+        self.assertIsNone(self.best_comment_id())
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.best_comment_id(), self.comments[0].pk)
+
+    def test_feed_list_inline(self):
+        self.client.force_login(self.first)
+        category = Category.objects.get(group=self.group, name="전체글")
+        params = {"group_id": self.group.pk, "category_id": category.pk}
+        with CaptureQueriesContext(connection) as before:
+            response = self.client.get("/api/v1/feeds/group/category/", params)
+        self.assertIsNone(response.data["results"][0]["best_comment"])
+
+        self.toggle(self.writer, self.comments[0])
+        with CaptureQueriesContext(connection) as after:
+            response = self.client.get("/api/v1/feeds/group/category/", params)
+        self.assertEqual(
+            response.data["results"][0]["best_comment"],
+            {
+                "id": self.comments[0].pk,
+                "description": "0",
+                "commentlikeCount": 1,
+                "anonymous_number": "익명1",
+            },
+        )
+        self.assertEqual(len(before), len(after))
@@ -5,4 +5,5 @@ urlpatterns = [
     path("<int:pk>", views.CommentDetail.as_view()),
     # path("<int:comment_pk>/recomments/<int:recomment_pk>", views.Recomments.as_view()),
     path("recomments/<int:recomment_pk>", views.DeleteRecomment.as_view()),
+    path("toplike", views.TopLikeView.as_view()),
 ]
@@ -1,12 +1,18 @@
 from django.shortcuts import get_object_or_404
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
-from django.db.models import Count
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.exceptions import NotFound, ParseError, PermissionDenied
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
-from .models import Comment, Recomment
+from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
+from .models import Comment, Recomment, TopComment
+from feeds.models import Feed
+from feeds.ranking import update_feed_ranking
+from feeds.caches import bump_group_version
+from .caches import bump_thread_version
 from . import serializers
 
 
@@ -23,33 +29,52 @@ class CommentDetail(APIView):
         },
     )
     def delete(self, request, pk):
-        comment = get_object_or_404(Comment, pk=pk)
+        comment = get_object_or_404(Comment.objects.select_related("feed"), pk=pk)
         if comment.user != request.user:
             if not request.user.is_coach:
                 if not request.user.is_staff:
                     raise PermissionDenied
-        comment.delete()
+        with transaction.atomic():
+            removed = comment.recomment.count() + 1
+            comment.delete()
+            Feed.objects.filter(pk=comment.feed_id).update(
+                comments_count=Greatest(F("comments_count") - removed, 0)
+            )
+            update_feed_ranking(comment.feed_id)
+            bump_group_version(comment.feed.group_id)
+            bump_thread_version(comment.feed_id)
         return Response(status=204)
 
 
 class TopLikeView(APIView):
+    permission_classes = [IsAuthenticated]
+
     @swagger_auto_schema(
         operation_summary="베스트 댓글 api",
+        operation_description="요청 유저 그룹의 좋아요순 상위 댓글 (최대 20개, 좋아요가 같다면 먼저 작성된 순)",
         responses={
             200: openapi.Response(
                 description="Successful Response",
-                schema=serializers.CommentSerializer(),
+                schema=serializers.CommentSerializer(many=True),
             )
         },
     )
     def get(self, request):
-        feed = (
-            Comment.objects.annotate(like_count=Count("commentlike"))
-            .order_by("-like_count")
-            .first()
+        entries = (
+            TopComment.objects.filter(group_id=request.user.group_id)
+            .select_related("comment__user", "comment__feed")
+            .order_by("-like_count", "comment_id")
+        )
+        comments = [entry.comment for entry in entries]
+        serializer = serializers.CommentSerializer(
+            comments,
+            many=True,
+            context={"request": request, "omit": {"recomment"}},
         )
-        serializer = serializers.CommentSerializer(feed, many=True)
-        return Response(serializer.data)
+        data = serializer.data
+        for comment, comment_data in zip(comments, data):
+            comment_data["feed"] = comment.feed_id
+        return Response(data)
 
 
 class Recomments(APIView):
@@ -69,10 +94,20 @@ class DeleteRecomment(APIView):
         },
     )
     def delete(self, request, recomment_pk):
-        recomment = get_object_or_404(Recomment, pk=recomment_pk)
+        recomment = get_object_or_404(
+            Recomment.objects.select_related("comment__feed"), pk=recomment_pk
+        )
         if recomment.user != request.user:
             if not request.user.is_coach:
                 if not request.user.is_staff:
                     raise PermissionDenied
-        recomment.delete()
+        feed = recomment.comment.feed
+        with transaction.atomic():
+            recomment.delete()
+            Feed.objects.filter(pk=feed.pk).update(
+                comments_count=Greatest(F("comments_count") - 1, 0)
+            )
+            update_feed_ranking(feed.pk)
+            bump_group_version(feed.group_id)
+            bump_thread_version(feed.pk)
         return Response(status=204)
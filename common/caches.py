@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS
+
+# 모아두었다가 한번에 반영하는 쓰기(조회수, 좋아요)는 모든 프로세스가 함께 쓰고
+# timeout=None 인 키를 임의로 지우지 않는 캐시에서만 사용합니다.
+# 로컬 메모리 캐시는 프로세스마다 따로 쌓이고 300 개가 넘으면 키를 지우므로 사용하지 않습니다.
+SHARED_CACHE_BACKENDS = (
+    "django.core.cache.backends.redis.RedisCache",
+    "django_redis.cache.RedisCache",
+)
+
+
+def is_shared_cache(alias=DEFAULT_CACHE_ALIAS):
+    backend = settings.CACHES.get(alias, {}).get("BACKEND")
+    return backend in SHARED_CACHE_BACKENDS
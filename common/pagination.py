@@ -0,0 +1,189 @@
+import json
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import Paginator
+from django.db.models import Q
+from rest_framework.exceptions import ParseError
+
+COUNT_CACHE_TIMEOUT = 60
+CURSOR_SALT = "common.pagination.cursor"
+
+
+class CursorSerializer:
+    # datetime 등은 문자열로 저장하고 page() 에서 필드 타입으로 다시 변환합니다.
+    def dumps(self, obj):
+        return json.dumps(obj, separators=(",", ":"), default=str).encode("latin-1")
+
+    def loads(self, data):
+        return json.loads(data.decode("latin-1"))
+
+
+def encode_cursor(position, reverse=False):
+    # 서명해서 클라이언트가 임의의 위치를 만들어 보낼 수 없도록 합니다.
+    return signing.dumps(
+        {"p": position, "r": reverse}, salt=CURSOR_SALT, serializer=CursorSerializer
+    )
+
+
+def decode_cursor(cursor):
+    try:
+        data = signing.loads(cursor, salt=CURSOR_SALT, serializer=CursorSerializer)
+        position, reverse = data["p"], data["r"]
+    except (signing.BadSignature, ValueError, TypeError, KeyError):
+        raise ParseError("Invalid cursor")
+    if not isinstance(position, list) or not isinstance(reverse, bool):
+        raise ParseError("Invalid cursor")
+    return position, reverse
+
+
+class CursorPage:
+    def __init__(self, object_list, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+class CursorPaginator:
+    # ordering 의 모든 필드는 같은 방향(기본 내림차순)으로 정렬되며 마지막 필드는 유일해야 합니다.
+    # ex) ("created_at", "id")
+    def __init__(self, queryset, ordering, per_page, descending=True):
+        self.queryset = queryset
+        self.ordering = ordering
+        self.per_page = per_page
+        self.descending = descending
+
+    def base_queryset(self):
+        return self.queryset
+
+    def ordering_field(self, name):
+        # annotate 된 값(ex. rank)은 output_field, 나머지는 모델 필드로 변환합니다.
+        queryset = self.base_queryset()
+        annotation = queryset.query.annotations.get(name)
+        if annotation is not None:
+            return annotation.output_field
+        model = queryset.model
+        *relations, name = name.split("__")
+        for relation in relations:
+            model = model._meta.get_field(relation).related_model
+        return model._meta.get_field(name)
+
+    def to_position(self, position):
+        if len(position) != len(self.ordering):
+            raise ParseError("Invalid cursor")
+        values = []
+        for name, value in zip(self.ordering, position):
+            if value is None or isinstance(value, (list, dict)):
+                raise ParseError("Invalid cursor")
+            try:
+                value = self.ordering_field(name).to_python(value)
+            except (ValidationError, FieldDoesNotExist, TypeError, ValueError):
+                raise ParseError("Invalid cursor")
+            if value is None:
+                raise ParseError("Invalid cursor")
+            values.append(value)
+        return values
+
+    def position(self, obj):
+        # .values() 로 조회한 dict row 도 지원합니다.
+        if isinstance(obj, dict):
+            return [obj[field] for field in self.ordering]
+        values = []
+        for field in self.ordering:
+            value = obj
+            for attr in field.split("__"):
+                value = getattr(value, attr)
+            values.append(value)
+        return values
+
+    def seek(self, position, reverse):
+        lookup = "gt" if reverse == self.descending else "lt"
+        condition = Q()
+        for index, field in enumerate(self.ordering):
+            step = Q(**{f"{field}__{lookup}": position[index]})
+            for prev_index in range(index):
+                step &= Q(**{self.ordering[prev_index]: position[prev_index]})
+            condition |= step
+        return condition
+
+    def order_by(self, reverse, ordering=None):
+        prefix = "" if reverse == self.descending else "-"
+        return [prefix + field for field in ordering or self.ordering]
+
+    def fetch(self, position, reverse, limit):
+        queryset = self.queryset
+        if position is not None:
+            queryset = queryset.filter(self.seek(position, reverse))
+        return list(queryset.order_by(*self.order_by(reverse))[:limit])
+
+    def page(self, cursor=None):
+        position, reverse = None, False
+        if cursor:
+            position, reverse = decode_cursor(cursor)
+            position = self.to_position(position)
+
+        object_list = self.fetch(position, reverse, self.per_page + 1)
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[: self.per_page]
+        if reverse:
+            object_list.reverse()
+
+        next_cursor = previous_cursor = None
+        if object_list:
+            if has_more or reverse:
+                next_cursor = encode_cursor(self.position(object_list[-1]))
+            if cursor and (has_more or not reverse):
+                previous_cursor = encode_cursor(
+                    self.position(object_list[0]), reverse=True
+                )
+        return CursorPage(object_list, next_cursor, previous_cursor)
+
+
+class UnionCursorPaginator(CursorPaginator):
+    # 같은 컬럼을 .values() 로 조회하는 여러 queryset 을 UNION ALL 한 목록의 페이지를 나눕니다.
+    # 각 queryset 에서 먼저 한 페이지만큼만 골라 합치므로 전체 개수와 상관없이 한번의 쿼리로 조회합니다.
+    # branch_ordering 은 queryset 안에서의 정렬이며 queryset 마다 값이 고정된 필드(ex. kind)는 뺍니다.
+    # ex) ordering=("created_at", "kind", "id"), branch_ordering=("created_at", "id")
+    def __init__(self, querysets, ordering, per_page, branch_ordering, descending=True):
+        super().__init__(None, ordering, per_page, descending)
+        self.querysets = querysets
+        self.branch_ordering = branch_ordering
+
+    def base_queryset(self):
+        return self.querysets[0]
+
+    def fetch(self, position, reverse, limit):
+        branches = []
+        for queryset in self.querysets:
+            selected = queryset
+            if position is not None:
+                selected = selected.filter(self.seek(position, reverse))
+            selected = selected.order_by(
+                *self.order_by(reverse, self.branch_ordering)
+            ).values("pk")[:limit]
+            branches.append(queryset.filter(pk__in=selected).order_by())
+        queryset = branches[0].union(*branches[1:], all=True)
+        return list(queryset.order_by(*self.order_by(reverse))[:limit])
+
+
+class CountedPaginator(Paginator):
+    # 미리 알고 있는 count 를 넘겨받으면 COUNT(*) 쿼리를 실행하지 않습니다.
+    def __init__(self, object_list, per_page, count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        if count is not None:
+            self.__dict__["count"] = count
+
+
+def cached_count(queryset, key, timeout=COUNT_CACHE_TIMEOUT):
+    # 유지되는 카운터가 없는 목록은 정확한 개수를 잠시 캐시해두고 사용합니다.
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, timeout)
+    return count
@@ -0,0 +1,67 @@
+from django.db import models
+from rest_framework.serializers import ListSerializer
+
+
+def split_field_names(value):
+    return {name.strip() for name in (value or "").split(",") if name.strip()}
+
+
+def get_field_params(request):
+    # ?fields=id,title 는 해당 필드만, ?omit=thumbnail 은 해당 필드를 제외하고 돌려줍니다.
+    if request is None:
+        return None, set()
+    fields = request.GET.get("fields")
+    return (
+        split_field_names(fields) if fields else None,
+        split_field_names(request.GET.get("omit")),
+    )
+
+
+def is_field_requested(request, name):
+    fields, omit = get_field_params(request)
+    return (fields is None or name in fields) and name not in omit
+
+
+def filter_fields(results, request):
+    # 캐시된 직렬화 데이터에 ?fields= / ?omit= 를 적용합니다.
+    fields, omit = get_field_params(request)
+    if fields is None and not omit:
+        return results
+    return [
+        {
+            name: value
+            for name, value in item.items()
+            if is_field_requested(request, name)
+        }
+        for item in results
+    ]
+
+
+class DynamicFieldsMixin:
+    # 최상위 serializer 에만 ?fields= / ?omit= 를 적용합니다.
+    # 제외된 SerializerMethodField 는 호출되지 않으므로 관련 쿼리도 실행되지 않습니다.
+    # request 없이 직렬화할 때는 context 의 omit 으로 필드를 제외할 수 있습니다.
+    def is_field_requested(self, name):
+        if self.root is not self and self.root is not self.parent:
+            return True
+        if name in self.context.get("omit", ()):
+            return False
+        return is_field_requested(self.context.get("request"), name)
+
+    @property
+    def _readable_fields(self):
+        for field in super()._readable_fields:
+            if self.is_field_requested(field.field_name):
+                yield field
+
+
+class LikeBatchListSerializer(ListSerializer):
+    # 페이지 단위로 요청 유저의 좋아요 여부를 한번에 조회해 context 에 담아둡니다.
+    # child serializer 는 load_likes(instances, user) 를 구현해야 합니다.
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        instances = list(iterable)
+        request = self.context.get("request")
+        if instances and request and request.user.is_authenticated:
+            self.child.load_likes(instances, request.user)
+        return super().to_representation(instances)
@@ -151,6 +151,12 @@ DATABASES = {
     }
 }
 
+# 인기글에 좋아요가 몰릴 때 좋아요를 캐시에 모아두었다가 한번에 반영합니다. (likes/buffer.py)
+# 캐시에 쌓인 좋아요가 사라지지 않도록 모든 프로세스가 함께 쓰는 Redis 캐시(아래 CACHES,
+# maxmemory-policy noeviction)가 필요하며, 로컬 메모리 캐시로는 켤 수 없습니다. (common/caches.py)
+# 조회수는 같은 캐시가 없다면 프로세스 메모리에 모아서 반영합니다. (feeds/visits.py)
+LIKE_WRITE_BUFFER = env.bool("LIKE_WRITE_BUFFER", default=False)
+
 # CACHES = {
 #     "default": {
 #         "BACKEND": "django_redis.cache.RedisCache",
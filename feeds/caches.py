@@ -0,0 +1,115 @@
+import hashlib
+import time
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.http import http_date
+from likes.buffer import add_pending_likes, liked_feed_ids
+from common.caches import is_shared_cache
+from common.serializers import is_field_requested
+
+FEED_PAGE_CACHE_TIMEOUT = 60 * 5
+# 전체 게시글 수 (게시글 작성 / 삭제시 지워집니다)
+ALL_FEED_COUNT_KEY = "feeds:count:all"
+
+
+def group_version_key(group_pk):
+    return f"feeds:group_version:{group_pk}"
+
+
+def get_group_version(group_pk):
+    key = group_version_key(group_pk)
+    version = cache.get(key)
+    if version is None:
+        # 캐시가 비워져도 이전 버전과 겹치지 않도록 시간값으로 시작합니다.
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def group_modified_key(group_pk):
+    return f"feeds:group_modified:{group_pk}"
+
+
+def get_group_modified(group_pk):
+    # 그룹 버전이 마지막으로 바뀐 시각 (Last-Modified 에 사용)
+    key = group_modified_key(group_pk)
+    modified = cache.get(key)
+    if modified is None:
+        cache.add(key, int(time.time()), timeout=None)
+        modified = cache.get(key)
+    return modified
+
+
+def group_pending_key(group_pk):
+    return f"feeds:group_pending:{group_pk}"
+
+
+def get_group_pending(group_pk):
+    # 아직 DB 에 반영되지 않은 조회수 / 좋아요가 쌓일 때마다 바뀝니다. (ETag 에 사용)
+    key = group_pending_key(group_pk)
+    pending = cache.get(key)
+    if pending is None:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        pending = cache.get(key)
+    return pending
+
+
+def _incr_version(key, group_pk):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+    cache.set(group_modified_key(group_pk), int(time.time()), timeout=None)
+
+
+def _incr_group_version(group_pk):
+    _incr_version(group_version_key(group_pk), group_pk)
+
+
+def touch_group_pending(group_pk):
+    if group_pk is not None:
+        _incr_version(group_pending_key(group_pk), group_pk)
+
+
+def bump_group_version(group_pk):
+    if group_pk is None:
+        return
+    _incr_group_version(group_pk)
+    # 트랜잭션 안이라면 커밋 이후에 한번 더 올려서 커밋 전 데이터가 캐시되지 않도록 합니다.
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _incr_group_version(group_pk))
+
+
+def group_page_cache_key(group_pk, category_pk, page_key):
+    version = get_group_version(group_pk)
+    return f"feeds:group:{group_pk}:v{version}:category:{category_pk}:{page_key}"
+
+
+def overlay_viewer_fields(results, request):
+    # 캐시된 데이터에 요청 유저의 is_like / is_writer 값을 채워 넣습니다.
+    user = request.user
+    liked = set()
+    # ?omit=is_like 등으로 제외된 경우 좋아요 여부를 조회하지 않습니다.
+    if is_field_requested(request, "is_like"):
+        liked = liked_feed_ids(user, [feed["id"] for feed in results])
+    for feed in results:
+        feed["is_like"] = feed["id"] in liked
+        feed["is_writer"] = feed["user"]["pk"] == user.pk
+    # 아직 DB 에 반영되지 않은 좋아요 수도 더합니다.
+    return add_pending_likes(results)
+
+
+def conditional_get_enabled():
+    # 그룹 버전이 프로세스마다 따로 저장되면 다른 프로세스에서 바뀐 내용을 알 수 없으므로
+    # 모든 프로세스가 같은 버전을 보는 공유 캐시에서만 ETag / 304 를 사용합니다.
+    return is_shared_cache()
+
+
+def make_etag(*parts):
+    return '"{}"'.format(hashlib.md5(":".join(map(str, parts)).encode()).hexdigest())
+
+
+def set_conditional_headers(response, etag, last_modified):
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    return response
@@ -0,0 +1,79 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, force_authenticate
+from categories.models import Category
+from feeds.models import Feed
+from feeds.serializers import FeedSerializer, feed_rows, serialize_feed_rows
+from groups.models import Group
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = "FeedSerializer 와 .values() 기반 목록 직렬화 시간을 비교합니다. (측정용 데이터는 저장되지 않습니다)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            default=24,
+            type=int,
+            help="한 페이지의 게시글 수",
+        )
+        parser.add_argument(
+            "--repeat",
+            default=200,
+            type=int,
+            help="반복 횟수",
+        )
+
+    def handle(self, *args, **options):
+        rows, repeat = options.get("rows"), options.get("repeat")
+
+        with transaction.atomic():
+            group = Group.objects.create(name=f"benchmark-{time.time()}")
+            category = Category.objects.filter(group=group).first()
+            user = User.objects.create(username=f"benchmark-{time.time()}", group=group)
+            Feed.objects.bulk_create(
+                [
+                    Feed(
+                        user=user,
+                        group=group,
+                        category=category,
+                        title=f"benchmark {index}",
+                    )
+                    for index in range(rows)
+                ]
+            )
+            request = APIRequestFactory().get("/api/v1/feeds/")
+            force_authenticate(request, user=user)
+            request = Request(request)
+            request.user = user
+
+            # 피드 조회 시간은 제외하도록 미리 조회해둡니다. (좋아요 여부 조회는 양쪽 모두 포함)
+            feeds = list(
+                Feed.objects.select_related("user", "best_comment")
+                .filter(group=group)
+                .order_by("-created_at")
+            )
+            values = list(
+                feed_rows(Feed.objects.filter(group=group).order_by("-created_at"))
+            )
+
+            started = time.perf_counter()
+            for _ in range(repeat):
+                FeedSerializer(feeds, many=True, context={"request": request}).data
+            serializer_ms = (time.perf_counter() - started) / repeat * 1000
+
+            started = time.perf_counter()
+            for _ in range(repeat):
+                serialize_feed_rows(values, request)
+            rows_ms = (time.perf_counter() - started) / repeat * 1000
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"rows={rows} FeedSerializer={serializer_ms:.3f}ms "
+            f"serialize_feed_rows={rows_ms:.3f}ms ({serializer_ms / rows_ms:.1f}x)"
+        )
+        self.stdout.write(self.style.SUCCESS("측정용 데이터를 되돌렸습니다."))
@@ -0,0 +1,85 @@
+import random
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+from categories.models import Category
+from feeds.models import Feed, TopFeed
+from feeds.top import refresh_top_feeds
+from feeds.views import TopLikeView
+from groups.models import Group
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = "게시글 수에 따른 좋아요순 목록 조회 시간을 측정합니다. (측정용 데이터는 저장되지 않습니다)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            default=[1000, 10000, 50000],
+            type=int,
+            help="측정할 게시글 수",
+        )
+        parser.add_argument(
+            "--repeat",
+            default=20,
+            type=int,
+            help="게시글 수마다 조회할 횟수",
+        )
+
+    def handle(self, *args, **options):
+        repeat = options.get("repeat")
+        view = TopLikeView.as_view()
+        factory = APIRequestFactory()
+
+        with transaction.atomic():
+            group = Group.objects.create(name=f"benchmark-{time.time()}")
+            category = Category.objects.filter(group=group).first()
+            user = User.objects.create(username=f"benchmark-{time.time()}", group=group)
+
+            created = 0
+            for size in sorted(options.get("sizes")):
+                Feed.objects.bulk_create(
+                    [
+                        Feed(
+                            user=user,
+                            group=group,
+                            category=category,
+                            title=f"benchmark {index}",
+                            like_count=random.randint(0, 1000),
+                        )
+                        for index in range(created, size)
+                    ],
+                    batch_size=1000,
+                )
+                created = max(created, size)
+                for window in TopFeed.WindowChoices.values:
+                    refresh_top_feeds(window)
+
+                request = factory.get("/api/v1/feeds/toplike/", {"window": "all"})
+                force_authenticate(request, user=user)
+                with CaptureQueriesContext(connection) as queries:
+                    view(request)
+                started = time.perf_counter()
+                for _ in range(repeat):
+                    view(request)
+                elapsed = (time.perf_counter() - started) / repeat * 1000
+
+                # 기존 방식처럼 요청마다 전체 게시글을 정렬하는 경우
+                started = time.perf_counter()
+                for _ in range(repeat):
+                    list(
+                        Feed.objects.order_by("-like_count", "-created_at", "-id")[:24]
+                    )
+                live = (time.perf_counter() - started) / repeat * 1000
+
+                self.stdout.write(
+                    f"feeds={Feed.objects.count():>8} queries={len(queries):>3} "
+                    f"toplike={elapsed:8.2f}ms live_sort={live:8.2f}ms"
+                )
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS("측정용 데이터를 되돌렸습니다."))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from feeds.visits import flush_visits
+
+
+class Command(BaseCommand):
+    help = "캐시에 쌓인 게시글 조회수를 DB 에 반영합니다. (공유 캐시 사용시, 프로세스 메모리에 쌓인 조회수는 각 프로세스가 반영합니다)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="현재 쌓이고 있는 버킷까지 반영",
+        )
+
+    def handle(self, *args, **options):
+        count = flush_visits(include_current=options.get("all"))
+        self.stdout.write(self.style.SUCCESS(f"{count}개 게시글의 조회수를 반영했습니다."))
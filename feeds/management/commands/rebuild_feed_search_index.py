@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from feeds.models import Feed, FeedSearchToken
+from feeds.search import build_search_tokens
+
+
+class Command(BaseCommand):
+    help = "게시글 검색 색인을 처음부터 다시 생성합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            default=500,
+            type=int,
+            help="한번에 색인할 피드 개수",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options.get("batch_size")
+        feeds = Feed.objects.only("group_id", "title", "description")
+
+        total = 0
+        with transaction.atomic():
+            FeedSearchToken.objects.all().delete()
+            tokens = []
+            for feed in feeds.iterator(chunk_size=batch_size):
+                tokens += build_search_tokens(feed)
+                total += 1
+                if total % batch_size == 0:
+                    FeedSearchToken.objects.bulk_create(tokens)
+                    tokens = []
+            FeedSearchToken.objects.bulk_create(tokens)
+
+        self.stdout.write(self.style.SUCCESS(f"{total}개 게시글의 검색 색인을 생성했습니다."))
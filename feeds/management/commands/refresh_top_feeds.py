@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from feeds.models import TopFeed
+from feeds.top import refresh_top_feeds
+
+
+class Command(BaseCommand):
+    help = "좋아요순 상위 게시글 목록을 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--window",
+            choices=TopFeed.WindowChoices.values,
+            help="다시 계산할 기간 (없으면 전체 기간)",
+        )
+
+    def handle(self, *args, **options):
+        window = options.get("window")
+        windows = [window] if window else TopFeed.WindowChoices.values
+        for window in windows:
+            count = refresh_top_feeds(window)
+            self.stdout.write(self.style.SUCCESS(f"{window}: {count}개 게시글"))
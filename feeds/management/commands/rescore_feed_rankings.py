@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand
+from feeds.caches import bump_group_version
+from feeds.models import Feed, FeedRanking
+from feeds.ranking import hot_score
+
+
+class Command(BaseCommand):
+    help = "인기글 점수를 다시 계산하고 누락된 피드를 인기글 목록에 추가합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            default=500,
+            type=int,
+            help="한번에 저장할 피드 개수",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options.get("batch_size")
+        feeds = Feed.objects.select_related("ranking").only(
+            "group_id",
+            "like_count",
+            "comments_count",
+            "created_at",
+            "ranking__id",
+            "ranking__group_id",
+            "ranking__score",
+        )
+
+        created, updated = [], []
+        created_total = updated_total = 0
+        # 점수가 바뀐 그룹의 캐시된 피드 목록을 무효화합니다.
+        groups = set()
+        for feed in feeds.iterator(chunk_size=batch_size):
+            score = hot_score(feed.like_count, feed.comments_count, feed.created_at)
+            try:
+                ranking = feed.ranking
+            except FeedRanking.DoesNotExist:
+                created.append(
+                    FeedRanking(feed_id=feed.pk, group_id=feed.group_id, score=score)
+                )
+                groups.add(feed.group_id)
+            else:
+                if ranking.score != score or ranking.group_id != feed.group_id:
+                    groups.update((ranking.group_id, feed.group_id))
+                    ranking.score = score
+                    ranking.group_id = feed.group_id
+                    updated.append(ranking)
+            if len(created) >= batch_size:
+                FeedRanking.objects.bulk_create(created)
+                created_total += len(created)
+                created = []
+            if len(updated) >= batch_size:
+                FeedRanking.objects.bulk_update(updated, ["score", "group"])
+                updated_total += len(updated)
+                updated = []
+        FeedRanking.objects.bulk_create(created)
+        FeedRanking.objects.bulk_update(updated, ["score", "group"])
+        created_total += len(created)
+        updated_total += len(updated)
+        for group_pk in groups:
+            bump_group_version(group_pk)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"인기글 점수 추가 {created_total}개, 수정 {updated_total}개")
+        )
@@ -0,0 +1,89 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from feeds.models import Feed
+from likes.models import Feedlike
+from comments.models import Comment, Recomment
+from groups.models import Group
+from categories.models import Category
+
+
+def count_subquery(queryset, field):
+    return Coalesce(
+        Subquery(
+            queryset.order_by()
+            .values(field)
+            .annotate(count=Count("pk"))
+            .values("count")
+        ),
+        Value(0),
+    )
+
+
+class Command(BaseCommand):
+    help = "피드의 좋아요 / 댓글 카운터와 그룹 / 카테고리의 게시글 수를 실제 데이터 기준으로 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            default=500,
+            type=int,
+            help="한번에 수정할 피드 개수",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options.get("batch_size")
+        feeds = (
+            Feed.objects.annotate(
+                real_like_count=count_subquery(
+                    Feedlike.objects.filter(feed=OuterRef("pk")), "feed"
+                ),
+                real_comments_count=count_subquery(
+                    Comment.objects.filter(feed=OuterRef("pk")), "feed"
+                )
+                + count_subquery(
+                    Recomment.objects.filter(comment__feed=OuterRef("pk")),
+                    "comment__feed",
+                ),
+            )
+            .exclude(
+                like_count=F("real_like_count"),
+                comments_count=F("real_comments_count"),
+            )
+            .only("pk", "like_count", "comments_count")
+        )
+
+        drifted = []
+        total = 0
+        for feed in feeds.iterator(chunk_size=batch_size):
+            feed.like_count = feed.real_like_count
+            feed.comments_count = feed.real_comments_count
+            drifted.append(feed)
+            if len(drifted) >= batch_size:
+                Feed.objects.bulk_update(drifted, ["like_count", "comments_count"])
+                total += len(drifted)
+                drifted = []
+        if drifted:
+            Feed.objects.bulk_update(drifted, ["like_count", "comments_count"])
+            total += len(drifted)
+
+        self.stdout.write(self.style.SUCCESS(f"{total}개의 피드 카운터를 수정했습니다."))
+
+        for model, field in ((Group, "group"), (Category, "category")):
+            drifted = list(
+                model.objects.annotate(
+                    real_feed_count=count_subquery(
+                        Feed.objects.filter(**{field: OuterRef("pk")}), field
+                    )
+                )
+                .exclude(feed_count=F("real_feed_count"))
+                .only("pk", "feed_count")
+            )
+            for instance in drifted:
+                instance.feed_count = instance.real_feed_count
+            model.objects.bulk_update(drifted, ["feed_count"], batch_size=batch_size)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{len(drifted)}개의 {model._meta.verbose_name} 게시글 수를 수정했습니다."
+                )
+            )
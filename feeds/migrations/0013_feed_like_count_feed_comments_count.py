@@ -0,0 +1,53 @@
+# Generated by Django 4.2 on 2026-10-18 11:39
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def _count(queryset, field):
+    return Coalesce(
+        Subquery(
+            queryset.order_by()
+            .values(field)
+            .annotate(count=Count("pk"))
+            .values("count")
+        ),
+        Value(0),
+    )
+
+
+def fill_counts(apps, schema_editor):
+    Feed = apps.get_model("feeds", "Feed")
+    Feedlike = apps.get_model("likes", "Feedlike")
+    Comment = apps.get_model("comments", "Comment")
+    Recomment = apps.get_model("comments", "Recomment")
+    Feed.objects.update(
+        like_count=_count(Feedlike.objects.filter(feed=OuterRef("pk")), "feed"),
+        comments_count=_count(Comment.objects.filter(feed=OuterRef("pk")), "feed")
+        + _count(
+            Recomment.objects.filter(comment__feed=OuterRef("pk")), "comment__feed"
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("comments", "0008_alter_comment_options"),
+        ("likes", "0006_alter_commentlike_comment_and_more"),
+        ("feeds", "0012_alter_feed_category"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="feed",
+            name="comments_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="feed",
+            name="like_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2 on 2026-10-18 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("feeds", "0013_feed_like_count_feed_comments_count"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="feed",
+            index=models.Index(fields=["-created_at", "-id"], name="feed_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="feed",
+            index=models.Index(
+                fields=["group", "-created_at", "-id"], name="feed_group_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="feed",
+            index=models.Index(
+                fields=["category", "-created_at", "-id"],
+                name="feed_category_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="feed",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"], name="feed_user_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="feed",
+            index=models.Index(
+                fields=["group", "-like_count", "-id"], name="feed_group_like_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2 on 2026-10-18 11:52
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_thumbnail(apps, schema_editor):
+    Feed = apps.get_model("feeds", "Feed")
+    Image = apps.get_model("medias", "Image")
+    Feed.objects.update(
+        thumbnail=Subquery(
+            Image.objects.filter(feed=OuterRef("pk")).order_by("pk").values("url")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("medias", "0003_image_delete_media"),
+        ("feeds", "0014_feed_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="feed",
+            name="thumbnail",
+            field=models.URLField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(fill_thumbnail, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 4.2 on 2026-10-18 11:44
+
+from django.db import migrations, models
+import django.db.models.deletion
+import math
+
+
+def fill_rankings(apps, schema_editor):
+    Feed = apps.get_model("feeds", "Feed")
+    FeedRanking = apps.get_model("feeds", "FeedRanking")
+    rankings = []
+    for feed in Feed.objects.only(
+        "group_id", "like_count", "comments_count", "created_at"
+    ).iterator():
+        points = feed.like_count + feed.comments_count * 2
+        age = feed.created_at.timestamp() - 1672531200
+        rankings.append(
+            FeedRanking(
+                feed_id=feed.pk,
+                group_id=feed.group_id,
+                score=round(math.log10(points + 1) + age / 45000, 7),
+            )
+        )
+    FeedRanking.objects.bulk_create(rankings, batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("groups", "0004_alter_group_name"),
+        ("feeds", "0015_feed_thumbnail"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FeedRanking",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("score", models.FloatField(default=0)),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name="feed",
+            name="feed_group_like_idx",
+        ),
+        migrations.AddField(
+            model_name="feedranking",
+            name="feed",
+            field=models.OneToOneField(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="ranking",
+                to="feeds.feed",
+            ),
+        ),
+        migrations.AddField(
+            model_name="feedranking",
+            name="group",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="groups.group",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="feedranking",
+            index=models.Index(
+                fields=["group", "-score", "-feed"], name="ranking_group_score_idx"
+            ),
+        ),
+        migrations.RunPython(fill_rankings, migrations.RunPython.noop),
+    ]
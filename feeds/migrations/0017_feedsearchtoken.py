@@ -0,0 +1,95 @@
+# Generated by Django 4.2 on 2026-10-18 11:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+import re
+
+
+def tokenize(text):
+    tokens = set()
+    for word in re.findall(r"\w+", (text or "").lower()):
+        if len(word) == 1:
+            tokens.add(word)
+        for index in range(len(word) - 1):
+            tokens.add(word[index : index + 2])
+    return tokens
+
+
+def fill_search_tokens(apps, schema_editor):
+    Feed = apps.get_model("feeds", "Feed")
+    FeedSearchToken = apps.get_model("feeds", "FeedSearchToken")
+    tokens = []
+    for feed in Feed.objects.only("group_id", "title", "description").iterator():
+        for field, text in (("title", feed.title), ("description", feed.description)):
+            for token in tokenize(text):
+                tokens.append(
+                    FeedSearchToken(
+                        feed_id=feed.pk,
+                        group_id=feed.group_id,
+                        token=token,
+                        field=field,
+                    )
+                )
+    FeedSearchToken.objects.bulk_create(tokens, batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("groups", "0004_alter_group_name"),
+        ("feeds", "0016_feedranking"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FeedSearchToken",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("token", models.CharField(max_length=2)),
+                (
+                    "field",
+                    models.CharField(
+                        choices=[("title", "제목"), ("description", "내용")], max_length=11
+                    ),
+                ),
+                (
+                    "feed",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_tokens",
+                        to="feeds.feed",
+                    ),
+                ),
+                (
+                    "group",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="groups.group",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="feedsearchtoken",
+            index=models.Index(
+                fields=["group", "token", "field", "feed"],
+                name="search_group_token_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="feedsearchtoken",
+            constraint=models.UniqueConstraint(
+                fields=("feed", "field", "token"), name="unique_feed_search_token"
+            ),
+        ),
+        migrations.RunPython(fill_search_tokens, migrations.RunPython.noop),
+    ]
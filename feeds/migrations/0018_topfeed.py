@@ -0,0 +1,52 @@
+# Generated by Django 4.2 on 2026-10-18 11:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("feeds", "0017_feedsearchtoken"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TopFeed",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "window",
+                    models.CharField(
+                        choices=[("day", "하루"), ("week", "일주일"), ("all", "전체")],
+                        max_length=4,
+                    ),
+                ),
+                ("rank", models.PositiveIntegerField()),
+                ("like_count", models.PositiveIntegerField(default=0)),
+                (
+                    "feed",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="top_entries",
+                        to="feeds.feed",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="topfeed",
+            constraint=models.UniqueConstraint(
+                fields=("window", "rank"), name="unique_top_feed_rank"
+            ),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2 on 2026-10-18 11:54
+
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def feed_count(Feed, field):
+    return Coalesce(
+        Subquery(
+            Feed.objects.filter(**{field: OuterRef("pk")})
+            .order_by()
+            .values(field)
+            .annotate(count=Count("pk"))
+            .values("count")
+        ),
+        Value(0),
+    )
+
+
+def fill_feed_counts(apps, schema_editor):
+    Feed = apps.get_model("feeds", "Feed")
+    Group = apps.get_model("groups", "Group")
+    Category = apps.get_model("categories", "Category")
+    Group.objects.update(feed_count=feed_count(Feed, "group"))
+    Category.objects.update(feed_count=feed_count(Feed, "category"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("groups", "0005_group_feed_count"),
+        ("categories", "0009_category_feed_count"),
+        ("feeds", "0018_topfeed"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_feed_counts, migrations.RunPython.noop),
+    ]
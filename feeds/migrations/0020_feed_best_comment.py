@@ -0,0 +1,40 @@
+# Generated by Django 4.2 on 2026-10-18 12:15
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def fill_best_comments(apps, schema_editor):
+    Feed = apps.get_model("feeds", "Feed")
+    Comment = apps.get_model("comments", "Comment")
+    Feed.objects.update(
+        best_comment=Subquery(
+            Comment.objects.filter(feed=OuterRef("pk"), like_count__gt=0)
+            .order_by("-like_count", "id")
+            .values("pk")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("comments", "0010_comment_like_count_topcomment"),
+        ("feeds", "0019_fill_group_category_feed_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="feed",
+            name="best_comment",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="comments.comment",
+            ),
+        ),
+        migrations.RunPython(fill_best_comments, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-18 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("feeds", "0020_feed_best_comment"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="feed",
+            index=models.Index(
+                fields=["-like_count", "-created_at", "-id"], name="feed_like_idx"
+            ),
+        ),
+    ]
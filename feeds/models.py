@@ -1,6 +1,5 @@
 from django.db import models
 from common.models import CommonModel
-from django.db.models import Count
 from django.core.exceptions import ValidationError
 from comments.models import Recomment
 
@@ -27,61 +26,151 @@ class Feed(CommonModel):
         editable=False,
         default=0,
     )
+    like_count = models.PositiveIntegerField(
+        editable=False,
+        default=0,
+    )
+    comments_count = models.PositiveIntegerField(
+        editable=False,
+        default=0,
+    )
+    thumbnail = models.URLField(
+        editable=False,
+        null=True,
+        blank=True,
+    )
+    # 좋아요가 가장 많은 댓글 (같다면 먼저 작성된 댓글, 좋아요가 없으면 null)
+    best_comment = models.ForeignKey(
+        "comments.Comment",
+        on_delete=models.SET_NULL,
+        editable=False,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
 
     def __str__(self) -> str:
         return f"{self.user}의 게시글"
 
-    @property
-    def like_count(self):
-        return self.feedlike.count()
-
-    # @property
-    # def comments_count(self):
-    #     count = self.comment.count()
-    #     for i in self.comment.all():
-    #         count += i.recomment.count()
-    #     return count
-
-    # @property
-    # def comments_count(self):
-    #     count = self.comment.count()
-    #     for i in self.comment.prefetch_related("recomment"):
-    #         count += i.recomment.count()
-    #     return count
-
-    @property
-    def comments_count(self):
-        return self.comment.count() + self.comment.aggregate(
-            recomment_count=Count("recomment")
-        ).get("recomment_count")
+    class Meta:
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="feed_created_idx"),
+            models.Index(
+                fields=["group", "-created_at", "-id"], name="feed_group_created_idx"
+            ),
+            models.Index(
+                fields=["category", "-created_at", "-id"],
+                name="feed_category_created_idx",
+            ),
+            models.Index(
+                fields=["user", "-created_at", "-id"], name="feed_user_created_idx"
+            ),
+            # 좋아요순 상위 게시글 계산 (refresh_top_feeds)
+            models.Index(
+                fields=["-like_count", "-created_at", "-id"], name="feed_like_idx"
+            ),
+        ]
 
     @property
     def highest_like_comments(self):
-        return self.comment.annotate(like_count=Count("commentlike")).order_by(
-            "-like_count"
-        )[:1]
-
-    # @property
-    # def thumbnail(self):
-    #     if self.images.exists():
-    #         return self.images.value_list("url", flat=True).first()
-    #     else:
-    #         return None
-    # @property
-    # def thumbnail(self):
-    #     if self.images.exists():
-    #         return self.images.all()[0].url
-    #     else:
-    #         return None
-    @property
-    def thumbnail(self):
-        image = self.images.first()
-        if image:
-            return image.url
-        else:
-            return None
+        return [self.best_comment] if self.best_comment_id else []
 
     def clean(self):
         super().clean()
         if self.category.group != self.group:
             raise ValidationError("그룹의 카테고리 내에서 선택해주세요.")
+
+
+class FeedRanking(CommonModel):
+    feed = models.OneToOneField(
+        "feeds.Feed",
+        on_delete=models.CASCADE,
+        related_name="ranking",
+    )
+    group = models.ForeignKey(
+        "groups.Group",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+    )
+    score = models.FloatField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.feed_id}번 게시글의 인기 점수"
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["group", "-score", "-feed"], name="ranking_group_score_idx"
+            ),
+        ]
+
+
+class FeedSearchToken(models.Model):
+    # 검색용 2-gram 색인 (게시글 수정시 signals 에서 다시 생성)
+    class FieldChoices(models.TextChoices):
+        TITLE = ("title", "제목")
+        DESCRIPTION = ("description", "내용")
+
+    feed = models.ForeignKey(
+        "feeds.Feed",
+        on_delete=models.CASCADE,
+        related_name="search_tokens",
+    )
+    group = models.ForeignKey(
+        "groups.Group",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+    )
+    token = models.CharField(max_length=2)
+    field = models.CharField(
+        max_length=11,
+        choices=FieldChoices.choices,
+    )
+
+    def __str__(self) -> str:
+        return f"{self.feed_id}번 게시글의 검색어 {self.token}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["feed", "field", "token"], name="unique_feed_search_token"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["group", "token", "field", "feed"],
+                name="search_group_token_idx",
+            ),
+        ]
+
+
+class TopFeed(CommonModel):
+    # 커뮤니티 전체 좋아요순 상위 게시글 (refresh_top_feeds 로 주기적으로 다시 계산)
+    class WindowChoices(models.TextChoices):
+        DAY = ("day", "하루")
+        WEEK = ("week", "일주일")
+        ALL = ("all", "전체")
+
+    window = models.CharField(
+        max_length=4,
+        choices=WindowChoices.choices,
+    )
+    rank = models.PositiveIntegerField()
+    feed = models.ForeignKey(
+        "feeds.Feed",
+        on_delete=models.CASCADE,
+        related_name="top_entries",
+    )
+    like_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.window} {self.rank}위 {self.feed_id}번 게시글"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["window", "rank"], name="unique_top_feed_rank"
+            ),
+        ]
@@ -0,0 +1,46 @@
+import math
+from django.utils import timezone
+from .models import Feed, FeedRanking
+
+LIKE_WEIGHT = 1
+COMMENT_WEIGHT = 2
+# 점수가 10배 차이나는 게시글은 DECAY_SECONDS 만큼 먼저 작성된 게시글과 같은 순위가 됩니다.
+DECAY_SECONDS = 45000
+EPOCH = 1672531200  # 2023-01-01 00:00:00 UTC
+
+
+def hot_score(like_count, comments_count, created_at):
+    points = like_count * LIKE_WEIGHT + comments_count * COMMENT_WEIGHT
+    age = created_at.timestamp() - EPOCH
+    return round(math.log10(points + 1) + age / DECAY_SECONDS, 7)
+
+
+def update_feed_ranking(feed_pk):
+    # 좋아요 / 댓글 이벤트마다 해당 피드의 점수만 다시 계산
+    try:
+        group_id, like_count, comments_count, created_at = Feed.objects.values_list(
+            "group_id", "like_count", "comments_count", "created_at"
+        ).get(pk=feed_pk)
+    except Feed.DoesNotExist:
+        return
+    FeedRanking.objects.update_or_create(
+        feed_id=feed_pk,
+        defaults={
+            "group_id": group_id,
+            "score": hot_score(like_count, comments_count, created_at),
+        },
+    )
+
+
+def create_feed_ranking(feed):
+    FeedRanking.objects.get_or_create(
+        feed=feed,
+        defaults={
+            "group_id": feed.group_id,
+            "score": hot_score(
+                feed.like_count,
+                feed.comments_count,
+                feed.created_at or timezone.now(),
+            ),
+        },
+    )
@@ -0,0 +1,76 @@
+import re
+from django.db.models import Case, Count, IntegerField, Q, Value, When
+from .models import Feed, FeedSearchToken
+
+WORD_RE = re.compile(r"\w+")
+TITLE = FeedSearchToken.FieldChoices.TITLE
+DESCRIPTION = FeedSearchToken.FieldChoices.DESCRIPTION
+
+
+def tokenize(text):
+    # 단어마다 2글자씩 잘라 색인합니다. 한글자 단어는 그대로 사용합니다.
+    # ex) "오늘 점심 메뉴" -> {"오늘", "점심", "메뉴"}, "커리큘럼" -> {"커리", "리큘", "큘럼"}
+    tokens = set()
+    for word in WORD_RE.findall((text or "").lower()):
+        if len(word) == 1:
+            tokens.add(word)
+        for index in range(len(word) - 1):
+            tokens.add(word[index : index + 2])
+    return tokens
+
+
+def build_search_tokens(feed):
+    tokens = []
+    for field, text in ((TITLE, feed.title), (DESCRIPTION, feed.description)):
+        for token in tokenize(text):
+            tokens.append(
+                FeedSearchToken(
+                    feed_id=feed.pk,
+                    group_id=feed.group_id,
+                    token=token,
+                    field=field,
+                )
+            )
+    return tokens
+
+
+def index_feed(feed):
+    FeedSearchToken.objects.filter(feed_id=feed.pk).delete()
+    FeedSearchToken.objects.bulk_create(build_search_tokens(feed))
+
+
+def search_feeds(group_pk, keyword, include_description=True):
+    # 색인으로 모든 2-gram 을 포함하는 후보를 찾은 뒤 후보 안에서만 icontains 로 확인합니다.
+    # 2글자 이상인 단어가 없는 키워드(ex. "밥")는 색인을 사용할 수 없어 기존처럼 검색합니다.
+    fields = [TITLE, DESCRIPTION] if include_description else [TITLE]
+    tokens = {
+        token
+        for word in WORD_RE.findall(keyword.lower())
+        if len(word) > 1
+        for token in tokenize(word)
+    }
+    feeds = Feed.objects.filter(group__pk=group_pk)
+    if tokens:
+        candidates = (
+            FeedSearchToken.objects.filter(
+                group__pk=group_pk, token__in=tokens, field__in=fields
+            )
+            .values("feed_id")
+            .annotate(matched=Count("token", distinct=True))
+            .filter(matched=len(tokens))
+            .values("feed_id")
+        )
+        feeds = feeds.filter(pk__in=candidates)
+
+    condition = Q(title__icontains=keyword)
+    if include_description:
+        condition |= Q(description__icontains=keyword)
+    # 제목이 키워드로 시작 > 제목에 포함 > 내용에만 포함 순으로 정렬합니다.
+    return feeds.filter(condition).annotate(
+        rank=Case(
+            When(title__istartswith=keyword, then=Value(2)),
+            When(title__icontains=keyword, then=Value(1)),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+    )
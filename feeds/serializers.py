@@ -1,9 +1,12 @@
 from rest_framework.serializers import ModelSerializer
 from rest_framework.serializers import SerializerMethodField
+from rest_framework.fields import DateTimeField
 from .models import Feed
+from .visits import add_pending_visits
 from users.serializers import TinyUserSerializer
 from comments.serializers import CommentSerializer
-from likes.models import Feedlike
+from comments.anonymous import anonymous_label
+from likes.buffer import add_pending_likes, liked_feed_ids
 from groups.serializers import GroupSerializer
 from categories.serializers import CategorySerializer
 from medias.models import Image
@@ -13,9 +16,15 @@ from django.db.transaction import atomic
 from django.shortcuts import get_object_or_404
 from categories.models import Category
 from django.core.cache import cache
+from common.serializers import (
+    DynamicFieldsMixin,
+    LikeBatchListSerializer,
+    filter_fields,
+    is_field_requested,
+)
 
 
-class TinyFeedSerializer(ModelSerializer):
+class TinyFeedSerializer(DynamicFieldsMixin, ModelSerializer):
     class Meta:
         model = Feed
         fields = (
@@ -27,7 +36,7 @@ class TinyFeedSerializer(ModelSerializer):
         )
 
 
-class FeedSerializer(ModelSerializer):
+class FeedSerializer(DynamicFieldsMixin, ModelSerializer):
     # comment = CommentSerializer(many=True, read_only=True)
     user = TinyUserSerializer(read_only=True)
     # images = MediaSerializer(many=True, read_only=True)
@@ -35,6 +44,7 @@ class FeedSerializer(ModelSerializer):
     # group = GroupSerializer(read_only=True)
     is_writer = SerializerMethodField()
     # user = SerializerMethodField()
+    best_comment = SerializerMethodField()
 
     class Meta:
         model = Feed
@@ -51,20 +61,45 @@ class FeedSerializer(ModelSerializer):
             "is_like",
             "thumbnail",
             "is_writer",
+            "best_comment",
             # "images",
         )
+        list_serializer_class = LikeBatchListSerializer
+
+    def load_likes(self, feeds, user):
+        if not self.is_field_requested("is_like"):
+            return
+        self.context["liked_feed_ids"] = liked_feed_ids(
+            user, [feed.pk for feed in feeds]
+        )
 
     def get_is_like(self, data):
+        liked = self.context.get("liked_feed_ids")
+        if liked is not None:
+            return data.pk in liked
         request = self.context.get("request")
         if request and request.user.is_authenticated:
-            return Feedlike.objects.filter(user=request.user, feed=data).exists()
+            return data.pk in liked_feed_ids(request.user, [data.pk])
         return False
 
+    def get_best_comment(self, data):
+        # 목록에서는 select_related("best_comment") 로 함께 조회합니다.
+        comment = data.best_comment
+        if comment is None:
+            return None
+        return best_comment_data(
+            comment.pk,
+            comment.description,
+            comment.like_count,
+            comment.anonymous_number,
+            comment.user_id == data.user_id,
+        )
+
     def get_is_writer(self, data):
         request = self.context.get("request")
         if request:
             if request.user.is_authenticated:
-                return request.user == data.user
+                return request.user.pk == data.user_id
         return False
 
     def validate_url(self, value):
@@ -89,7 +124,7 @@ class FeedSerializer(ModelSerializer):
             return feed
 
 
-class FeedDetailSerializer(ModelSerializer):
+class FeedDetailSerializer(DynamicFieldsMixin, ModelSerializer):
     user = TinyUserSerializer(read_only=True)
     group = GroupSerializer(read_only=True)
     # comment = SerializerMethodField()
@@ -120,6 +155,14 @@ class FeedDetailSerializer(ModelSerializer):
             "is_like",
             "is_writer",
         )
+        list_serializer_class = LikeBatchListSerializer
+
+    def load_likes(self, feeds, user):
+        if not self.is_field_requested("is_like"):
+            return
+        self.context["liked_feed_ids"] = liked_feed_ids(
+            user, [feed.pk for feed in feeds]
+        )
 
     # def get_comment(self, obj):
     #     result = CommentSerializer(obj.comment.all(), many=True).data
@@ -129,20 +172,20 @@ class FeedDetailSerializer(ModelSerializer):
     #     return CommentSerializer(obj.comment.all(), many=True).data
 
     def get_is_like(self, data):
+        liked = self.context.get("liked_feed_ids")
+        if liked is not None:
+            return data.pk in liked
         request = self.context.get("request")
         if request:
             if request.user.is_authenticated:
-                return Feedlike.objects.filter(
-                    user=request.user,
-                    feed__pk=data.pk,
-                ).exists()
+                return data.pk in liked_feed_ids(request.user, [data.pk])
         return False
 
     def get_is_writer(self, data):
         request = self.context.get("request")
         if request:
             if request.user.is_authenticated:
-                return request.user == data.user
+                return request.user.pk == data.user_id
         return False
 
     def validate_url(self, value):
@@ -173,6 +216,19 @@ class FeedDetailSerializer(ModelSerializer):
             instance.description = validated_data.get(
                 "description", instance.description
             )
+            category = validated_data.get("category", instance.category)
+            if category:
+                if category != instance.category:
+                    category = get_object_or_404(Category, pk=category)
+                    if category.group != instance.category.group:
+                        raise ValidationError("Wrong Category")
+                    if category.name == "전체글" or category.name == "인기글":
+                        raise ValidationError("전체글과 인기글 카테고리는 선택할수 없습니다.")
+                    instance.category = category
+            # 카운터 / 썸네일 컬럼은 별도로 갱신되므로 덮어쓰지 않습니다.
+            instance.save(
+                update_fields=["title", "description", "category", "updated_at"]
+            )
             try:
                 image = validated_data["image"]
                 if image:
@@ -184,14 +240,89 @@ class FeedDetailSerializer(ModelSerializer):
                     Image.objects.filter(feed=instance).delete()
             except KeyError:
                 pass
-            category = validated_data.get("category", instance.category)
-            if category:
-                if category != instance.category:
-                    category = get_object_or_404(Category, pk=category)
-                    if category.group != instance.category.group:
-                        raise ValidationError("Wrong Category")
-                    if category.name == "전체글" or category.name == "인기글":
-                        raise ValidationError("전체글과 인기글 카테고리는 선택할수 없습니다.")
-                    instance.category = category
-            instance.save()
+            # 이미지가 바뀌면 signal 에서 저장한 썸네일을 다시 읽어옵니다.
+            if "image" in validated_data:
+                instance.refresh_from_db(fields=["thumbnail"])
         return instance
+
+
+# FeedSerializer 와 같은 결과를 .values() 로 조회한 row 에서 바로 만듭니다. (읽기 전용 목록용)
+FEED_ROW_FIELDS = (
+    "id",
+    "user_id",
+    "user__is_coach",
+    "title",
+    "visited",
+    "created_at",
+    "like_count",
+    "comments_count",
+    "thumbnail",
+    "best_comment_id",
+    "best_comment__user_id",
+    "best_comment__description",
+    "best_comment__like_count",
+    "best_comment__anonymous_number",
+)
+_created_at_field = DateTimeField()
+
+
+def best_comment_data(pk, description, like_count, anonymous_number, is_feed_writer):
+    if pk is None:
+        return None
+    return {
+        "id": pk,
+        "description": description,
+        "commentlikeCount": like_count,
+        "anonymous_number": anonymous_label(anonymous_number, is_feed_writer),
+    }
+
+
+def feed_rows(queryset, prefix="", extra=()):
+    # prefix 는 다른 모델에서 피드를 조회할 때 사용합니다. ex) TopFeed -> "feed__"
+    return queryset.values(*extra, *[prefix + field for field in FEED_ROW_FIELDS])
+
+
+def serialize_feed_rows(rows, request=None, prefix=""):
+    rows = list(rows)
+    user = request.user if request else None
+    liked = set()
+    if (
+        rows
+        and user is not None
+        and user.is_authenticated
+        and is_field_requested(request, "is_like")
+    ):
+        liked.update(liked_feed_ids(user, [row[prefix + "id"] for row in rows]))
+    user_pk = user.pk if user is not None and user.is_authenticated else None
+    results = [
+        {
+            "id": row[prefix + "id"],
+            "user": {
+                "pk": row[prefix + "user_id"],
+                "is_coach": row[prefix + "user__is_coach"],
+            },
+            "title": row[prefix + "title"],
+            "visited": row[prefix + "visited"],
+            "created_at": _created_at_field.to_representation(
+                row[prefix + "created_at"]
+            ),
+            "like_count": row[prefix + "like_count"],
+            "comments_count": row[prefix + "comments_count"],
+            "is_like": row[prefix + "id"] in liked,
+            "thumbnail": row[prefix + "thumbnail"],
+            "is_writer": user_pk is not None and row[prefix + "user_id"] == user_pk,
+            "best_comment": best_comment_data(
+                row[prefix + "best_comment_id"],
+                row[prefix + "best_comment__description"],
+                row[prefix + "best_comment__like_count"],
+                row[prefix + "best_comment__anonymous_number"],
+                row[prefix + "best_comment__user_id"] == row[prefix + "user_id"],
+            ),
+        }
+        for row in rows
+    ]
+    if request is not None:
+        # request 없이 직렬화한 데이터는 캐시되므로 요청마다 따로 더합니다.
+        add_pending_likes(results)
+        add_pending_visits(results)
+    return filter_fields(results, request)
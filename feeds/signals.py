@@ -0,0 +1,85 @@
+from django.core.cache import cache
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from categories.models import Category
+from groups.models import Group
+from .models import Feed
+from .caches import ALL_FEED_COUNT_KEY, bump_group_version
+from .ranking import create_feed_ranking
+from .search import index_feed
+from .suggestions import feed_title_deleted, feed_title_saved
+
+SEARCH_FIELDS = {"title", "description", "group"}
+
+
+@receiver(post_save, sender=Feed)
+def create_ranking_on_feed_create(sender, instance, created, **kwargs):
+    if created:
+        create_feed_ranking(instance)
+
+
+@receiver(post_save, sender=Feed)
+@receiver(post_delete, sender=Feed)
+def bump_group_version_on_feed_change(sender, instance, **kwargs):
+    bump_group_version(instance.group_id)
+
+
+@receiver(post_save, sender=Feed)
+def index_feed_on_save(sender, instance, created, update_fields, **kwargs):
+    if created or update_fields is None or SEARCH_FIELDS & set(update_fields):
+        index_feed(instance)
+
+
+@receiver(post_save, sender=Feed)
+def update_title_index_on_save(sender, instance, created, update_fields, **kwargs):
+    if created or update_fields is None or {"title", "group"} & set(update_fields):
+        feed_title_saved(instance)
+
+
+@receiver(post_delete, sender=Feed)
+def update_title_index_on_delete(sender, instance, **kwargs):
+    feed_title_deleted(instance)
+
+
+def add_feed_count(model, pk, amount):
+    if pk is not None:
+        model.objects.filter(pk=pk).update(
+            feed_count=Greatest(F("feed_count") + amount, 0)
+        )
+
+
+@receiver(post_init, sender=Feed)
+def remember_feed_location(sender, instance, **kwargs):
+    # 저장할 때 그룹 / 카테고리가 바뀌었는지 알 수 있도록 불러온 값을 기억해둡니다.
+    # only() 로 제외된 필드는 불러오지 않고 비교하지도 않습니다.
+    fields = instance.__dict__
+    if "group_id" in fields and "category_id" in fields:
+        instance._loaded_location = (fields["group_id"], fields["category_id"])
+    else:
+        instance._loaded_location = None
+
+
+@receiver(post_save, sender=Feed)
+def update_feed_count_on_save(sender, instance, created, **kwargs):
+    if created:
+        add_feed_count(Group, instance.group_id, 1)
+        add_feed_count(Category, instance.category_id, 1)
+        cache.delete(ALL_FEED_COUNT_KEY)
+    elif instance._loaded_location is not None:
+        group_pk, category_pk = instance._loaded_location
+        if group_pk != instance.group_id:
+            add_feed_count(Group, group_pk, -1)
+            add_feed_count(Group, instance.group_id, 1)
+        if category_pk != instance.category_id:
+            add_feed_count(Category, category_pk, -1)
+            add_feed_count(Category, instance.category_id, 1)
+    remember_feed_location(sender, instance)
+
+
+@receiver(post_delete, sender=Feed)
+def update_feed_count_on_delete(sender, instance, **kwargs):
+    add_feed_count(Group, instance.group_id, -1)
+    add_feed_count(Category, instance.category_id, -1)
+    cache.delete(ALL_FEED_COUNT_KEY)
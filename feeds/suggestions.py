@@ -0,0 +1,185 @@
+import bisect
+import heapq
+import re
+import threading
+import time
+from collections import OrderedDict
+from django.core.cache import cache
+from django.db import transaction
+from .models import Feed
+
+# 프로세스 메모리에 올려둘 최대 그룹 수 (오래 사용하지 않은 그룹부터 제거)
+MAX_GROUP_INDEXES = 64
+SUGGESTION_LIMIT = 5
+# 짧은 접두어가 너무 많은 키와 일치할 때 확인할 최대 키 수
+MAX_SCANNED_KEYS = 2000
+# 색인마다 기억해둘 접두어별 검색 결과 수
+MAX_CACHED_PREFIXES = 256
+
+WORD_RE = re.compile(r"\w+")
+
+_indexes = OrderedDict()
+_lock = threading.Lock()
+
+
+def title_version_key(group_pk):
+    return f"feeds:title_version:{group_pk}"
+
+
+def get_title_version(group_pk):
+    key = title_version_key(group_pk)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+class TitleIndex:
+    # 제목과 제목 속 단어들로 시작하는 문자열을 정렬해두고 bisect 로 접두어 검색합니다.
+    # ex) "오늘 점심 메뉴" -> "오늘 점심 메뉴", "점심 메뉴", "메뉴"
+    def __init__(self, version):
+        self.version = version
+        self.keys = []
+        self.feeds = {}
+        self.suggestions = OrderedDict()
+
+    @staticmethod
+    def title_keys(pk, title):
+        lowered = title.lower()
+        starts = [match.start() for match in WORD_RE.finditer(lowered)]
+        if not starts or starts[0] != 0:
+            starts.insert(0, 0)
+        return [(lowered[start:], pk, start == 0) for start in starts]
+
+    def add(self, pk, title, created_at):
+        self.remove(pk)
+        keys = self.title_keys(pk, title)
+        for key in keys:
+            bisect.insort(self.keys, key)
+        self.feeds[pk] = (title, created_at, keys)
+        self.suggestions.clear()
+
+    def remove(self, pk):
+        feed = self.feeds.pop(pk, None)
+        if feed is None:
+            return
+        self.suggestions.clear()
+        for key in feed[2]:
+            index = bisect.bisect_left(self.keys, key)
+            if index < len(self.keys) and self.keys[index] == key:
+                del self.keys[index]
+
+    def suggest(self, prefix, limit=SUGGESTION_LIMIT):
+        prefix = prefix.lower()
+        cached = self.suggestions.get((prefix, limit))
+        if cached is not None:
+            return cached
+        matched = {}
+        index = bisect.bisect_left(self.keys, (prefix,))
+        end = min(index + MAX_SCANNED_KEYS, len(self.keys))
+        while index < end and self.keys[index][0].startswith(prefix):
+            _, pk, is_title_start = self.keys[index]
+            matched[pk] = matched.get(pk, False) or is_title_start
+            index += 1
+        # 제목이 키워드로 시작하는 게시글 > 최신 게시글 순
+        pks = heapq.nlargest(
+            limit,
+            matched,
+            key=lambda pk: (matched[pk], self.feeds[pk][1], pk),
+        )
+        suggestions = [{"id": pk, "title": self.feeds[pk][0]} for pk in pks]
+        self.suggestions[(prefix, limit)] = suggestions
+        while len(self.suggestions) > MAX_CACHED_PREFIXES:
+            self.suggestions.popitem(last=False)
+        return suggestions
+
+
+def _build_index(group_pk, version):
+    index = TitleIndex(version)
+    feeds = Feed.objects.filter(group__pk=group_pk).values_list(
+        "pk", "title", "created_at"
+    )
+    # 키를 모두 모은 뒤 한번만 정렬합니다.
+    for pk, title, created_at in feeds.iterator():
+        keys = index.title_keys(pk, title)
+        index.keys.extend(keys)
+        index.feeds[pk] = (title, created_at, keys)
+    index.keys.sort()
+    return index
+
+
+def get_title_index(group_pk):
+    version = get_title_version(group_pk)
+    with _lock:
+        index = _indexes.get(group_pk)
+        if index is not None and index.version == version:
+            _indexes.move_to_end(group_pk)
+            return index
+    # 다른 프로세스에서 제목이 바뀌었거나 처음 조회하는 그룹이면 새로 만듭니다.
+    index = _build_index(group_pk, version)
+    with _lock:
+        _indexes[group_pk] = index
+        _indexes.move_to_end(group_pk)
+        while len(_indexes) > MAX_GROUP_INDEXES:
+            _indexes.popitem(last=False)
+    return index
+
+
+def suggest_titles(group_pk, keyword, limit=SUGGESTION_LIMIT):
+    index = get_title_index(group_pk)
+    # _apply_title_change 가 같은 색인을 고치는 중에 읽지 않도록 잠급니다.
+    with _lock:
+        return index.suggest(keyword.strip(), limit)
+
+
+def _bump_title_version(group_pk):
+    key = title_version_key(group_pk)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        return None
+
+
+def _apply_title_change(pk, group_pk, title=None, created_at=None):
+    # 메모리에 올라간 색인만 고치고, 다른 프로세스는 버전이 바뀐 것을 보고 새로 만듭니다.
+    previous = cache.get(title_version_key(group_pk)) if group_pk else None
+    version = _bump_title_version(group_pk) if group_pk else None
+    with _lock:
+        for index_group_pk, index in _indexes.items():
+            if index_group_pk == group_pk and title is not None:
+                index.add(pk, title, created_at)
+            else:
+                index.remove(pk)
+        index = _indexes.get(group_pk)
+        if index is not None:
+            # 사이에 다른 변경이 있었다면 다음 조회 때 다시 만들도록 합니다.
+            if (
+                previous is not None
+                and index.version == previous
+                and version == previous + 1
+            ):
+                index.version = version
+            else:
+                index.version = None
+
+
+def feed_title_saved(feed):
+    pk, group_pk, title, created_at = (
+        feed.pk,
+        feed.group_id,
+        feed.title,
+        feed.created_at,
+    )
+    transaction.on_commit(lambda: _apply_title_change(pk, group_pk, title, created_at))
+
+
+def feed_title_deleted(feed):
+    pk, group_pk = feed.pk, feed.group_id
+    transaction.on_commit(lambda: _apply_title_change(pk, group_pk))
+
+
+def clear_title_indexes():
+    with _lock:
+        _indexes.clear()
@@ -1,9 +1,33 @@
-from rest_framework.test import APITestCase
-from .models import Feed
+import base64
+import json
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
+from common.pagination import encode_cursor
+from .models import Feed, FeedRanking, FeedSearchToken, TopFeed
+from .search import tokenize
+from .serializers import FeedSerializer, feed_rows, serialize_feed_rows
+from . import views
+from .suggestions import (
+    clear_title_indexes,
+    get_title_index,
+    suggest_titles,
+    title_version_key,
+)
+from unittest import mock
+from .caches import get_group_version
+from .visits import clear_local_visits, pending_visits
 from groups.models import Group
 from users.models import User
 from categories.models import Category
 from comments.models import Comment, Recomment
+from likes.models import Feedlike, Commentlike
+from django.core.management import call_command
+from io import StringIO
+from datetime import timedelta
+from django.utils import timezone
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 
 # 게시글 조회 테스트
@@ -389,3 +413,1289 @@ class GroupCategoryFeedGet(APITestCase):
         )
         self.assertEqual(response.status_code, 200, "status isn't 200")
         self.assertEqual(len(response.data), 4)
+
+
+# 좋아요 / 댓글 카운터 테스트
+class FeedCounter(APITestCase):
+    URL = "/api/v1/feeds/"
+    TITLE = "feed counter test"
+
+    def setUp(self):
+        self.group = Group.objects.create(name="oz")
+        self.user = User.objects.create(is_coach=True, group=self.group)
+        self.category = Category.objects.create(group=self.group)
+        self.feed = Feed.objects.create(
+            user=self.user,
+            title=self.TITLE,
+            category=self.category,
+            group=self.group,
+        )
+
+    def test_like_toggle_updates_like_count(self):
+        self.client.force_login(self.user)
+        self.client.post(f"/api/v1/likes/feedlike/{self.feed.pk}")
+        self.feed.refresh_from_db()
+        self.assertEqual(self.feed.like_count, 1)
+        self.client.post(f"/api/v1/likes/feedlike/{self.feed.pk}")
+        self.feed.refresh_from_db()
+        self.assertEqual(self.feed.like_count, 0)
+
+    def test_comment_write_updates_comments_count(self):
+        self.client.force_login(self.user)
+        response = self.client.post(
+            f"{self.URL}{self.feed.pk}/comment/",
+            {"description": "comment"},
+            format="json",
+        )
+        comment_pk = response.data["id"]
+        self.client.post(
+            f"{self.URL}{self.feed.pk}/comment/{comment_pk}/recomment/",
+            {"description": "recomment"},
+            format="json",
+        )
+        self.feed.refresh_from_db()
+        self.assertEqual(self.feed.comments_count, 2)
+
+        self.client.delete(f"/api/v1/comments/{comment_pk}")
+        self.feed.refresh_from_db()
+        self.assertEqual(self.feed.comments_count, 0)
+
+    def test_sync_feed_counts_command(self):
+        Feedlike.objects.create(user=self.user, feed=self.feed)
+        comment = Comment.objects.create(feed=self.feed, user=self.user)
+        Recomment.objects.create(comment=comment, user=self.user)
+        call_command("sync_feed_counts", stdout=StringIO())
+        self.feed.refresh_from_db()
+        self.assertEqual(self.feed.like_count, 1)
+        self.assertEqual(self.feed.comments_count, 2)
+
+
+# 커서 기반 페이지네이션 테스트
+class FeedCursorPagination(APITestCase):
+    URL = "/api/v1/feeds/group/category/"
+
+    def setUp(self):
+        self.group = Group.objects.create(name="oz")
+        self.user = User.objects.create(is_coach=True, group=self.group)
+        self.all_category = Category.objects.get(group=self.group, name="전체글")
+        self.popular_category = Category.objects.get(group=self.group, name="인기글")
+        self.category = Category.objects.get(group=self.group, name="일반글")
+        for i in range(30):
+            Feed.objects.create(
+                user=self.user,
+                title=f"feed {i}",
+                category=self.category,
+                group=self.group,
+                like_count=i % 5,
+            )
+
+    def get_page(self, category, cursor=""):
+        return self.client.get(
+            self.URL,
+            {
+                "group_id": self.group.pk,
+                "category_id": category.pk,
+                "cursor": cursor,
+            },
+        )
+
+    def test_cursor_pages_walk_forward_and_back(self):
+        self.client.force_login(self.user)
+        first = self.get_page(self.all_category)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(len(first.data["results"]), 12)
+        self.assertIsNone(first.data["previous"])
+
+        second = self.get_page(self.all_category, first.data["next"])
+        third = self.get_page(self.all_category, second.data["next"])
+        ids = [
+            feed["id"]
+            for page in (first, second, third)
+            for feed in page.data["results"]
+        ]
+        self.assertEqual(ids, sorted(ids, reverse=True))
+        self.assertEqual(len(set(ids)), 30)
+        self.assertIsNone(third.data["next"])
+
+        back = self.get_page(self.all_category, second.data["previous"])
+        self.assertEqual(back.data["results"], first.data["results"])
+
+    def test_popular_cursor_orders_by_like_count(self):
+        self.client.force_login(self.user)
+        first = self.get_page(self.popular_category)
+        second = self.get_page(self.popular_category, first.data["next"])
+        results = first.data["results"] + second.data["results"]
+        keys = [(feed["like_count"], feed["id"]) for feed in results]
+        self.assertEqual(keys, sorted(keys, reverse=True))
+
+    def test_invalid_cursor(self):
+        self.client.force_login(self.user)
+        response = self.get_page(self.all_category, "invalid")
+        self.assertEqual(response.status_code, 400)
+
+    def test_forged_cursor(self):
+        self.client.force_login(self.user)
+        unsigned = base64.urlsafe_b64encode(
+            json.dumps({"p": ["2024-01-01", 1], "r": False}).encode()
+        ).decode()
+        for cursor in (
+            unsigned,
+            encode_cursor(["not a date", 1]),
+            encode_cursor(["2024-01-01T00:00:00", "x"]),
+            encode_cursor([None, 1]),
+            encode_cursor([{"a": 1}, 1]),
+        ):
+            response = self.get_page(self.all_category, cursor)
+            self.assertEqual(response.status_code, 400)
+        response = self.get_page(self.popular_category, encode_cursor(["high", 1]))
+        self.assertEqual(response.status_code, 400)
+
+
+# 좋아요 여부 일괄 조회 테스트
+class FeedIsLikeBatch(APITestCase):
+    URL = "/api/v1/feeds/"
+
+    def setUp(self):
+        self.group = Group.objects.create(name="oz")
+        self.user = User.objects.create(is_coach=True, group=self.group)
+        self.category = Category.objects.get(group=self.group, name="일반글")
+        self.feeds = [
+            Feed.objects.create(
+                user=self.user,
+                title=f"feed {i}",
+                category=self.category,
+                group=self.group,
+            )
+            for i in range(4)
+        ]
+        Feedlike.objects.create(user=self.user, feed=self.feeds[1])
+        self.comment = Comment.objects.create(feed=self.feeds[0], user=self.user)
+        self.other_comment = Comment.objects.create(feed=self.feeds[0], user=self.user)
+        self.recomment = Recomment.objects.create(
+            comment=self.other_comment, user=self.user
+        )
+        Commentlike.objects.create(user=self.user, comment=self.comment)
+        Commentlike.objects.create(user=self.user, recomment=self.recomment)
+
+    def test_feed_list_is_like(self):
+        self.client.force_login(self.user)
+        response = self.client.get(self.URL)
+        is_like = {feed["id"]: feed["is_like"] for feed in response.data["results"]}
+        self.assertEqual(
+            is_like,
+            {feed.pk: feed == self.feeds[1] for feed in self.feeds},
+        )
+
+    def test_comment_thread_is_like(self):
+        self.client.force_login(self.user)
+        response = self.client.get(f"{self.URL}{self.feeds[0].pk}/comment/")
+        comments = {comment["id"]: comment for comment in response.data}
+        self.assertTrue(comments[self.comment.pk]["is_like"])
+        self.assertFalse(comments[self.other_comment.pk]["is_like"])
+        self.assertTrue(comments[self.other_comment.pk]["recomment"][0]["is_like"])
+
+
+# 썸네일 저장 테스트
+class FeedThumbnail(APITestCase):
+    URL = "/api/v1/feeds/"
+    IMAGE = "https://imagedelivery.net/test/first"
+
+    def setUp(self):
+        self.group = Group.objects.create(name="oz")
+        self.user = User.objects.create(is_coach=True, group=self.group)
+        self.category = Category.objects.get(group=self.group, name="일반글")
+        self.feed = Feed.objects.create(
+            user=self.user,
+            title="thumbnail",
+            category=self.category,
+            group=self.group,
+        )
+
+    def test_thumbnail_follows_images(self):
+        self.client.force_login(self.user)
+        self.client.put(
+            f"{self.URL}{self.feed.pk}/", {"image": self.IMAGE}, format="json"
+        )
+        self.feed.refresh_from_db()
+        self.assertEqual(self.feed.thumbnail, self.IMAGE)
+
+        self.client.put(f"{self.URL}{self.feed.pk}/", {"image": None}, format="json")
+        self.feed.refresh_from_db()
+        self.assertIsNone(self.feed.thumbnail)
+
+    def test_feed_list_queries_do_not_grow_per_row(self):
+        self.client.force_login(self.user)
+        with self.assertNumQueries(5):
+            self.client.get(self.URL)
+        for i in range(10):
+            Feed.objects.create(
+                user=self.user,
+                title=f"feed {i}",
+                category=self.category,
+                group=self.group,
+            )
+        with self.assertNumQueries(5):
+            self.client.get(self.URL)
+
+
+# 인기글 점수 테스트
+class FeedRankingScore(APITestCase):
+    URL = "/api/v1/feeds/group/category/"
+
+    def setUp(self):
+        self.group = Group.objects.create(name="oz")
+        self.user = User.objects.create(is_coach=True, group=self.group)
+        self.popular_category = Category.objects.get(group=self.group, name="인기글")
+        self.category = Category.objects.get(group=self.group, name="일반글")
+        self.old_feed = Feed.objects.create(
+            user=self.user,
+            title="old",
+            category=self.category,
+            group=self.group,
+        )
+        self.new_feed = Feed.objects.create(
+            user=self.user,
+            title="new",
+            category=self.category,
+            group=self.group,
+        )
+
+    def get_ids(self):
+        response = self.client.get(
+            self.URL,
+            {"group_id": self.group.pk, "category_id": self.popular_category.pk},
+        )
+        return [feed["id"] for feed in response.data["results"]]
+
+    def test_like_moves_feed_up(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.get_ids(), [self.new_feed.pk, self.old_feed.pk])
+        self.client.post(f"/api/v1/likes/feedlike/{self.old_feed.pk}")
+        self.assertEqual(self.get_ids(), [self.old_feed.pk, self.new_feed.pk])
+
+    def test_old_feed_decays(self):
+        Feed.objects.filter(pk=self.old_feed.pk).update(
+            created_at=timezone.now() - timedelta(days=7), like_count=5
+        )
+        call_command("rescore_feed_rankings", stdout=StringIO())
+        self.client.force_login(self.user)
+        self.assertEqual(self.get_ids(), [self.new_feed.pk, self.old_feed.pk])
+
+    def test_rescore_invalidates_cached_pages(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.get_ids(), [self.new_feed.pk, self.old_feed.pk])
+        Feed.objects.filter(pk=self.new_feed.pk).update(
+            created_at=timezone.now() - timedelta(days=7)
+        )
+        call_command("rescore_feed_rankings", stdout=StringIO())
+        self.assertEqual(self.get_ids(), [self.old_feed.pk, self.new_feed.pk])
+
+    def test_rescore_adds_missing_rankings(self):
+        FeedRanking.objects.all().delete()
+        call_command("rescore_feed_rankings", stdout=StringIO())
+        self.assertEqual(FeedRanking.objects.filter(group=self.group).count(), 2)
+
+
+# 그룹 피드 페이지 캐시 테스트
+class GroupFeedPageCache(APITestCase):
+    URL = "/api/v1/feeds/group/category/"
+
+    def setUp(self):
+        cache.clear()
+        self.group = Group.objects.create(name="oz")
+        self.user = User.objects.create(
+            username="writer", email="writer@example.com", group=self.group
+        )
+        self.other_user = User.objects.create(
+            username="reader", email="reader@example.com", group=self.group
+        )
+        self.category = Category.objects.get(group=self.group, name="전체글")
+        self.feed = Feed.objects.create(
+            user=self.user,
+            title="cached",
+            category=Category.objects.get(group=self.group, name="일반글"),
+            group=self.group,
+        )
+
+    def get_feed(self):
+        response = self.client.get(
+            self.URL, {"group_id": self.group.pk, "category_id": self.category.pk}
+        )
+        return response.data["results"][0]
+
+    def test_cached_page_skips_feed_query(self):
+        self.client.force_login(self.user)
+        self.get_feed()
+        # 세션, 유저, 카테고리, 좋아요 여부
+        with self.assertNumQueries(4):
+            self.get_feed()
+
+    def test_like_invalidates_and_viewer_fields_are_overlaid(self):
+        self.client.force_login(self.other_user)
+        feed = self.get_feed()
+        self.assertFalse(feed["is_writer"])
+        self.client.post(f"/api/v1/likes/feedlike/{self.feed.pk}")
+        feed = self.get_feed()
+        self.assertEqual(feed["like_count"], 1)
+        self.assertTrue(feed["is_like"])
+
+        self.client.force_login(self.user)
+        feed = self.get_feed()
+        self.assertTrue(feed["is_writer"])
+        self.assertFalse(feed["is_like"])
+
+    def test_new_feed_invalidates(self):
+        self.client.force_login(self.user)
+        self.get_feed()
+        self.client.post(
+            "/api/v1/feeds/",
+            {"title": "new", "category": self.feed.category_id},
+            format="json",
+        )
+        self.assertEqual(self.get_feed()["title"], "new")
+
+
+@mock.patch(
+    "common.caches.SHARED_CACHE_BACKENDS",
+    ("django.core.cache.backends.locmem.LocMemCache",),
+)
+class FeedVisitBuffer(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.group = Group.objects.create(name="oz")
+        self.user = User.objects.create(
+            username="reader", email="reader@example.com", group=self.group
+        )
+        self.feed = Feed.objects.create(
+            user=self.user,
+            title="visit",
+            category=Category.objects.get(group=self.group, name="일반글"),
+            group=self.group,
+        )
+        self.client.force_login(self.user)
+
+    def get_visited(self):
+        response = self.client.get(f"/api/v1/feeds/{self.feed.pk}/")
+        return response.data["visited"]
+
+    def test_visits_are_buffered(self):
+        self.assertEqual(self.get_visited(), 1)
+        self.assertEqual(self.get_visited(), 2)
+        self.feed.refresh_from_db()
+        self.assertEqual(self.feed.visited, 0)
+
+    def test_flush_persists_visits(self):
+        self.get_visited()
+        self.get_visited()
+        call_command("flush_feed_visits", "--all", stdout=StringIO())
+        self.feed.refresh_from_db()
+        self.assertEqual(self.feed.visited, 2)
+        # 반영된 조회수가 중복으로 더해지지 않아야 합니다.
+        self.assertEqual(self.get_visited(), 3)
+        call_command("flush_feed_visits", "--all", stdout=StringIO())
+        self.feed.refresh_from_db()
+        self.assertEqual(self.feed.visited, 3)
+
+    def test_group_page_includes_pending_visits(self):
+        self.get_visited()
+        category = Category.objects.get(group=self.group, name="전체글")
+        response = self.client.get(
+            "/api/v1/feeds/group/category/",
+            {"group_id": self.group.pk, "category_id": category.pk},
+        )
+        self.assertEqual(response.data["results"][0]["visited"], 1)
+
+    def test_feed_lists_include_pending_visits(self):
+        self.get_visited()
+        for url, params in (
+            ("/api/v1/feeds/", {"cursor": ""}),
+            ("/api/v1/feeds/batch/", {"ids": self.feed.pk}),
+            ("/api/v1/users/me/feedlist/", {"cursor": ""}),
+        ):
+            response = self.client.get(url, params)
+            self.assertEqual(response.data["results"][0]["visited"], 1, url)
+
+
+class FeedVisitWithoutSharedCache(APITestCase):
+    def setUp(self):
+        cache.clear()
+        clear_local_visits()
+        self.group = Group.objects.create(name="oz")
+        self.user = User.objects.create(
+            username="reader", email="reader@example.com", group=self.group
+        )
+        self.feed = Feed.objects.create(
+            user=self.user,
+            title="visit",
+            category=Category.objects.get(group=self.group, name="일반글"),
+            group=self.group,
+        )
+        self.client.force_login(self.user)
+
+    def test_visits_are_buffered_in_process(self):
+        # 로컬 메모리 캐시 대신 프로세스 메모리에 모아두고 그룹 버전은 그대로 둡니다.
+        version = get_group_version(self.group.pk)
+        self.client.get(f"/api/v1/feeds/{self.feed.pk}/")
+        response = self.client.get(f"/api/v1/feeds/{self.feed.pk}/")
+        self.assertEqual(response.data["visited"], 2)
+        self.feed.refresh_from_db()
+        self.assertEqual(self.feed.visited, 0)
+        self.assertEqual(get_group_version(self.group.pk), version)
+
+        call_command("flush_feed_visits", stdout=StringIO())
+        self.feed.refresh_from_db()
+        self.assertEqual(self.feed.visited, 2)
+        self.assertEqual(pending_visits([self.feed.pk]), {})
+
+    def test_flush_at_threshold(self):
+        with mock.patch("feeds.visits.LOCAL_FLUSH_THRESHOLD", 3):
+            for _ in range(3):
+                self.client.get(f"/api/v1/feeds/{self.feed.pk}/")
+        self.feed.refresh_from_db()
+        self.assertEqual(self.feed.visited, 3)
+
+
+class FeedSearchIndex(APITestCase):
+    def setUp(self):
+        cache.clear()
+        clear_title_indexes()
+        self.group = Group.objects.create(name="oz")
+        self.user = User.objects.create(
+            username="searcher", email="searcher@example.com", group=self.group
+        )
+        self.category = Category.objects.get(group=self.group, name="일반글")
+        self.client.force_login(self.user)
+
+    def create_feed(self, title, description=None):
+        return Feed.objects.create(
+            user=self.user,
+            title=title,
+            description=description,
+            category=self.category,
+            group=self.group,
+        )
+
+    def search(self, keyword, url="group/search/result", **params):
+        return self.client.get(
+            f"/api/v1/feeds/{url}",
+            {"group_id": self.group.pk, "keyword": keyword, **params},
+        )
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("커리큘럼 Q&A"), {"커리", "리큘", "큘럼", "q", "a"})
+
+    def test_search_ranks_title_matches_first(self):
+        in_description = self.create_feed("공지", "내일 커리큘럼 안내")
+        in_title = self.create_feed("이번주 커리큘럼")
+        starts_with = self.create_feed("커리큘럼 질문")
+        self.create_feed("커리 맛집")
+
+        response = self.search("커리큘럼")
+        self.assertEqual(
+            [feed["id"] for feed in response.data["results"]],
+            [starts_with.pk, in_title.pk, in_description.pk],
+        )
+        response = self.search("커리큘럼", url="group/search/")
+        self.assertEqual(
+            [feed["id"] for feed in response.data["result"]],
+            [starts_with.pk, in_title.pk],
+        )
+
+    def test_index_follows_feed_update(self):
+        feed = self.create_feed("장고 질문")
+        feed.title = "리액트 질문"
+        feed.save()
+        self.assertEqual(self.search("장고").data["count"], 0)
+        self.assertEqual(self.search("리액트").data["count"], 1)
+
+    def test_cursor_pagination(self):
+        for index in range(13):
+            self.create_feed(f"검색 {index}")
+        first = self.search("검색", cursor="")
+        second = self.search("검색", cursor=first.data["next"])
+        ids = [feed["id"] for feed in first.data["results"] + second.data["results"]]
+        self.assertEqual(len(set(ids)), 13)
+
+    def test_single_character_keyword(self):
+        self.create_feed("점심 메뉴 추천")
+        self.assertEqual(self.search("점").data["count"], 1)
+
+    def test_rebuild_command(self):
+        self.create_feed("색인 재생성")
+        FeedSearchToken.objects.all().delete()
+        call_command("rebuild_feed_search_index", stdout=StringIO())
+        self.assertEqual(self.search("재생성").data["count"], 1)
+
+
+class FeedTitleSuggestion(APITestCase):
+    def setUp(self):
+        cache.clear()
+        clear_title_indexes()
+        self.group = Group.objects.create(name="oz")
+        self.user = User.objects.create(
+            username="suggest", email="suggest@example.com", group=self.group
+        )
+        self.category = Category.objects.get(group=self.group, name="일반글")
+        self.feed = self.create_feed("[공지] 오늘 점심 메뉴")
+
+    def create_feed(self, title, group=None):
+        group = group or self.group
+        return Feed.objects.create(
+            user=self.user,
+            title=title,
+            category=Category.objects.get(group=group, name="일반글"),
+            group=group,
+        )
+
+    def titles(self, keyword):
+        return [feed["title"] for feed in suggest_titles(self.group.pk, keyword)]
+
+    def test_prefix_of_title_and_words(self):
+        other = self.create_feed("점심 뭐 먹지")
+        self.assertEqual(self.titles("점심"), [other.title, self.feed.title])
+        self.assertEqual(self.titles("[공지"), [self.feed.title])
+        self.assertEqual(self.titles("메"), [self.feed.title])
+        self.assertEqual(self.titles("심"), [])
+
+    def test_suggestions_are_served_from_memory(self):
+        self.titles("오늘")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.titles("오늘"), [self.feed.title])
+
+    def test_incremental_updates(self):
+        self.titles("오늘")
+        with self.captureOnCommitCallbacks(execute=True):
+            feed = self.create_feed("오늘 저녁")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.titles("오늘"), [feed.title, self.feed.title])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            feed.title = "내일 저녁"
+            feed.save()
+            self.feed.delete()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.titles("오늘"), [])
+            self.assertEqual(self.titles("내일"), [feed.title])
+
+    def test_rebuilds_when_changed_elsewhere(self):
+        self.titles("오늘")
+        cache.incr(title_version_key(self.group.pk))
+        with self.assertNumQueries(1):
+            self.titles("오늘")
+
+    def test_built_index_is_sorted(self):
+        self.create_feed("가나다 라마")
+        self.create_feed("바사 아자")
+        index = get_title_index(self.group.pk)
+        self.assertEqual(index.keys, sorted(index.keys))
+        self.assertEqual(len(index.keys), sum(len(f[2]) for f in index.feeds.values()))
+
+    def test_scan_is_bounded(self):
+        for number in range(5):
+            self.create_feed(f"오늘 {number}")
+        with mock.patch("feeds.suggestions.MAX_SCANNED_KEYS", 2):
+            self.assertEqual(len(self.titles("오늘")), 2)
+
+    def test_suggest_holds_index_lock(self):
+        from . import suggestions
+
+        original = suggestions.TitleIndex.suggest
+
+        def suggest(index, *args):
+            self.assertTrue(suggestions._lock.locked())
+            return original(index, *args)
+
+        with mock.patch.object(suggestions.TitleIndex, "suggest", suggest):
+            self.assertEqual(self.titles("오늘"), [self.feed.title])
+
+    def test_lru_bound(self):
+        other_group = Group.objects.create(name="other")
+        self.create_feed("다른 그룹", group=other_group)
+        with mock.patch("feeds.suggestions.MAX_GROUP_INDEXES", 1):
+            self.titles("오늘")
+            first = get_title_index(self.group.pk)
+            suggest_titles(other_group.pk, "다른")
+            self.assertIsNot(get_title_index(self.group.pk), first)
+
+    def test_endpoint(self):
+        self.client.force_login(self.user)
+        response = self.client.get(
+            "/api/v1/feeds/group/search/",
+            {"group_id": self.group.pk, "keyword": "오늘"},
+        )
+        self.assertEqual(
+            response.data, {"result": [{"id": self.feed.pk, "title": self.feed.title}]}
+        )
+
+
+class TopLikeFeeds(APITestCase):
+    URL = "/api/v1/feeds/toplike/"
+
+    def setUp(self):
+        cache.clear()
+        self.group = Group.objects.create(name="oz")
+        self.user = User.objects.create(
+            username="top", email="top@example.com", group=self.group
+        )
+        self.category = Category.objects.get(group=self.group, name="일반글")
+        self.client.force_login(self.user)
+
+    def create_feeds(self, count, like_count=0, created_at=None):
+        feeds = [
+            Feed.objects.create(
+                user=self.user,
+                title=f"top {like_count}",
+                category=self.category,
+                group=self.group,
+            )
+            for _ in range(count)
+        ]
+        update = {"like_count": like_count}
+        if created_at:
+            update["created_at"] = created_at
+        Feed.objects.filter(pk__in=[feed.pk for feed in feeds]).update(**update)
+        return feeds
+
+    def test_windows(self):
+        old = self.create_feeds(1, 10, timezone.now() - timedelta(days=3))[0]
+        recent = self.create_feeds(1, 5)[0]
+        self.create_feeds(1, 0)
+        call_command("refresh_top_feeds", stdout=StringIO())
+
+        response = self.client.get(self.URL, {"window": "all"})
+        self.assertEqual(
+            [feed["id"] for feed in response.data["results"]], [old.pk, recent.pk]
+        )
+        response = self.client.get(self.URL, {"window": "day"})
+        self.assertEqual([feed["id"] for feed in response.data["results"]], [recent.pk])
+        self.assertEqual(self.client.get(self.URL, {"window": "year"}).status_code, 400)
+
+    def test_requests_serve_stale_table(self):
+        feed = self.create_feeds(1, 1)[0]
+        response = self.client.get(self.URL)
+        self.assertEqual(response.data["results"], [])
+        self.assertFalse(TopFeed.objects.exists())
+        call_command("refresh_top_feeds", "--window", "week", stdout=StringIO())
+        response = self.client.get(self.URL)
+        self.assertEqual(response.data["results"][0]["id"], feed.pk)
+
+    def test_reads_do_not_grow_with_feed_table(self):
+        self.create_feeds(3, 1)
+        call_command("refresh_top_feeds", stdout=StringIO())
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(self.URL)
+
+        self.create_feeds(40, 2)
+        call_command("refresh_top_feeds", stdout=StringIO())
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(self.URL, {"page": 2})
+        self.assertEqual(len(small), len(large))
+        self.assertEqual(response.data["count"], 43)
+
+
+class GroupCategoryFeedCount(APITestCase):
+    URL = "/api/v1/feeds/group/category/"
+
+    def setUp(self):
+        cache.clear()
+        self.group = Group.objects.create(name="oz")
+        self.user = User.objects.create(
+            username="counter", email="counter@example.com", group=self.group
+        )
+        self.category = Category.objects.get(group=self.group, name="일반글")
+        self.other_category = Category.objects.create(group=self.group, name="질문")
+        self.feed = Feed.objects.create(
+            user=self.user, title="count", category=self.category, group=self.group
+        )
+        self.client.force_login(self.user)
+
+    def assertFeedCounts(self, group, category, other_category):
+        self.group.refresh_from_db()
+        self.category.refresh_from_db()
+        self.other_category.refresh_from_db()
+        self.assertEqual(
+            (
+                self.group.feed_count,
+                self.category.feed_count,
+                self.other_category.feed_count,
+            ),
+            (group, category, other_category),
+        )
+
+    def test_counters_follow_feed_changes(self):
+        self.assertFeedCounts(1, 1, 0)
+        feed = Feed.objects.get(pk=self.feed.pk)
+        feed.category = self.other_category
+        feed.save()
+        self.assertFeedCounts(1, 0, 1)
+        feed.delete()
+        self.assertFeedCounts(0, 0, 0)
+
+    def test_page_does_not_count(self):
+        for category in Category.objects.filter(group=self.group):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(
+                    self.URL, {"group_id": self.group.pk, "category_id": category.pk}
+                )
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse(
+                [
+                    query
+                    for query in queries
+                    if query["sql"].startswith("SELECT COUNT(")
+                ],
+                category.name,
+            )
+        response = self.client.get(
+            self.URL, {"group_id": self.group.pk, "category_id": self.category.pk}
+        )
+        self.assertEqual(response.data["count"], 1)
+
+    def test_category_of_other_group(self):
+        other_group = Group.objects.create(name="other")
+        category = Category.objects.get(group=other_group, name="전체글")
+        response = self.client.get(
+            self.URL, {"group_id": self.group.pk, "category_id": category.pk}
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_sync_command_repairs_drift(self):
+        Group.objects.filter(pk=self.group.pk).update(feed_count=10)
+        Category.objects.filter(pk=self.category.pk).update(feed_count=0)
+        call_command("sync_feed_counts", stdout=StringIO())
+        self.assertFeedCounts(1, 1, 0)
+
+    def test_search_count_is_cached(self):
+        params = {"group_id": self.group.pk, "keyword": "count"}
+        self.client.get("/api/v1/feeds/group/search/result", params)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/v1/feeds/group/search/result", params)
+        self.assertEqual(response.data["count"], 1)
+        self.assertFalse(
+            [query for query in queries if query["sql"].startswith("SELECT COUNT(")]
+        )
+
+
+@mock.patch(
+    "common.caches.SHARED_CACHE_BACKENDS",
+    ("django.core.cache.backends.locmem.LocMemCache",),
+)
+class FeedConditionalGet(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.group = Group.objects.create(name="oz")
+        self.user = User.objects.create(
+            username="poller", email="poller@example.com", group=self.group
+        )
+        self.category = Category.objects.get(group=self.group, name="전체글")
+        self.feed = Feed.objects.create(
+            user=self.user,
+            title="etag",
+            category=Category.objects.get(group=self.group, name="일반글"),
+            group=self.group,
+        )
+        self.detail_url = f"/api/v1/feeds/{self.feed.pk}/"
+        self.client.force_login(self.user)
+
+    def get_page(self, **headers):
+        return self.client.get(
+            "/api/v1/feeds/group/category/",
+            {"group_id": self.group.pk, "category_id": self.category.pk},
+            **headers,
+        )
+
+    def test_detail_not_modified(self):
+        response = self.client.get(self.detail_url)
+        etag = response["ETag"]
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        # 304 응답은 조회수를 올리지 않습니다.
+        self.assertEqual(self.client.get(self.detail_url).data["visited"], 2)
+
+    def test_detail_changes_after_like(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+        self.client.post(f"/api/v1/likes/feedlike/{self.feed.pk}")
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["like_count"], 1)
+
+    def test_detail_if_modified_since(self):
+        response = self.client.get(self.detail_url)
+        response = self.client.get(
+            self.detail_url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_page_not_modified(self):
+        etag = self.get_page()["ETag"]
+        # 세션, 유저, 카테고리
+        with self.assertNumQueries(3):
+            response = self.get_page(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.client.get(self.detail_url)
+        response = self.get_page(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"][0]["visited"], 1)
+
+    def test_page_not_modified_skips_page_cache(self):
+        etag = self.get_page()["ETag"]
+        with mock.patch("feeds.views.group_page_cache_key") as page_cache_key:
+            response = self.get_page(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        page_cache_key.assert_not_called()
+
+    def test_page_changes_after_buffered_visit(self):
+        etag = self.get_page()["ETag"]
+        self.client.get(self.detail_url)
+        response = self.get_page(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"][0]["visited"], 1)
+
+    def test_page_etag_depends_on_viewer(self):
+        etag = self.get_page()["ETag"]
+        other = User.objects.create(
+            username="other", email="other@example.com", group=self.group
+        )
+        self.client.force_login(other)
+        self.assertEqual(self.get_page(HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class FeedConditionalGetWithoutSharedCache(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.group = Group.objects.create(name="oz")
+        self.user = User.objects.create(
+            username="poller", email="poller@example.com", group=self.group
+        )
+        self.feed = Feed.objects.create(
+            user=self.user,
+            title="etag",
+            category=Category.objects.get(group=self.group, name="일반글"),
+            group=self.group,
+        )
+        self.client.force_login(self.user)
+
+    def test_no_validators(self):
+        # 그룹 버전이 프로세스마다 따로 저장되므로 304 를 돌려주지 않습니다.
+        category = Category.objects.get(group=self.group, name="전체글")
+        for url, params in (
+            (f"/api/v1/feeds/{self.feed.pk}/", {}),
+            (
+                "/api/v1/feeds/group/category/",
+                {"group_id": self.group.pk, "category_id": category.pk},
+            ),
+        ):
+            response = self.client.get(url, params)
+            self.assertNotIn("ETag", response)
+            self.assertNotIn("Last-Modified", response)
+            response = self.client.get(url, params, HTTP_IF_NONE_MATCH="*")
+            self.assertEqual(response.status_code, 200)
+
+
+class SparseFieldsets(APITestCase):
+    URL = "/api/v1/feeds/"
+
+    def setUp(self):
+        cache.clear()
+        self.group = Group.objects.create(name="oz")
+        self.user = User.objects.create(
+            username="sparse", email="sparse@example.com", group=self.group
+        )
+        self.other_user = User.objects.create(
+            username="other", email="other@example.com", group=self.group
+        )
+        self.feed = Feed.objects.create(
+            user=self.user,
+            title="sparse",
+            category=Category.objects.get(group=self.group, name="일반글"),
+            group=self.group,
+        )
+        comment = Comment.objects.create(feed=self.feed, user=self.other_user)
+        Recomment.objects.create(comment=comment, user=self.user)
+        self.client.force_login(self.user)
+
+    def test_fields_and_omit(self):
+        response = self.client.get(self.URL, {"fields": "id,title"})
+        self.assertEqual(
+            response.data["results"], [{"id": self.feed.pk, "title": "sparse"}]
+        )
+        response = self.client.get(f"{self.URL}{self.feed.pk}/", {"omit": "group"})
+        self.assertNotIn("group", response.data)
+        self.assertIn("title", response.data)
+
+    def test_omitted_is_like_skips_like_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.URL, {"omit": "is_like"})
+        self.assertFalse(
+            [query for query in queries if "likes_feedlike" in query["sql"]]
+        )
+
+    def test_group_page_fields(self):
+        category = Category.objects.get(group=self.group, name="전체글")
+        params = {"group_id": self.group.pk, "category_id": category.pk}
+        self.client.get("/api/v1/feeds/group/category/", params)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                "/api/v1/feeds/group/category/", {**params, "fields": "id,is_writer"}
+            )
+        self.assertEqual(
+            response.data["results"], [{"id": self.feed.pk, "is_writer": True}]
+        )
+        self.assertFalse(
+            [query for query in queries if "likes_feedlike" in query["sql"]]
+        )
+
+    def test_comment_fields_skip_prefetch(self):
+        url = f"{self.URL}{self.feed.pk}/comment/"
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {"fields": "id,description"})
+        self.assertEqual(list(response.data[0]), ["id", "description"])
+        self.assertFalse(
+            [
+                query
+                for query in queries
+                if "comments_recomment" in query["sql"]
+                or "likes_commentlike" in query["sql"]
+            ]
+        )
+
+        response = self.client.get(url, {"fields": "id,anonymous_number,recomment"})
+        self.assertEqual(response.data[0]["anonymous_number"], "익명1")
+        self.assertEqual(
+            response.data[0]["recomment"][0]["anonymous_number"], "익명(작성자)"
+        )
+
+
+class FeedRowSerialization(APITestCase):
+    def setUp(self):
+        clear_local_visits()
+        self.group = Group.objects.create(name="oz")
+        self.coach = User.objects.create(
+            username="coach", email="coach@example.com", group=self.group, is_coach=True
+        )
+        self.user = User.objects.create(
+            username="student", email="student@example.com", group=self.group
+        )
+        category = Category.objects.get(group=self.group, name="일반글")
+        for index, user in enumerate([self.coach, self.user, self.coach]):
+            feed = Feed.objects.create(
+                user=user, title=f"row {index}", category=category, group=self.group
+            )
+        Feed.objects.filter(pk=feed.pk).update(
+            thumbnail="https://example.com/a.png", visited=7, like_count=2
+        )
+        Feedlike.objects.create(user=self.user, feed=feed)
+        comment = Comment.objects.create(user=self.user, feed=feed, description="c")
+        with self.captureOnCommitCallbacks(execute=True):
+            Commentlike.objects.create(user=self.coach, comment=comment)
+
+    def request(self, **params):
+        request = APIRequestFactory().get("/api/v1/feeds/", params)
+        force_authenticate(request, user=self.user)
+        request = Request(request)
+        return request
+
+    def assertSameOutput(self, request):
+        feeds = Feed.objects.select_related("user", "best_comment").order_by(
+            "-created_at"
+        )
+        expected = FeedSerializer(feeds, many=True, context={"request": request}).data
+        rows = feed_rows(Feed.objects.order_by("-created_at"))
+        self.assertEqual(
+            json.dumps(serialize_feed_rows(rows, request)), json.dumps(expected)
+        )
+
+    def test_matches_feed_serializer(self):
+        self.assertTrue(Feed.objects.filter(best_comment__isnull=False).exists())
+        self.assertSameOutput(self.request())
+        self.assertSameOutput(self.request(fields="id,is_like", omit="id"))
+
+    def test_anonymous_and_prefixed_rows(self):
+        expected = FeedSerializer(Feed.objects.order_by("-created_at"), many=True).data
+        rows = feed_rows(
+            FeedRanking.objects.order_by("-feed__created_at"), prefix="feed__"
+        )
+        self.assertEqual(serialize_feed_rows(rows, prefix="feed__"), expected)
+
+
+class FeedBatchFetch(APITestCase):
+    URL = "/api/v1/feeds/batch/"
+
+    def setUp(self):
+        clear_local_visits()
+        cache.clear()
+        self.group = Group.objects.create(name="oz")
+        self.other_group = Group.objects.create(name="other")
+        self.user = User.objects.create(
+            username="batch", email="batch@example.com", group=self.group
+        )
+        self.feeds = [
+            Feed.objects.create(
+                user=self.user,
+                title=f"batch {index}",
+                category=Category.objects.get(group=self.group, name="일반글"),
+                group=self.group,
+            )
+            for index in range(3)
+        ]
+        self.other_feed = Feed.objects.create(
+            user=self.user,
+            title="other",
+            category=Category.objects.get(group=self.other_group, name="일반글"),
+            group=self.other_group,
+        )
+        self.client.force_login(self.user)
+
+    def get_ids(self, *pks):
+        return self.client.get(self.URL, {"ids": ",".join(map(str, pks))})
+
+    def test_batch(self):
+        Feedlike.objects.create(user=self.user, feed=self.feeds[1])
+        response = self.get_ids(
+            self.feeds[2].pk, self.feeds[1].pk, self.other_feed.pk, 9999
+        )
+        self.assertEqual(
+            [(feed["id"], feed["is_like"]) for feed in response.data["results"]],
+            [(self.feeds[2].pk, False), (self.feeds[1].pk, True)],
+        )
+        self.assertEqual(response.data["forbidden"], [self.other_feed.pk])
+        self.assertEqual(response.data["not_found"], [9999])
+        self.assertFalse(Feed.objects.filter(visited__gt=0).exists())
+
+    def test_constant_queries(self):
+        with CaptureQueriesContext(connection) as one:
+            self.get_ids(self.feeds[0].pk)
+        with CaptureQueriesContext(connection) as many:
+            self.get_ids(*[feed.pk for feed in self.feeds])
+        self.assertEqual(len(one), len(many))
+
+    def test_invalid_ids(self):
+        self.assertEqual(self.client.get(self.URL).status_code, 400)
+        self.assertEqual(self.get_ids("a").status_code, 400)
+        self.assertEqual(self.get_ids(*range(1, 102)).status_code, 400)
+
+
+class FeedCommentCursor(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.group = Group.objects.create(name="oz")
+        self.writer = User.objects.create(
+            username="writer", email="writer@example.com", group=self.group
+        )
+        self.users = [
+            User.objects.create(
+                username=f"thread{index}",
+                email=f"thread{index}@example.com",
+                group=self.group,
+            )
+            for index in range(2)
+        ]
+        self.feed = Feed.objects.create(
+            user=self.writer,
+            title="thread",
+            category=Category.objects.get(group=self.group, name="일반글"),
+            group=self.group,
+        )
+        self.comments = [
+            Comment.objects.create(
+                user=self.users[index % 2], feed=self.feed, description=str(index)
+            )
+            for index in range(views.COMMENT_PAGE_SIZE + 2)
+        ]
+        self.recomments = [
+            Recomment.objects.create(
+                user=self.writer if index == 0 else self.users[1],
+                comment=self.comments[-1],
+                description=str(index),
+            )
+            for index in range(views.RECOMMENT_PAGE_SIZE + 2)
+        ]
+        self.url = f"/api/v1/feeds/{self.feed.pk}/comment/"
+        self.client.force_login(self.users[0])
+
+    def test_pages(self):
+        first = self.client.get(self.url, {"cursor": ""})
+        self.assertEqual(
+            [comment["id"] for comment in first.data["results"]],
+            [comment.pk for comment in self.comments[: views.COMMENT_PAGE_SIZE]],
+        )
+        self.assertIsNone(first.data["previous"])
+        second = self.client.get(self.url, {"cursor": first.data["next"]})
+        self.assertEqual(
+            [comment["id"] for comment in second.data["results"]],
+            [comment.pk for comment in self.comments[views.COMMENT_PAGE_SIZE :]],
+        )
+        self.assertIsNone(second.data["next"])
+        # 익명 번호는 페이지와 상관없이 처음 작성한 순서를 따릅니다.
+        last = second.data["results"][-1]
+        self.assertEqual(last["anonymous_number"], "익명2")
+        self.assertEqual(first.data["results"][1]["anonymous_number"], "익명2")
+        self.assertEqual(first.data["results"][0]["anonymous_number"], "익명1")
+
+    def test_recomment_load_more(self):
+        response = self.client.get(self.url, {"cursor": ""})
+        response = self.client.get(self.url, {"cursor": response.data["next"]})
+        last = response.data["results"][-1]
+        self.assertEqual(len(last["recomment"]), views.RECOMMENT_PAGE_SIZE)
+        self.assertEqual(last["recomment"][0]["anonymous_number"], "익명(작성자)")
+        self.assertIsNone(response.data["results"][0]["recomment_next"])
+
+        more = self.client.get(
+            f"{self.url}{self.comments[-1].pk}/recomment/",
+            {"cursor": last["recomment_next"]},
+        )
+        self.assertEqual(
+            [recomment["pk"] for recomment in more.data["results"]],
+            [
+                recomment.pk
+                for recomment in self.recomments[views.RECOMMENT_PAGE_SIZE :]
+            ],
+        )
+        self.assertEqual(more.data["results"][0]["anonymous_number"], "익명2")
+        self.assertIsNone(more.data["next"])
+
+    def test_without_cursor(self):
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data), len(self.comments))
+        self.assertEqual(len(response.data[-1]["recomment"]), len(self.recomments))
+        self.assertNotIn("recomment_next", response.data[-1])
+
+    def test_other_comment(self):
+        other_feed = Feed.objects.create(
+            user=self.writer,
+            title="other",
+            category=Category.objects.get(group=self.group, name="일반글"),
+            group=self.group,
+        )
+        response = self.client.get(
+            f"/api/v1/feeds/{other_feed.pk}/comment/{self.comments[0].pk}/recomment/"
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+class CommentThreadQueries(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.group = Group.objects.create(name="oz")
+        self.writer = User.objects.create(
+            username="writer", email="writer@example.com", group=self.group
+        )
+        self.reader = User.objects.create(
+            username="reader", email="reader@example.com", group=self.group
+        )
+        self.client.force_login(self.reader)
+
+    def create_thread(self, size):
+        feed = Feed.objects.create(
+            user=self.writer,
+            title="thread",
+            category=Category.objects.get(group=self.group, name="일반글"),
+            group=self.group,
+        )
+        for index in range(size):
+            user = User.objects.create(
+                username=f"thread{feed.pk}-{index}",
+                email=f"thread{feed.pk}-{index}@example.com",
+                group=self.group,
+            )
+            comment = Comment.objects.create(user=user, feed=feed, description="c")
+            Commentlike.objects.create(user=self.reader, comment=comment)
+            for _ in range(size):
+                recomment = Recomment.objects.create(
+                    user=self.writer, comment=comment, description="r"
+                )
+                Commentlike.objects.create(user=user, recomment=recomment)
+        return feed
+
+    def count_queries(self, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response
+
+    def test_constant_queries(self):
+        small, large = self.create_thread(1), self.create_thread(4)
+        for params in (None, {"cursor": ""}):
+            small_count, _ = self.count_queries(
+                f"/api/v1/feeds/{small.pk}/comment/", params
+            )
+            large_count, response = self.count_queries(
+                f"/api/v1/feeds/{large.pk}/comment/", params
+            )
+            self.assertEqual(small_count, large_count)
+            results = response.data if params is None else response.data["results"]
+            self.assertEqual(results[0]["commentlikeCount"], 1)
+            self.assertTrue(results[0]["is_like"])
+            self.assertEqual(results[0]["recomment"][0]["commentlikeCount"], 1)
+            self.assertTrue(results[0]["recomment"][0]["feed_writer"])
+
+        small_comment, large_comment = (
+            Comment.objects.filter(feed=feed).first() for feed in (small, large)
+        )
+        small_count, _ = self.count_queries(
+            f"/api/v1/feeds/{small.pk}/comment/{small_comment.pk}/recomment/"
+        )
+        large_count, _ = self.count_queries(
+            f"/api/v1/feeds/{large.pk}/comment/{large_comment.pk}/recomment/"
+        )
+        self.assertEqual(small_count, large_count)
+
+
+class CommentThreadCache(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.group = Group.objects.create(name="oz")
+        self.writer = User.objects.create(
+            username="writer", email="writer@example.com", group=self.group
+        )
+        self.reader = User.objects.create(
+            username="reader", email="reader@example.com", group=self.group
+        )
+        self.feed = Feed.objects.create(
+            user=self.writer,
+            title="thread",
+            category=Category.objects.get(group=self.group, name="일반글"),
+            group=self.group,
+        )
+        self.comment = Comment.objects.create(
+            user=self.reader, feed=self.feed, description="comment"
+        )
+        self.recomment = Recomment.objects.create(
+            user=self.writer, comment=self.comment, description="recomment"
+        )
+        self.url = f"/api/v1/feeds/{self.feed.pk}/comment/"
+
+    def test_cached_thread_overlays_viewer(self):
+        Commentlike.objects.create(user=self.reader, recomment=self.recomment)
+        self.client.force_login(self.reader)
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertFalse(
+            [query for query in queries if "comments_recomment" in query["sql"]]
+        )
+        self.assertTrue(response.data[0]["is_writer"])
+        self.assertTrue(response.data[0]["recomment"][0]["is_like"])
+
+        self.client.force_login(self.writer)
+        response = self.client.get(self.url)
+        self.assertFalse(response.data[0]["is_writer"])
+        self.assertTrue(response.data[0]["recomment"][0]["is_writer"])
+        self.assertFalse(response.data[0]["recomment"][0]["is_like"])
+
+    def test_writes_invalidate_thread(self):
+        self.client.force_login(self.reader)
+        self.client.get(self.url)
+        self.client.post(self.url, {"description": "second"})
+        self.assertEqual(len(self.client.get(self.url).data), 2)
+
+        self.client.post(f"/api/v1/likes/commentlike/{self.comment.pk}")
+        response = self.client.get(self.url)
+        self.assertEqual(response.data[0]["commentlikeCount"], 1)
+        self.assertTrue(response.data[0]["is_like"])
+
+        self.client.force_login(self.writer)
+        self.client.delete(f"/api/v1/comments/recomments/{self.recomment.pk}")
+        self.assertEqual(self.client.get(self.url).data[0]["recomment"], [])
@@ -0,0 +1,31 @@
+from datetime import timedelta
+from django.db import transaction
+from django.utils import timezone
+from .models import Feed, TopFeed
+
+# 윈도우별로 저장해둘 상위 게시글 수
+TOP_FEED_LIMIT = 96
+
+WINDOWS = {
+    TopFeed.WindowChoices.DAY: timedelta(days=1),
+    TopFeed.WindowChoices.WEEK: timedelta(weeks=1),
+    TopFeed.WindowChoices.ALL: None,
+}
+
+
+def refresh_top_feeds(window):
+    # 요청 중에는 실행하지 않고 refresh_top_feeds 명령으로 주기적으로 실행합니다.
+    feeds = Feed.objects.filter(like_count__gt=0)
+    if WINDOWS[window] is not None:
+        feeds = feeds.filter(created_at__gte=timezone.now() - WINDOWS[window])
+    feeds = feeds.order_by("-like_count", "-created_at", "-id").values_list(
+        "pk", "like_count"
+    )[:TOP_FEED_LIMIT]
+    entries = [
+        TopFeed(window=window, rank=rank, feed_id=pk, like_count=like_count)
+        for rank, (pk, like_count) in enumerate(feeds, start=1)
+    ]
+    with transaction.atomic():
+        TopFeed.objects.filter(window=window).delete()
+        TopFeed.objects.bulk_create(entries)
+    return len(entries)
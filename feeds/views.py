@@ -1,12 +1,30 @@
+import hashlib
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from django.core.paginator import Paginator
-from django.db.models import Count
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.exceptions import NotFound, ParseError, PermissionDenied
-from .models import Feed
+from .models import Feed, FeedRanking, TopFeed
+from .ranking import update_feed_ranking
+from .caches import (
+    ALL_FEED_COUNT_KEY,
+    FEED_PAGE_CACHE_TIMEOUT,
+    bump_group_version,
+    conditional_get_enabled,
+    get_group_modified,
+    get_group_pending,
+    get_group_version,
+    group_page_cache_key,
+    make_etag,
+    overlay_viewer_fields,
+    set_conditional_headers,
+)
+from .search import search_feeds
+from .suggestions import suggest_titles
+from .visits import add_visit, add_pending_visits, maybe_flush_visits, pending_visits
+from likes.buffer import buffered_like_states, pending_likes
 from . import serializers
 from django.shortcuts import get_object_or_404
 from groups.models import Group
@@ -14,10 +32,33 @@ from categories.models import Category
 from medias.models import Image
 from comments.serializers import CommentSerializer
 from comments.serializers import RecommentSerializer
-from comments.models import Comment
-from django.db.models import F, Q
+from comments.models import Comment, Recomment
+from comments.caches import (
+    COMMENT_THREAD_CACHE_TIMEOUT,
+    bump_thread_version,
+    overlay_comment_viewer_fields,
+    thread_cache_key,
+)
+from comments.querysets import with_like_count
+from django.db.models import F, Prefetch, Window
+from django.db.models.functions import RowNumber
+from django.db import transaction
 from rest_framework import permissions
 from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from common.pagination import (
+    CountedPaginator,
+    CursorPaginator,
+    cached_count,
+    encode_cursor,
+)
+from common.serializers import filter_fields, is_field_requested
+
+
+# 댓글 커서 페이지네이션 크기
+COMMENT_PAGE_SIZE = 20
+RECOMMENT_PAGE_SIZE = 3
+RECOMMENT_LOAD_MORE_SIZE = 20
 
 
 class IsCoachOrStaff(permissions.BasePermission):
@@ -181,6 +222,22 @@ feed_schema = openapi.Schema(
 )
 
 
+sparse_field_parameters = [
+    openapi.Parameter(
+        "fields",
+        openapi.IN_QUERY,
+        description="응답에 포함할 필드 (쉼표로 구분) ex) id,title",
+        type=openapi.TYPE_STRING,
+    ),
+    openapi.Parameter(
+        "omit",
+        openapi.IN_QUERY,
+        description="응답에서 제외할 필드 (쉼표로 구분) ex) is_like,thumbnail",
+        type=openapi.TYPE_STRING,
+    ),
+]
+
+
 class Feeds(APIView):
     permission_classes = [IsAuthenticatedOrReadOnly]
 
@@ -193,6 +250,13 @@ class Feeds(APIView):
                 description="1 페이지당 24개의 데이터 (default = 1) \n - total_pages : 총 페이지수 \n - now_page : 현재 페이지 \n - count : 총 개수 \n - results : 순서",
                 type=openapi.TYPE_INTEGER,
             ),
+            openapi.Parameter(
+                "cursor",
+                openapi.IN_QUERY,
+                description="커서 기반 페이지네이션 (값이 없으면 첫 페이지) \n - next : 다음 페이지 커서 \n - previous : 이전 페이지 커서 \n - results : 순서",
+                type=openapi.TYPE_STRING,
+            ),
+            *sparse_field_parameters,
         ],
         responses={
             200: openapi.Response(
@@ -219,18 +283,27 @@ class Feeds(APIView):
         },
     )
     def get(self, request):
-        feed = (
-            Feed.objects.select_related("user", "group")
-            .prefetch_related("images", "comment", "feedlike")
-            .all()
-            .order_by("-created_at")
-        )
+        # 목록은 모델 인스턴스 없이 row 에서 바로 직렬화합니다.
+        feed = serializers.feed_rows(Feed.objects.order_by("-created_at"))
 
         # 최신순
         # pagenations
         current_page = request.GET.get("page", 1)
         items_per_page = 24
-        paginator = Paginator(feed, items_per_page)
+        if "cursor" in request.GET:
+            paginator = CursorPaginator(feed, ("created_at", "id"), items_per_page)
+            page = paginator.page(request.GET.get("cursor"))
+            data = {
+                "next": page.next_cursor,
+                "previous": page.previous_cursor,
+                "results": serializers.serialize_feed_rows(page, request),
+            }
+            return Response(data)
+        paginator = CountedPaginator(
+            feed,
+            items_per_page,
+            count=cached_count(Feed.objects.all(), ALL_FEED_COUNT_KEY),
+        )
         try:
             page = paginator.page(current_page)
         except:
@@ -239,17 +312,11 @@ class Feeds(APIView):
         if int(current_page) > int(paginator.num_pages):
             raise ParseError("that page is out of range")
 
-        serializer = serializers.FeedSerializer(
-            page,
-            many=True,
-            context={"request": request},
-        )
-
         data = {
             "total_pages": paginator.num_pages,
             "now_page": page.number,
             "count": paginator.count,
-            "results": serializer.data,
+            "results": serializers.serialize_feed_rows(page, request),
         }
         return Response(data)
 
@@ -304,27 +371,70 @@ class FeedDetail(APIView):
 
     @swagger_auto_schema(
         operation_summary="피드 조회",
+        manual_parameters=sparse_field_parameters,
         responses={
             200: openapi.Response(
                 description="Successful Response",
                 schema=serializers.FeedDetailSerializer(),
             ),
+            304: "If-None-Match / If-Modified-Since 이후 바뀐 내용이 없을 경우",
             403: "요청한 피드가 속한 그룹과 유저의 그룹이 다를 경우",
         },
     )
     def get(self, request, pk):
         feed = get_object_or_404(Feed, pk=pk)
 
-        if feed.group != request.user.group:
+        if feed.group_id != request.user.group_id:
             if not request.user.is_staff:
                 raise PermissionDenied
 
-        Feed.objects.filter(pk=pk).update(visited=F("visited") + 1)
+        # 내용이 바뀌지 않았다면 조회수를 올리거나 직렬화하지 않고 304 를 돌려줍니다.
+        conditional = conditional_get_enabled()
+        if conditional:
+            last_modified = max(
+                int(feed.updated_at.timestamp()), get_group_modified(feed.group_id)
+            )
+            etag = self.get_etag(request, feed)
+            not_modified = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if not_modified is not None:
+                return set_conditional_headers(not_modified, etag, last_modified)
+
+        # 조회수는 캐시(또는 프로세스 메모리)에 쌓아두고 주기적으로 한번에 반영합니다.
+        add_visit(feed)
+        maybe_flush_visits()
 
         serializer = serializers.FeedDetailSerializer(
             feed, context={"request": request}
         )
-        return Response(serializer.data)
+        data = serializer.data
+        if "visited" in data:
+            data["visited"] += pending_visits([feed.pk]).get(feed.pk, 0)
+        if "like_count" in data:
+            data["like_count"] = max(
+                data["like_count"] + pending_likes([feed.pk]).get(feed.pk, 0), 0
+            )
+        if not conditional:
+            return Response(data)
+        return set_conditional_headers(
+            Response(data), self.get_etag(request, feed), last_modified
+        )
+
+    def get_etag(self, request, feed):
+        # 좋아요 / 댓글 / 수정은 그룹 버전을, 조회수는 아직 반영되지 않은 조회수를 바꿉니다.
+        # 좋아요를 모아서 반영하는 경우에는 아직 반영되지 않은 좋아요도 포함합니다.
+        return make_etag(
+            get_group_version(feed.group_id),
+            feed.pk,
+            feed.updated_at.timestamp(),
+            request.user.pk,
+            feed.visited + pending_visits([feed.pk]).get(feed.pk, 0),
+            pending_likes([feed.pk]).get(feed.pk, 0),
+            buffered_like_states(request.user.pk, [feed.pk]).get(feed.pk),
+            request.GET.get("fields"),
+            request.GET.get("omit"),
+        )
 
     @swagger_auto_schema(
         operation_summary="피드 수정",
@@ -389,6 +499,82 @@ class FeedDetail(APIView):
         return Response(status=204)
 
 
+class FeedBatch(APIView):
+    permission_classes = [IsAuthenticated]
+    max_ids = 100
+
+    @swagger_auto_schema(
+        operation_summary="여러 피드 한번에 조회",
+        operation_description="조회수는 올라가지 않습니다.",
+        manual_parameters=[
+            openapi.Parameter(
+                "ids",
+                openapi.IN_QUERY,
+                description="피드 pk 목록 (쉼표로 구분, 최대 100개) ex) 1,2,3",
+                type=openapi.TYPE_STRING,
+                required=True,
+            ),
+            *sparse_field_parameters,
+        ],
+        responses={
+            200: openapi.Response(
+                description="Successful Response",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        "results": feed_schema,
+                        "not_found": openapi.Schema(
+                            type=openapi.TYPE_ARRAY,
+                            items=openapi.Schema(type=openapi.TYPE_INTEGER),
+                            description="존재하지 않는 피드 pk",
+                        ),
+                        "forbidden": openapi.Schema(
+                            type=openapi.TYPE_ARRAY,
+                            items=openapi.Schema(type=openapi.TYPE_INTEGER),
+                            description="유저의 그룹이 아닌 피드 pk",
+                        ),
+                    },
+                ),
+            ),
+            400: "ids 가 없거나 올바르지 않은 경우, 100개를 넘는 경우",
+        },
+    )
+    def get(self, request):
+        try:
+            ids = list(
+                dict.fromkeys(
+                    int(pk) for pk in request.GET.get("ids", "").split(",") if pk
+                )
+            )
+        except ValueError:
+            raise ParseError("ids must be comma separated integers")
+        if not ids:
+            raise ParseError("ids is required")
+        if len(ids) > self.max_ids:
+            raise ParseError(f"ids can contain at most {self.max_ids} feeds")
+
+        rows = {
+            row["id"]: row
+            for row in serializers.feed_rows(
+                Feed.objects.filter(pk__in=ids), extra=("group_id",)
+            )
+        }
+        allowed, forbidden, not_found = [], [], []
+        for pk in ids:
+            row = rows.get(pk)
+            if row is None:
+                not_found.append(pk)
+            elif request.user.is_staff or row["group_id"] == request.user.group_id:
+                allowed.append(row)
+            else:
+                forbidden.append(pk)
+
+        results = serializers.serialize_feed_rows(allowed, request)
+        return Response(
+            {"results": results, "not_found": not_found, "forbidden": forbidden}
+        )
+
+
 class GroupFeedCategory(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -401,6 +587,12 @@ class GroupFeedCategory(APIView):
                 description="1 페이지당 24개의 데이터 \n - num_pages : 총 페이지수 \n - current_page : 현재 페이지 \n - count : 총 개수 \n - results : 순서",
                 type=openapi.TYPE_INTEGER,
             ),
+            openapi.Parameter(
+                "cursor",
+                openapi.IN_QUERY,
+                description="커서 기반 페이지네이션 (값이 없으면 첫 페이지) \n - next : 다음 페이지 커서 \n - previous : 이전 페이지 커서 \n - results : 순서",
+                type=openapi.TYPE_STRING,
+            ),
             openapi.Parameter(
                 "group_id",
                 openapi.IN_QUERY,
@@ -415,6 +607,7 @@ class GroupFeedCategory(APIView):
                 type=openapi.TYPE_INTEGER,
                 required=True,
             ),
+            *sparse_field_parameters,
         ],
         responses={
             200: openapi.Response(
@@ -438,6 +631,7 @@ class GroupFeedCategory(APIView):
                     },
                 ),
             ),
+            304: "If-None-Match / If-Modified-Since 이후 바뀐 내용이 없을 경우",
             400: "범위를 벗어난 페이지 요청",
             403: "유저가 속한 그룹이 아닌 데이터를 요청",
             404: "그룹과 카테고리의 pk가 유효하지 않거나, 카테고리의 그룹과 요청한 그룹이 다를 때",
@@ -448,37 +642,90 @@ class GroupFeedCategory(APIView):
         category_pk = request.GET.get("category_id")
         # group = get_object_or_404(Group, pk=group_pk)
         if not request.user.is_staff:
-            if str(request.user.group.pk) != group_pk:
+            if str(request.user.group_id) != group_pk:
                 raise PermissionDenied
-        category = get_object_or_404(Category, pk=category_pk)
+        category = get_object_or_404(
+            Category.objects.select_related("group"), pk=category_pk
+        )
+        if str(category.group_id) != group_pk:
+            raise NotFound
+        ordering = ("created_at", "id")
+        # 그룹 / 카테고리에 유지되는 게시글 수를 사용해 COUNT(*) 를 생략합니다.
+        count = category.group.feed_count
+        prefix = ""
         if category.name == "전체글":
-            feed = (
-                Feed.objects.select_related("user", "group")
-                .prefetch_related("images", "comment", "feedlike")
-                .filter(group__pk=group_pk)
-                .order_by("-created_at")
+            feed = serializers.feed_rows(
+                Feed.objects.filter(group__pk=group_pk).order_by("-created_at")
             )
         elif category.name == "인기글":
-            feed = (
-                Feed.objects.select_related("user", "group")
-                .prefetch_related("images", "comment", "feedlike")
-                .filter(group__pk=group_pk)
-                .annotate(count_like=Count("feedlike"))
-                .order_by("-count_like")
+            # 인기 점수 인덱스를 순서대로 읽습니다.
+            prefix = "feed__"
+            ordering = ("score", "feed_id")
+            feed = serializers.feed_rows(
+                FeedRanking.objects.filter(group__pk=group_pk).order_by(
+                    "-score", "-feed_id"
+                ),
+                prefix=prefix,
+                extra=ordering,
             )
         else:
-            feed = (
-                Feed.objects.select_related("user", "group")
-                .prefetch_related("images", "comment", "feedlike")
-                .filter(
+            feed = serializers.feed_rows(
+                Feed.objects.filter(
                     group__pk=group_pk,
                     category=category,
-                )
-                .order_by("-created_at")
+                ).order_by("-created_at")
             )
+            count = category.feed_count
+        if "cursor" in request.GET:
+            page_key = f"cursor:{request.GET.get('cursor')}"
+        else:
+            page_key = f"page:{request.GET.get('page', 1)}"
+        # 그룹 버전과 아직 반영되지 않은 조회수 / 좋아요가 그대로라면
+        # 페이지를 읽거나 만들지 않고 304 를 돌려줍니다.
+        conditional = conditional_get_enabled()
+        if conditional:
+            etag = make_etag(
+                get_group_version(group_pk),
+                get_group_pending(group_pk),
+                category.pk,
+                page_key,
+                request.user.pk,
+                request.GET.get("fields"),
+                request.GET.get("omit"),
+            )
+            last_modified = get_group_modified(group_pk)
+            not_modified = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if not_modified is not None:
+                return set_conditional_headers(not_modified, etag, last_modified)
+
+        # 유저와 무관한 데이터만 캐시하고 is_like / is_writer 는 요청마다 채워 넣습니다.
+        cache_key = group_page_cache_key(group_pk, category.pk, page_key)
+        data = cache.get(cache_key)
+        if data is None:
+            data = self.get_page_data(request, feed, ordering, count, prefix)
+            cache.set(cache_key, data, FEED_PAGE_CACHE_TIMEOUT)
+
+        overlay_viewer_fields(data["results"], request)
+        add_pending_visits(data["results"])
+        data["results"] = filter_fields(data["results"], request)
+        if not conditional:
+            return Response(data)
+        return set_conditional_headers(Response(data), etag, last_modified)
+
+    def get_page_data(self, request, feed, ordering, count=None, prefix=""):
         items_per_page = 12
+        if "cursor" in request.GET:
+            paginator = CursorPaginator(feed, ordering, items_per_page)
+            page = paginator.page(request.GET.get("cursor"))
+            return {
+                "next": page.next_cursor,
+                "previous": page.previous_cursor,
+                "results": serializers.serialize_feed_rows(page, prefix=prefix),
+            }
         current_page = request.GET.get("page", 1)
-        paginator = Paginator(feed, items_per_page)
+        paginator = CountedPaginator(feed, items_per_page, count=count)
         try:
             page = paginator.page(current_page)
         except:
@@ -487,24 +734,27 @@ class GroupFeedCategory(APIView):
         if int(current_page) > int(paginator.num_pages):
             raise ParseError("that page is out of range")
 
-        serializer = serializers.FeedSerializer(
-            page,
-            many=True,
-            context={"request": request},
-        )
-        data = {
+        return {
             "total_pages": paginator.num_pages,
             "now_page": page.number,
             "count": paginator.count,
-            "results": serializer.data,
+            "results": serializers.serialize_feed_rows(page, prefix=prefix),
         }
-        return Response(data)
 
 
 class TopLikeView(APIView):
+    permission_classes = [IsAuthenticated]
+
     @swagger_auto_schema(
         operation_summary="커뮤니티 피드 전체 조회(좋아요순)",
         manual_parameters=[
+            openapi.Parameter(
+                "window",
+                openapi.IN_QUERY,
+                description="기간 (day / week / all)",
+                default="week",
+                type=openapi.TYPE_STRING,
+            ),
             openapi.Parameter(
                 "page",
                 openapi.IN_QUERY,
@@ -534,13 +784,17 @@ class TopLikeView(APIView):
                     },
                 ),
             ),
+            400: "잘못된 기간",
         },
     )
     def get(self, request):
-        feed = (
-            Feed.objects.annotate(like_count=Count("feedlike"))
-            .order_by("-like_count")
-            .order_by(-"created_at")
+        window = request.GET.get("window", TopFeed.WindowChoices.WEEK)
+        if window not in TopFeed.WindowChoices.values:
+            raise ParseError("window must be one of day, week, all")
+        # 미리 계산해둔 상위 TOP_FEED_LIMIT 개의 게시글만 읽습니다.
+        # 목록은 refresh_top_feeds 명령으로 갱신되며 그 전까지는 이전 목록을 보여줍니다.
+        feed = serializers.feed_rows(
+            TopFeed.objects.filter(window=window).order_by("rank"), prefix="feed__"
         )
         items_per_page = 24
         current_page = request.GET.get("page", 1)
@@ -553,16 +807,11 @@ class TopLikeView(APIView):
         if int(current_page) > int(paginator.num_pages):
             raise ParseError("that page is out of range")
 
-        serializer = serializers.FeedSerializer(
-            page,
-            many=True,
-            context={"request": request},
-        )
         data = {
             "total_pages": paginator.num_pages,
             "now_page": page.number,
             "count": paginator.count,
-            "results": serializer.data,
+            "results": serializers.serialize_feed_rows(page, request, prefix="feed__"),
         }
         return Response(data)
 
@@ -572,6 +821,15 @@ class FeedComment(APIView):
 
     @swagger_auto_schema(
         operation_summary="피드 댓글 조회",
+        manual_parameters=[
+            openapi.Parameter(
+                "cursor",
+                openapi.IN_QUERY,
+                description="커서 기반 페이지네이션 (파라미터가 있으면 오래된 댓글부터 20개씩, 값이 없으면 첫 페이지) \n - next : 다음 페이지 커서 \n - previous : 이전 페이지 커서 \n - results : 댓글 목록 \n - recomment_next : 대댓글은 3개까지만 포함되며 더 있으면 대댓글 조회 API 의 cursor 로 사용",
+                type=openapi.TYPE_STRING,
+            ),
+            *sparse_field_parameters,
+        ],
         operation_description="feed 의 id 입력",
         responses={
             201: openapi.Response(
@@ -584,38 +842,87 @@ class FeedComment(APIView):
     )
     def get(self, request, pk):
         feed = get_object_or_404(Feed, pk=pk)
-        if feed.group != request.user.group:
+        if feed.group_id != request.user.group_id:
             if not request.user.is_staff:
                 raise PermissionDenied
-        comments = feed.comment.select_related("user").prefetch_related(
-            "recomment", "commentlike"
-        )
+        # cursor 파라미터가 있으면 댓글을 오래된 순으로 나눠 조회하고
+        # 댓글마다 대댓글은 RECOMMENT_PAGE_SIZE 개까지만 내려줍니다. (나머지는 대댓글 조회 API 로)
+        paginated = "cursor" in request.GET
+        include_recomment = is_field_requested(request, "recomment")
+        # 유저와 무관한 데이터만 캐시하고 is_like / is_writer 는 요청마다 채워 넣습니다.
+        page_key = f"cursor:{request.GET.get('cursor')}" if paginated else "all"
+        cache_key = thread_cache_key(feed.pk, f"{page_key}:r{int(include_recomment)}")
+        data = cache.get(cache_key)
+        if data is None:
+            data = self.get_thread_data(request, feed, paginated, include_recomment)
+            cache.set(cache_key, data, COMMENT_THREAD_CACHE_TIMEOUT)
+
+        comments = data["results"] if paginated else data
+        overlay_comment_viewer_fields(comments, request)
+        results = filter_fields(comments, request)
+        if paginated and include_recomment:
+            for result, comment in zip(results, comments):
+                result["recomment_next"] = comment["recomment_next"]
+        if paginated:
+            data["results"] = results
+            return Response(data)
+        return Response(results)
+
+    def get_thread_data(self, request, feed, paginated, include_recomment):
+        comments = feed.comment.select_related("user")
+        # 대댓글이 제외된 경우 prefetch 를 생략합니다.
+        omit = set()
+        if include_recomment:
+            recomments = with_like_count(
+                Recomment.objects.select_related("user").order_by("created_at", "id")
+            )
+            if paginated:
+                # 댓글마다 RECOMMENT_PAGE_SIZE + 1 개만 조회해 더보기 여부를 확인합니다.
+                recomments = recomments.annotate(
+                    position=Window(
+                        RowNumber(),
+                        partition_by=F("comment_id"),
+                        order_by=[F("created_at").asc(), F("id").asc()],
+                    )
+                ).filter(position__lte=RECOMMENT_PAGE_SIZE + 1)
+            comments = comments.prefetch_related(
+                Prefetch("recomment", queryset=recomments)
+            )
+        else:
+            omit.add("recomment")
+
+        page = None
+        if paginated:
+            paginator = CursorPaginator(
+                comments, ("created_at", "id"), COMMENT_PAGE_SIZE, descending=False
+            )
+            page = paginator.page(request.GET.get("cursor"))
+            comments = page.object_list
+        else:
+            comments = list(comments.order_by("created_at", "id"))
         serializer = CommentSerializer(
             comments,
             many=True,
-            context={"request": request},
+            context={"feed_writer_id": feed.user_id, "omit": omit},
         )
-        anonymous_numbers = {}
-        for comment in serializer.data:
-            if comment.get("feed_writer"):
-                comment["anonymous_number"] = "익명(작성자)"
-            else:
-                user_pk = comment["user"]["pk"]
-                if user_pk not in anonymous_numbers:
-                    anonymous_numbers[user_pk] = len(anonymous_numbers) + 1
-                comment["anonymous_number"] = f"익명{anonymous_numbers[user_pk]}"
-
-            for recomment in comment.get("recomment", []):
-                if recomment.get("feed_writer"):
-                    recomment["anonymous_number"] = "익명(작성자)"
+        data = list(serializer.data)
+        if not paginated:
+            return data
 
-                else:
-                    user_pk = recomment["user"]["pk"]
-                    if user_pk not in anonymous_numbers:
-                        anonymous_numbers[user_pk] = len(anonymous_numbers) + 1
-                    recomment["anonymous_number"] = f"익명{anonymous_numbers[user_pk]}"
-
-        return Response(serializer.data)
+        if include_recomment:
+            for comment, comment_data in zip(comments, data):
+                recomments = list(comment.recomment.all())
+                recomment_next = None
+                if len(recomments) > RECOMMENT_PAGE_SIZE:
+                    del comment_data["recomment"][RECOMMENT_PAGE_SIZE:]
+                    last = recomments[RECOMMENT_PAGE_SIZE - 1]
+                    recomment_next = encode_cursor([last.created_at, last.pk])
+                comment_data["recomment_next"] = recomment_next
+        return {
+            "next": page.next_cursor,
+            "previous": page.previous_cursor,
+            "results": data,
+        }
 
     @swagger_auto_schema(
         operation_summary="피드 댓글 등록",
@@ -644,7 +951,14 @@ class FeedComment(APIView):
             raise PermissionDenied
         serializer = CommentSerializer(data=request.data)
         if serializer.is_valid():
-            comment = serializer.save(feed=feed, user=request.user)
+            with transaction.atomic():
+                comment = serializer.save(feed=feed, user=request.user)
+                Feed.objects.filter(pk=feed.pk).update(
+                    comments_count=F("comments_count") + 1
+                )
+                update_feed_ranking(feed.pk)
+                bump_group_version(feed.group_id)
+                bump_thread_version(feed.pk)
             serializer = CommentSerializer(comment)
             return Response(serializer.data)
         else:
@@ -654,6 +968,54 @@ class FeedComment(APIView):
 class FeedRecomment(APIView):
     permission_classes = [IsAuthenticated]
 
+    @swagger_auto_schema(
+        operation_summary="피드 대댓글 조회 (더보기)",
+        manual_parameters=[
+            openapi.Parameter(
+                "cursor",
+                openapi.IN_QUERY,
+                description="댓글 조회의 recomment_next 또는 이전 응답의 next (값이 없으면 처음부터 20개씩) \n - next : 다음 페이지 커서 \n - previous : 이전 페이지 커서 \n - results : 대댓글 목록",
+                type=openapi.TYPE_STRING,
+            ),
+        ],
+        operation_description="feed 의 id와 comment id 입력",
+        responses={
+            200: openapi.Response(
+                description="Successful Response",
+                schema=RecommentSerializer(many=True),
+            ),
+            400: "잘못된 cursor",
+            403: "그룹이 다른 유저가 요청, 비로그인 유저",
+            404: "feed의 id 나 comment 의 id 가 유효하지않을때",
+        },
+    )
+    def get(self, request, pk, comment_pk):
+        feed = get_object_or_404(Feed, pk=pk)
+        if feed.group_id != request.user.group_id:
+            if not request.user.is_staff:
+                raise PermissionDenied
+        comment = get_object_or_404(Comment, pk=comment_pk, feed=feed)
+        recomments = with_like_count(comment.recomment.select_related("user"))
+        paginator = CursorPaginator(
+            recomments,
+            ("created_at", "id"),
+            RECOMMENT_LOAD_MORE_SIZE,
+            descending=False,
+        )
+        page = paginator.page(request.GET.get("cursor"))
+        serializer = RecommentSerializer(
+            page.object_list,
+            many=True,
+            context={"request": request, "feed_writer_id": feed.user_id},
+        )
+        return Response(
+            {
+                "next": page.next_cursor,
+                "previous": page.previous_cursor,
+                "results": serializer.data,
+            }
+        )
+
     @swagger_auto_schema(
         operation_summary="피드 대댓글 등록",
         operation_description="feed 의 id와 comment id 입력",
@@ -684,10 +1046,17 @@ class FeedRecomment(APIView):
             raise PermissionDenied
         serializer = RecommentSerializer(data=request.data)
         if serializer.is_valid():
-            recomment = serializer.save(
-                user=request.user,
-                comment=comment,
-            )
+            with transaction.atomic():
+                recomment = serializer.save(
+                    user=request.user,
+                    comment=comment,
+                )
+                Feed.objects.filter(pk=feed.pk).update(
+                    comments_count=F("comments_count") + 1
+                )
+                update_feed_ranking(feed.pk)
+                bump_group_version(feed.group_id)
+                bump_thread_version(feed.pk)
             serializer = RecommentSerializer(
                 recomment,
                 context={"request": request},
@@ -740,10 +1109,12 @@ class GroupFeedSearch(APIView):
         group_id = request.GET.get("group_id")
         keyword = request.GET.get("keyword")
         if keyword:
-            feeds = Feed.objects.order_by("-created_at").filter(
-                group__pk=group_id, title__icontains=keyword
-            )[:5]
-            data = {"result": [{"id": feed.pk, "title": feed.title} for feed in feeds]}
+            try:
+                group_id = int(group_id)
+            except (TypeError, ValueError):
+                raise ParseError("Invalid group_id")
+            # 메모리에 올려둔 그룹별 제목 색인에서 찾습니다.
+            data = {"result": suggest_titles(group_id, keyword)}
             return Response(data)
         else:
             return Response(status=200)
@@ -776,6 +1147,13 @@ class GroupFeedSearchResult(APIView):
                 default=1,
                 type=openapi.TYPE_INTEGER,
             ),
+            openapi.Parameter(
+                "cursor",
+                openapi.IN_QUERY,
+                description="커서 기반 페이지네이션 (값이 없으면 첫 페이지) \n - next : 다음 페이지 커서 \n - previous : 이전 페이지 커서 \n - results : 순서",
+                type=openapi.TYPE_STRING,
+            ),
+            *sparse_field_parameters,
         ],
         responses={
             200: openapi.Response(
@@ -799,14 +1177,36 @@ class GroupFeedSearchResult(APIView):
         group_id = request.GET.get("group_id")
         keyword = request.GET.get("keyword")
         if keyword:
-            feed = (
-                Feed.objects.filter(group__pk=group_id)
-                .filter(Q(title__icontains=keyword) | Q(description__icontains=keyword))
-                .order_by("-created_at")
+            feed = search_feeds(group_id, keyword).order_by(
+                "-rank", "-created_at", "-id"
             )
             items_per_page = 12
+            if "cursor" in request.GET:
+                paginator = CursorPaginator(
+                    feed, ("rank", "created_at", "id"), items_per_page
+                )
+                page = paginator.page(request.GET.get("cursor"))
+                serializer = serializers.TinyFeedSerializer(
+                    page.object_list,
+                    many=True,
+                    context={"request": request},
+                )
+                data = {
+                    "next": page.next_cursor,
+                    "previous": page.previous_cursor,
+                    "results": serializer.data,
+                }
+                return Response(data)
             current_page = request.GET.get("page", 1)
-            paginator = Paginator(feed, items_per_page)
+            # 검색 결과는 유지되는 카운터가 없으므로 잠시 캐시한 개수를 사용합니다.
+            count_key = "feeds:count:search:{}:v{}:{}".format(
+                group_id,
+                get_group_version(group_id),
+                hashlib.md5(keyword.encode()).hexdigest(),
+            )
+            paginator = CountedPaginator(
+                feed, items_per_page, count=cached_count(feed, count_key)
+            )
             try:
                 page = paginator.page(current_page)
             except:
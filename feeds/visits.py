@@ -0,0 +1,223 @@
+import threading
+import time
+from collections import defaultdict
+from django.core.cache import cache
+from django.db.models import Case, F, Value, When
+from common.caches import is_shared_cache
+from .models import Feed
+from .caches import bump_group_version, touch_group_pending
+
+# 조회수는 VISIT_BUCKET_SECONDS 단위의 캐시 버킷에 쌓였다가 한번의 UPDATE 로 반영됩니다.
+# 공유 캐시(common.caches)가 설정되지 않았다면 프로세스 메모리에 모아두었다가
+# LOCAL_FLUSH_THRESHOLD 번 쌓이거나 VISIT_BUCKET_SECONDS 가 지나면 반영합니다.
+VISIT_BUCKET_SECONDS = 60
+# flush 가 오래 실행되지 않았을 때 거슬러 올라가 확인할 최대 버킷 수
+MAX_PENDING_BUCKETS = 60
+FLUSH_BATCH_SIZE = 300
+LOCAL_FLUSH_THRESHOLD = 100
+
+FLUSHED_BUCKET_KEY = "feeds:visits:flushed"
+FLUSH_LOCK_KEY = "feeds:visits:flush_lock"
+
+_local_visits = defaultdict(int)
+_local_lock = threading.Lock()
+_local_state = {"count": 0, "next_flush": 0}
+
+
+def _current_bucket():
+    return int(time.time() // VISIT_BUCKET_SECONDS)
+
+
+def _visit_key(bucket, feed_pk):
+    return f"feeds:visits:{bucket}:{feed_pk}"
+
+
+def _count_key(bucket):
+    return f"feeds:visits:{bucket}:count"
+
+
+def _log_key(bucket, index):
+    return f"feeds:visits:{bucket}:log:{index}"
+
+
+def _pending_buckets():
+    current = _current_bucket()
+    flushed = cache.get(FLUSHED_BUCKET_KEY)
+    start = current - MAX_PENDING_BUCKETS
+    if flushed is not None:
+        start = max(start, flushed + 1)
+    return range(start, current + 1)
+
+
+def visit_buffer_enabled():
+    return is_shared_cache()
+
+
+def add_visit(feed):
+    if not visit_buffer_enabled():
+        _add_local_visit(feed.pk)
+        return
+    bucket = _current_bucket()
+    key = _visit_key(bucket, feed.pk)
+    if cache.add(key, 1, timeout=None):
+        # 버킷에 처음 들어온 피드만 flush 대상 목록에 기록합니다.
+        index = _incr(_count_key(bucket))
+        cache.set(_log_key(bucket, index), feed.pk, timeout=None)
+    else:
+        _incr(key)
+    touch_group_pending(feed.group_id)
+
+
+def _add_local_visit(feed_pk):
+    now = time.time()
+    with _local_lock:
+        _local_visits[feed_pk] += 1
+        _local_state["count"] += 1
+        if not _local_state["next_flush"]:
+            _local_state["next_flush"] = now + VISIT_BUCKET_SECONDS
+        due = (
+            _local_state["count"] >= LOCAL_FLUSH_THRESHOLD
+            or _local_state["next_flush"] <= now
+        )
+    if due:
+        flush_local_visits()
+
+
+def flush_local_visits():
+    # 모아둔 조회수를 꺼내서 반영하고, 실패하면 다시 넣어둡니다.
+    with _local_lock:
+        deltas = dict(_local_visits)
+        _local_visits.clear()
+        _local_state["count"] = 0
+        _local_state["next_flush"] = time.time() + VISIT_BUCKET_SECONDS
+    try:
+        _apply_visits(deltas)
+    except Exception:
+        with _local_lock:
+            for feed_pk, delta in deltas.items():
+                _local_visits[feed_pk] += delta
+                _local_state["count"] += delta
+        raise
+    return len(deltas)
+
+
+def clear_local_visits():
+    with _local_lock:
+        _local_visits.clear()
+        _local_state.update(count=0, next_flush=0)
+
+
+def _incr(key):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        if cache.add(key, 1, timeout=None):
+            return 1
+        return cache.incr(key)
+
+
+def pending_visits(feed_pks):
+    if not feed_pks:
+        return {}
+    if not visit_buffer_enabled():
+        with _local_lock:
+            return {
+                feed_pk: _local_visits[feed_pk]
+                for feed_pk in feed_pks
+                if feed_pk in _local_visits
+            }
+    keys = {
+        _visit_key(bucket, feed_pk): feed_pk
+        for bucket in _pending_buckets()
+        for feed_pk in feed_pks
+    }
+    pending = defaultdict(int)
+    for key, value in cache.get_many(list(keys)).items():
+        pending[keys[key]] += value
+    return pending
+
+
+def add_pending_visits(results, pending=None):
+    # 직렬화된 피드 데이터의 visited 에 아직 반영되지 않은 조회수를 더합니다.
+    if pending is None:
+        pending = pending_visits([feed["id"] for feed in results])
+    for feed in results:
+        feed["visited"] += pending.get(feed["id"], 0)
+    return results
+
+
+def maybe_flush_visits():
+    # 버킷마다 한번만 실행되도록 합니다.
+    if visit_buffer_enabled() and cache.add(
+        f"feeds:visits:auto_flush:{_current_bucket()}",
+        1,
+        timeout=VISIT_BUCKET_SECONDS * 2,
+    ):
+        flush_visits()
+
+
+def flush_visits(include_current=False):
+    if not visit_buffer_enabled():
+        return flush_local_visits()
+    if not cache.add(FLUSH_LOCK_KEY, 1, timeout=VISIT_BUCKET_SECONDS):
+        return 0
+    try:
+        return _flush_visits(include_current)
+    finally:
+        cache.delete(FLUSH_LOCK_KEY)
+
+
+def _flush_visits(include_current):
+    current = _current_bucket()
+    deltas = defaultdict(int)
+    drained = {}
+    finished_keys = set()
+    for bucket in _pending_buckets():
+        if bucket == current and not include_current:
+            break
+        count = cache.get(_count_key(bucket)) or 0
+        log_keys = [_log_key(bucket, index) for index in range(1, count + 1)]
+        visit_keys = {
+            _visit_key(bucket, feed_pk): feed_pk
+            for feed_pk in cache.get_many(log_keys).values()
+        }
+        for key, value in cache.get_many(list(visit_keys)).items():
+            deltas[visit_keys[key]] += value
+            drained[key] = value
+        if bucket == current:
+            continue
+        finished_keys.update(log_keys, visit_keys, [_count_key(bucket)])
+
+    _apply_visits(deltas)
+
+    # 현재 버킷은 계속 쌓이고 있으므로 읽은 만큼만 빼고 남겨둡니다.
+    for key, value in drained.items():
+        if key not in finished_keys:
+            cache.decr(key, value)
+    cache.set(FLUSHED_BUCKET_KEY, current - 1, timeout=None)
+    cache.delete_many(list(finished_keys))
+    return len(deltas)
+
+
+def _apply_visits(deltas):
+    if not deltas:
+        return
+    items = list(deltas.items())
+    for start in range(0, len(items), FLUSH_BATCH_SIZE):
+        batch = items[start : start + FLUSH_BATCH_SIZE]
+        Feed.objects.filter(pk__in=[feed_pk for feed_pk, _ in batch]).update(
+            visited=F("visited")
+            + Case(
+                *[When(pk=feed_pk, then=Value(delta)) for feed_pk, delta in batch],
+                default=Value(0),
+            )
+        )
+    # 조회수가 반영된 만큼 쌓인 조회수가 빠지므로, 캐시된 그룹 페이지도 flush 마다 한번 새로 만듭니다.
+    # (조회수 하나하나에는 그룹 버전을 올리지 않습니다)
+    group_pks = (
+        Feed.objects.filter(pk__in=list(deltas))
+        .values_list("group_id", flat=True)
+        .distinct()
+    )
+    for group_pk in group_pks:
+        bump_group_version(group_pk)
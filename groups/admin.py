@@ -9,4 +9,5 @@ class GroupAdmin(admin.ModelAdmin):
         "name",
         "members_count",
         "stand_by_members_count",
+        "feed_count",
     )
@@ -15,6 +15,10 @@ class Group(CommonModel):
     #     # # related_name="group",
     # )
     description = models.TextField(blank=True)
+    feed_count = models.PositiveIntegerField(
+        editable=False,
+        default=0,
+    )
 
     @property
     def members_count(self):
@@ -0,0 +1,394 @@
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Greatest
+from common.caches import is_shared_cache
+from feeds.models import Feed
+from feeds.ranking import update_feed_ranking
+from .models import Feedlike
+
+# LIKE_WRITE_BUFFER 를 켜면 피드 좋아요를 캐시에 기록해두고 LIKE_FLUSH_SECONDS 마다
+# 바뀐 (feed, user) 의 최종 상태만 모아서 bulk_create / delete 로 반영합니다.
+# 피드마다 하나의 레코드 {"gen": n, "users": {user_pk: (liked, base)}} 에
+# 누른 결과(liked)와 처음 눌렀을 때의 DB 상태(base)를 함께 저장하므로
+# 아직 반영되지 않은 좋아요 수는 레코드에서 바로 계산되고 레코드와 함께 비워집니다.
+LIKE_FLUSH_SECONDS = 10
+FLUSH_BATCH_SIZE = 300
+# 피드 단위 잠금. 같은 피드를 동시에 누르거나 flush 중일 때만 기다립니다.
+FEED_LOCK_TIMEOUT = 10
+FEED_LOCK_RETRY_SECONDS = 0.01
+# 번호만 받고 아직 기록되지 않은 로그를 기다리는 시간
+LOG_WAIT_SECONDS = 0.05
+# 반영이 끝나 비워진 레코드는 gen 만 남겨두었다가 지웁니다.
+EMPTY_RECORD_TIMEOUT = 60 * 60
+# 유저마다 아직 반영되지 않은 좋아요가 있는 피드 목록 (내 좋아요 목록 조회 전에 반영)
+USER_FEEDS_TIMEOUT = 60 * 60
+
+COUNT_KEY = "likes:buffer:count"
+FLUSHED_KEY = "likes:buffer:flushed"
+FLUSH_LOCK_KEY = "likes:buffer:flush_lock"
+NEXT_FLUSH_KEY = "likes:buffer:next_flush"
+
+
+def like_buffer_enabled():
+    if not getattr(settings, "LIKE_WRITE_BUFFER", False):
+        return False
+    # 로컬 메모리 캐시에 쌓으면 프로세스마다 따로 쌓이고 중간에 지워질 수 있습니다.
+    if not is_shared_cache():
+        raise ImproperlyConfigured(
+            "LIKE_WRITE_BUFFER requires a shared cache backend "
+            "(common.caches.SHARED_CACHE_BACKENDS)."
+        )
+    return True
+
+
+def _record_key(feed_pk):
+    return f"likes:buffer:feed:{feed_pk}"
+
+
+def _lock_key(feed_pk):
+    return f"likes:buffer:lock:{feed_pk}"
+
+
+def _log_key(index):
+    return f"likes:buffer:log:{index}"
+
+
+def _user_feeds_key(user_pk):
+    return f"likes:buffer:user:{user_pk}"
+
+
+def like_count_key(user_pk):
+    # 내 좋아요 목록의 전체 개수 (cached_count)
+    return f"likes:count:user:{user_pk}"
+
+
+def forget_like_counts(user_pks):
+    cache.delete_many([like_count_key(user_pk) for user_pk in user_pks])
+
+
+def _incr(key, delta=1):
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        if cache.add(key, delta, timeout=None):
+            return delta
+        return cache.incr(key, delta)
+
+
+def _register(feed_pk):
+    index = _incr(COUNT_KEY)
+    cache.set(_log_key(index), feed_pk, timeout=None)
+
+
+@contextmanager
+def _locked(key):
+    while not cache.add(key, 1, timeout=FEED_LOCK_TIMEOUT):
+        time.sleep(FEED_LOCK_RETRY_SECONDS)
+    try:
+        yield
+    finally:
+        cache.delete(key)
+
+
+def _feed_lock(feed_pk):
+    return _locked(_lock_key(feed_pk))
+
+
+def _users(record):
+    return record["users"] if record else {}
+
+
+def _gen(record):
+    # flush 로 레코드가 비워질 때마다 늘어납니다.
+    return record["gen"] if record else 0
+
+
+def toggle_feed_like(user, feed):
+    # feeds.caches 가 이 모듈을 import 하므로 여기서 가져옵니다.
+    from feeds.caches import bump_group_version, touch_group_pending
+
+    # 좋아요 상태를 뒤집고 결과(liked)를 돌려줍니다.
+    if like_buffer_enabled():
+        liked = _buffer_toggle(feed.pk, user.pk)
+        touch_group_pending(feed.group_id)
+        maybe_flush_likes()
+        return liked
+    with transaction.atomic():
+        liked, changed = Feedlike.objects.toggle(user, feed=feed)
+        if changed:
+            if liked:
+                like_count = F("like_count") + 1
+            else:
+                like_count = Greatest(F("like_count") - 1, 0)
+            Feed.objects.filter(pk=feed.pk).update(like_count=like_count)
+            update_feed_ranking(feed.pk)
+            bump_group_version(feed.group_id)
+            transaction.on_commit(lambda: forget_like_counts([user.pk]))
+    return liked
+
+
+def _liked_in_db(feed_pk, user_pk):
+    return Feedlike.objects.filter(feed_id=feed_pk, user_id=user_pk).exists()
+
+
+def _buffer_toggle(feed_pk, user_pk):
+    key = _record_key(feed_pk)
+    record = cache.get(key)
+    # 처음 누르는 경우 DB 의 상태는 잠금 밖에서 조회합니다.
+    base = None
+    if user_pk not in _users(record):
+        base = _liked_in_db(feed_pk, user_pk)
+    with _feed_lock(feed_pk):
+        current = cache.get(key)
+        users = _users(current)
+        if not users:
+            current = {"gen": _gen(current), "users": users}
+            _register(feed_pk)
+        if user_pk in users:
+            liked, base = users[user_pk]
+        else:
+            if base is None or _gen(record) != _gen(current):
+                # 조회한 사이에 반영되었다면 DB 의 상태를 다시 확인합니다.
+                base = _liked_in_db(feed_pk, user_pk)
+            liked = base
+        liked = not liked
+        users[user_pk] = (liked, base)
+        cache.set(key, current, timeout=None)
+    with _locked(f"{_user_feeds_key(user_pk)}:lock"):
+        feed_pks = cache.get(_user_feeds_key(user_pk)) or set()
+        feed_pks.add(feed_pk)
+        cache.set(_user_feeds_key(user_pk), feed_pks, USER_FEEDS_TIMEOUT)
+    return liked
+
+
+def pending_likes(feed_pks):
+    # 아직 DB 에 반영되지 않은 좋아요 수 변화량
+    if not like_buffer_enabled() or not feed_pks:
+        return {}
+    keys = {_record_key(feed_pk): feed_pk for feed_pk in feed_pks}
+    pending = {}
+    for key, record in cache.get_many(list(keys)).items():
+        delta = sum(int(liked) - int(base) for liked, base in _users(record).values())
+        if delta:
+            pending[keys[key]] = delta
+    return pending
+
+
+def buffered_like_states(user_pk, feed_pks):
+    if not like_buffer_enabled() or user_pk is None or not feed_pks:
+        return {}
+    keys = {_record_key(feed_pk): feed_pk for feed_pk in feed_pks}
+    return {
+        keys[key]: _users(record)[user_pk][0]
+        for key, record in cache.get_many(list(keys)).items()
+        if user_pk in _users(record)
+    }
+
+
+def liked_feed_ids(user, feed_pks):
+    # DB 의 좋아요 여부에 아직 반영되지 않은 좋아요 / 취소를 덮어씁니다.
+    feed_pks = list(feed_pks)
+    if not feed_pks:
+        return set()
+    liked = set(
+        Feedlike.objects.filter(user=user, feed_id__in=feed_pks).values_list(
+            "feed_id", flat=True
+        )
+    )
+    for feed_pk, state in buffered_like_states(user.pk, feed_pks).items():
+        if state:
+            liked.add(feed_pk)
+        else:
+            liked.discard(feed_pk)
+    return liked
+
+
+def add_pending_likes(results, pending=None):
+    # 직렬화된 피드 데이터의 like_count 에 아직 반영되지 않은 좋아요 수를 더합니다.
+    if pending is None:
+        pending = pending_likes([feed["id"] for feed in results])
+    for feed in results:
+        if "like_count" in feed:
+            feed["like_count"] = max(feed["like_count"] + pending.get(feed["id"], 0), 0)
+    return results
+
+
+def maybe_flush_likes():
+    # 마지막으로 반영한 뒤 LIKE_FLUSH_SECONDS 가 지났을 때만 반영합니다.
+    now = time.time()
+    cache.add(NEXT_FLUSH_KEY, now + LIKE_FLUSH_SECONDS, timeout=None)
+    if cache.get(NEXT_FLUSH_KEY, 0) <= now:
+        cache.set(NEXT_FLUSH_KEY, now + LIKE_FLUSH_SECONDS, timeout=None)
+        flush_likes()
+
+
+def flush_likes():
+    if not cache.add(FLUSH_LOCK_KEY, 1, timeout=LIKE_FLUSH_SECONDS * 6):
+        return 0
+    try:
+        return _flush_likes()
+    finally:
+        cache.delete(FLUSH_LOCK_KEY)
+
+
+def _read_log():
+    count = cache.get(COUNT_KEY) or 0
+    start = (cache.get(FLUSHED_KEY) or 0) + 1
+    log_keys = [_log_key(index) for index in range(start, count + 1)]
+    entries = cache.get_many(log_keys)
+    if len(entries) < len(log_keys):
+        time.sleep(LOG_WAIT_SECONDS)
+        entries.update(cache.get_many([key for key in log_keys if key not in entries]))
+    return count, log_keys, list(dict.fromkeys(entries.values()))
+
+
+def _flush_likes():
+    count, log_keys, feed_pks = _read_log()
+    changed = 0
+    for start in range(0, len(feed_pks), FLUSH_BATCH_SIZE):
+        changed += _flush_batch(feed_pks[start : start + FLUSH_BATCH_SIZE])
+    cache.set(FLUSHED_KEY, count, timeout=None)
+    cache.delete_many(log_keys)
+    return changed
+
+
+def flush_user_likes(user_pk):
+    # 내 좋아요 목록을 조회하기 전에 유저가 누른 피드의 좋아요를 먼저 반영합니다.
+    if not like_buffer_enabled():
+        return 0
+    key = _user_feeds_key(user_pk)
+    feed_pks = sorted(cache.get(key) or ())
+    if not feed_pks:
+        return 0
+    # 여러 피드를 잠그므로 항상 같은 순서로 기다립니다.
+    locked = []
+    try:
+        for feed_pk in feed_pks:
+            while not cache.add(_lock_key(feed_pk), 1, timeout=FEED_LOCK_TIMEOUT):
+                time.sleep(FEED_LOCK_RETRY_SECONDS)
+            locked.append(feed_pk)
+        changed = _flush_locked(locked)
+    finally:
+        cache.delete_many([_lock_key(feed_pk) for feed_pk in locked])
+    with _locked(f"{key}:lock"):
+        # 그 사이 다시 누른 피드는 남겨둡니다.
+        pending = cache.get(key) or set()
+        records = cache.get_many([_record_key(feed_pk) for feed_pk in pending])
+        pending = {
+            feed_pk
+            for feed_pk in pending
+            if user_pk in _users(records.get(_record_key(feed_pk)))
+        }
+        if pending:
+            cache.set(key, pending, USER_FEEDS_TIMEOUT)
+        else:
+            cache.delete(key)
+    return changed
+
+
+def _flush_batch(feed_pks):
+    locked = []
+    for feed_pk in feed_pks:
+        if cache.add(_lock_key(feed_pk), 1, timeout=FEED_LOCK_TIMEOUT):
+            locked.append(feed_pk)
+        else:
+            # 좋아요를 누르는 중이라면 다음 flush 로 미룹니다.
+            _register(feed_pk)
+    try:
+        return _flush_locked(locked)
+    finally:
+        cache.delete_many([_lock_key(feed_pk) for feed_pk in locked])
+
+
+def _flush_locked(locked):
+    # 잠근 피드의 레코드를 DB 에 반영합니다.
+    keys = {_record_key(feed_pk): feed_pk for feed_pk in locked}
+    records = cache.get_many(list(keys))
+    changed = _apply_states(
+        {
+            (keys[key], user_pk): liked
+            for key, record in records.items()
+            for user_pk, (liked, _) in _users(record).items()
+        }
+    )
+    # DB 에 반영된 뒤에만 레코드를 비웁니다. (변화량도 함께 비워집니다)
+    cache.set_many(
+        {
+            key: {"gen": record["gen"] + 1, "users": {}}
+            for key, record in records.items()
+        },
+        timeout=EMPTY_RECORD_TIMEOUT,
+    )
+    return changed
+
+
+def _existing_likes(states):
+    feed_pks = {feed_pk for feed_pk, _ in states}
+    user_pks = {user_pk for _, user_pk in states}
+    return {
+        (feed_pk, user_pk): pk
+        for pk, feed_pk, user_pk in Feedlike.objects.filter(
+            feed_id__in=feed_pks, user_id__in=user_pks
+        ).values_list("pk", "feed_id", "user_id")
+        if (feed_pk, user_pk) in states
+    }
+
+
+def _apply_states(states):
+    from feeds.caches import bump_group_version
+
+    if not states:
+        return 0
+    feed_pks = {feed_pk for feed_pk, _ in states}
+    user_pks = {user_pk for _, user_pk in states}
+    feeds = dict(Feed.objects.filter(pk__in=feed_pks).values_list("pk", "group_id"))
+    users = set(
+        get_user_model().objects.filter(pk__in=user_pks).values_list("pk", flat=True)
+    )
+
+    with transaction.atomic():
+        before = _existing_likes(states)
+        created, deleted = [], []
+        for (feed_pk, user_pk), liked in states.items():
+            exists = (feed_pk, user_pk) in before
+            if liked and not exists and feed_pk in feeds and user_pk in users:
+                created.append(Feedlike(feed_id=feed_pk, user_id=user_pk))
+            elif not liked and exists:
+                deleted.append(before[(feed_pk, user_pk)])
+        Feedlike.objects.bulk_create(created, ignore_conflicts=True)
+        Feedlike.objects.filter(pk__in=deleted).delete()
+        # ignore_conflicts 로 건너뛴 행이 있을 수 있으므로 실제로 남은 행으로 계산합니다.
+        after = _existing_likes(states)
+        changed = set(before).symmetric_difference(after)
+        deltas = defaultdict(int)
+        for feed_pk, user_pk in changed:
+            deltas[feed_pk] += 1 if (feed_pk, user_pk) in after else -1
+        deltas = {feed_pk: delta for feed_pk, delta in deltas.items() if delta}
+        if deltas:
+            Feed.objects.filter(pk__in=list(deltas)).update(
+                like_count=Greatest(
+                    F("like_count")
+                    + Case(
+                        *[
+                            When(pk=feed_pk, then=Value(delta))
+                            for feed_pk, delta in deltas.items()
+                        ],
+                        default=Value(0),
+                    ),
+                    0,
+                )
+            )
+            for feed_pk in deltas:
+                update_feed_ranking(feed_pk)
+
+    for group_pk in {feeds[feed_pk] for feed_pk in deltas}:
+        bump_group_version(group_pk)
+    forget_like_counts({user_pk for _, user_pk in changed})
+    return len(changed)
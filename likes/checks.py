@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.core.checks import Error, register
+from common.caches import is_shared_cache
+
+
+@register()
+def check_like_write_buffer(app_configs, **kwargs):
+    if getattr(settings, "LIKE_WRITE_BUFFER", False) and not is_shared_cache():
+        return [
+            Error(
+                "LIKE_WRITE_BUFFER requires a shared cache backend.",
+                hint="CACHES['default'] 를 Redis 로 설정하거나 LIKE_WRITE_BUFFER 를 끄세요.",
+                id="likes.E001",
+            )
+        ]
+    return []
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from likes.buffer import flush_likes
+
+
+class Command(BaseCommand):
+    help = "캐시에 쌓인 게시글 좋아요를 DB 에 반영합니다. (LIKE_WRITE_BUFFER 사용시)"
+
+    def handle(self, *args, **options):
+        count = flush_likes()
+        self.stdout.write(self.style.SUCCESS(f"{count}개 좋아요를 반영했습니다."))
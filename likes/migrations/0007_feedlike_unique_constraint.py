@@ -0,0 +1,43 @@
+# Generated by Django 4.2 on 2026-10-18 12:16
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicate_feedlikes(apps, schema_editor):
+    # 같은 유저의 중복 좋아요는 가장 먼저 만든 것만 남기고 좋아요 수를 다시 셉니다.
+    Feedlike = apps.get_model("likes", "Feedlike")
+    Feed = apps.get_model("feeds", "Feed")
+    duplicates = (
+        Feedlike.objects.order_by()
+        .values("user_id", "feed_id")
+        .annotate(first=Min("pk"), count=Count("pk"))
+        .filter(count__gt=1)
+    )
+    feed_pks = set()
+    for duplicate in duplicates:
+        Feedlike.objects.filter(
+            user_id=duplicate["user_id"], feed_id=duplicate["feed_id"]
+        ).exclude(pk=duplicate["first"]).delete()
+        feed_pks.add(duplicate["feed_id"])
+    for feed_pk in feed_pks:
+        Feed.objects.filter(pk=feed_pk).update(
+            like_count=Feedlike.objects.filter(feed_id=feed_pk).count()
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("feeds", "0020_feed_best_comment"),
+        ("likes", "0006_alter_commentlike_comment_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_feedlikes, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="feedlike",
+            constraint=models.UniqueConstraint(
+                fields=("user", "feed"), name="unique_feed_like"
+            ),
+        ),
+    ]
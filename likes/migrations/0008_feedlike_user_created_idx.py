@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-18 12:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("likes", "0007_feedlike_unique_constraint"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="feedlike",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"], name="feedlike_user_created_idx"
+            ),
+        ),
+    ]
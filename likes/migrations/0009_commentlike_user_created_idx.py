@@ -0,0 +1,19 @@
+# Generated by Django 4.2 on 2026-10-18 12:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("likes", "0008_feedlike_user_created_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="commentlike",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="commentlike_user_created_idx",
+            ),
+        ),
+    ]
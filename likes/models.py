@@ -1,8 +1,29 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from common.models import CommonModel
 from django.core.exceptions import ValidationError
 
 
+class LikeManager(models.Manager):
+    def toggle(self, user, **target):
+        # 좋아요가 있으면 지우고 없으면 만듭니다. 존재 여부를 먼저 조회하지 않고
+        # DELETE 후 INSERT 하므로 동시에 여러번 눌러도 unique 제약 안에서만 바뀝니다.
+        # (liked, changed) 를 돌려주며 changed 가 True 일 때만 좋아요 수를 갱신하면 됩니다.
+        with transaction.atomic():
+            deleted, _ = self.filter(user=user, **target).delete()
+            if deleted:
+                return False, True
+            try:
+                with transaction.atomic():
+                    self.create(user=user, **target)
+            except IntegrityError:
+                # 동시에 들어온 요청이 먼저 좋아요를 만든 경우에만 무시하고
+                # 다른 제약 조건 위반은 그대로 올려보냅니다.
+                if self.filter(user=user, **target).exists():
+                    return True, False
+                raise
+            return True, True
+
+
 class Feedlike(CommonModel):
     user = models.ForeignKey(
         "users.User",
@@ -13,7 +34,22 @@ class Feedlike(CommonModel):
         on_delete=models.CASCADE,
         related_name="feedlike",
     )
-    unique_together = ("user", "feed")
+
+    objects = LikeManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "feed"],
+                name="unique_feed_like",
+            ),
+        ]
+        indexes = [
+            # 유저가 좋아요를 누른 게시글 목록 (최신순)
+            models.Index(
+                fields=["user", "-created_at", "-id"], name="feedlike_user_created_idx"
+            ),
+        ]
 
 
 class Commentlike(CommonModel):
@@ -36,6 +72,8 @@ class Commentlike(CommonModel):
         related_name="recommentlike",
     )
 
+    objects = LikeManager()
+
     class Meta:
         constraints = [
             models.UniqueConstraint(
@@ -47,6 +85,13 @@ class Commentlike(CommonModel):
                 name="unique_recomment_like",
             ),
         ]
+        indexes = [
+            # 유저가 좋아요를 누른 댓글 / 대댓글 목록 (최신순)
+            models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="commentlike_user_created_idx",
+            ),
+        ]
 
     def clean(self):
         if self.comment and self.recomment:
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from .buffer import forget_like_counts
+from .models import Feedlike
+
+
+# 좋아요 취소 / 모아서 반영하는 경우는 likes.buffer 에서 직접 지웁니다.
+@receiver(post_save, sender=Feedlike)
+def forget_feed_like_count(sender, instance, created, **kwargs):
+    if created:
+        forget_like_counts([instance.user_id])
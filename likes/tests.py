@@ -1,4 +1,11 @@
-from rest_framework.test import APITestCase
+import threading
+import time
+from unittest import mock
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import IntegrityError, OperationalError, connection
+from django.test import TransactionTestCase, override_settings
+from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
 from users.models import User
 from likes.models import Feedlike, Commentlike
 from feeds.models import Feed
@@ -6,6 +13,9 @@ from groups.models import Group
 from categories.models import Category
 from accessinfo.models import AccessInfo
 from comments.models import Comment, Recomment
+from .buffer import flush_likes, pending_likes
+from .checks import check_like_write_buffer
+from .views import CommentLikes, FeedLikes
 
 
 # Create your tests here.
@@ -125,3 +135,345 @@ class CommentLikeView(APITestCase):
             0,
             "delete comment Like",
         )
+
+
+class LikeToggleConcurrency(TransactionTestCase):
+    THREADS = 8
+    TOGGLES = 5
+
+    def setUp(self):
+        self.user = User.objects.create(username="TestUser")
+        self.group = Group.objects.create(name="Testgroup")
+        self.category = Category.objects.create(name="TestCategory", group=self.group)
+        self.feed = Feed.objects.create(
+            user=self.user,
+            group=self.group,
+            category=self.category,
+            title="Test Title",
+        )
+        self.comment = Comment.objects.create(feed=self.feed, user=self.user)
+
+    def hammer(self, view, url, pk):
+        factory = APIRequestFactory()
+        barrier = threading.Barrier(self.THREADS)
+        errors = []
+
+        def toggle():
+            try:
+                barrier.wait()
+                for _ in range(self.TOGGLES):
+                    # SQLite 는 쓰기 잠금에 실패하면 바로 에러를 내므로 다시 시도합니다.
+                    while True:
+                        request = factory.post(url)
+                        force_authenticate(request, user=self.user)
+                        try:
+                            response = view(request, pk=pk)
+                            break
+                        except OperationalError:
+                            time.sleep(0.001)
+                    if response.status_code != 200:
+                        errors.append(response.status_code)
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=toggle) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def test_feed_like_toggle(self):
+        self.hammer(
+            FeedLikes.as_view(), f"/api/v1/likes/feedlike/{self.feed.pk}", self.feed.pk
+        )
+        likes = Feedlike.objects.filter(user=self.user, feed=self.feed).count()
+        self.feed.refresh_from_db()
+        self.assertLessEqual(likes, 1)
+        self.assertEqual(self.feed.like_count, likes)
+
+    def test_comment_like_toggle(self):
+        self.hammer(
+            CommentLikes.as_view(),
+            f"/api/v1/likes/commentlike/{self.comment.pk}",
+            self.comment.pk,
+        )
+        likes = Commentlike.objects.filter(user=self.user, comment=self.comment).count()
+        self.comment.refresh_from_db()
+        self.assertLessEqual(likes, 1)
+        self.assertEqual(self.comment.like_count, likes)
+
+    def test_duplicate_feed_like_rejected(self):
+        Feedlike.objects.create(user=self.user, feed=self.feed)
+        with self.assertRaises(IntegrityError):
+            Feedlike.objects.create(user=self.user, feed=self.feed)
+
+    def test_other_integrity_errors_are_raised(self):
+        with mock.patch.object(
+            Feedlike.objects, "create", side_effect=IntegrityError("other")
+        ):
+            with self.assertRaises(IntegrityError):
+                Feedlike.objects.toggle(self.user, feed=self.feed)
+        self.assertEqual(
+            Feedlike.objects.toggle(self.user, feed=self.feed), (True, True)
+        )
+
+
+# 좋아요 모아서 반영하기 (LIKE_WRITE_BUFFER)
+@override_settings(LIKE_WRITE_BUFFER=True)
+@mock.patch(
+    "common.caches.SHARED_CACHE_BACKENDS",
+    ("django.core.cache.backends.locmem.LocMemCache",),
+)
+class LikeWriteBuffer(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.group = Group.objects.create(name="oz")
+        self.user = User.objects.create(
+            username="TestUser", email="test@test.com", group=self.group
+        )
+        self.other = User.objects.create(
+            username="OtherUser", email="other@test.com", group=self.group
+        )
+        self.category = Category.objects.get(group=self.group, name="일반글")
+        self.feed = Feed.objects.create(
+            user=self.user,
+            group=self.group,
+            category=self.category,
+            title="Test Title",
+            like_count=1,
+        )
+        Feedlike.objects.create(user=self.other, feed=self.feed)
+        self.URL = f"/api/v1/likes/feedlike/{self.feed.pk}"
+        self.DETAIL_URL = f"/api/v1/feeds/{self.feed.pk}/"
+        self.GROUP_URL = (
+            f"/api/v1/feeds/group/category/"
+            f"?group_id={self.group.pk}&category_id={self.category.pk}"
+        )
+
+    def toggle(self, user):
+        self.client.force_login(user)
+        return self.client.post(self.URL).data
+
+    def test_toggle_is_buffered_until_flush(self):
+        self.assertEqual(self.toggle(self.user), {"created"})
+        self.assertEqual(self.toggle(self.other), {"deleted"})
+        # DB 에는 아직 반영되지 않았지만 조회에는 반영됩니다.
+        self.assertFalse(Feedlike.objects.filter(user=self.user).exists())
+        self.assertTrue(Feedlike.objects.filter(user=self.other).exists())
+        self.client.force_login(self.user)
+        response = self.client.get(self.DETAIL_URL)
+        self.assertEqual(response.data["like_count"], 1)
+        self.assertTrue(response.data["is_like"])
+        response = self.client.get(self.GROUP_URL)
+        self.assertEqual(response.data["results"][0]["like_count"], 1)
+        self.assertTrue(response.data["results"][0]["is_like"])
+        self.client.force_login(self.other)
+        response = self.client.get(self.GROUP_URL)
+        self.assertFalse(response.data["results"][0]["is_like"])
+
+        self.assertEqual(flush_likes(), 2)
+        self.assertTrue(Feedlike.objects.filter(user=self.user).exists())
+        self.assertFalse(Feedlike.objects.filter(user=self.other).exists())
+        self.feed.refresh_from_db()
+        self.assertEqual(self.feed.like_count, 1)
+        self.assertEqual(pending_likes([self.feed.pk]), {})
+        self.client.force_login(self.user)
+        response = self.client.get(self.DETAIL_URL)
+        self.assertEqual(response.data["like_count"], 1)
+        self.assertTrue(response.data["is_like"])
+
+    def test_toggles_are_coalesced(self):
+        for _ in range(3):
+            self.toggle(self.user)
+        self.toggle(self.user)
+        self.assertEqual(pending_likes([self.feed.pk]), {})
+        self.assertEqual(flush_likes(), 0)
+        self.assertEqual(self.toggle(self.user), {"created"})
+        self.assertEqual(flush_likes(), 1)
+        self.assertEqual(self.toggle(self.user), {"deleted"})
+        self.assertEqual(flush_likes(), 1)
+        self.feed.refresh_from_db()
+        self.assertEqual(self.feed.like_count, 1)
+        self.assertFalse(Feedlike.objects.filter(user=self.user).exists())
+
+    def test_flush_batches_writes(self):
+        users = [
+            User.objects.create(
+                username=f"user{index}", email=f"user{index}@test.com", group=self.group
+            )
+            for index in range(10)
+        ]
+        for user in users:
+            self.toggle(user)
+        # 좋아요 수와 상관없이 한번의 INSERT 와 게시글마다 좋아요 수 / 인기 점수 갱신
+        with self.assertNumQueries(13):
+            self.assertEqual(flush_likes(), 10)
+        self.feed.refresh_from_db()
+        self.assertEqual(self.feed.like_count, 11)
+        self.assertEqual(Feedlike.objects.filter(feed=self.feed).count(), 11)
+
+    def test_skipped_inserts_do_not_count(self):
+        self.toggle(self.user)
+        # 다른 곳에서 먼저 만들어져 ignore_conflicts 로 건너뛴 경우
+        with mock.patch.object(Feedlike.objects, "bulk_create"):
+            self.assertEqual(flush_likes(), 0)
+        self.feed.refresh_from_db()
+        self.assertEqual(self.feed.like_count, 1)
+
+    def test_already_flushed_rows_do_not_count(self):
+        self.toggle(self.user)
+        Feedlike.objects.create(user=self.user, feed=self.feed)
+        self.assertEqual(flush_likes(), 0)
+        self.feed.refresh_from_db()
+        self.assertEqual(self.feed.like_count, 1)
+
+    def test_pending_count_lives_with_state(self):
+        self.toggle(self.user)
+        self.toggle(self.other)
+        self.toggle(self.other)
+        record = cache.get(f"likes:buffer:feed:{self.feed.pk}")
+        self.assertEqual(
+            record["users"], {self.user.pk: (True, False), self.other.pk: (True, True)}
+        )
+        self.assertEqual(pending_likes([self.feed.pk]), {self.feed.pk: 1})
+        flush_likes()
+        self.assertEqual(cache.get(f"likes:buffer:feed:{self.feed.pk}")["users"], {})
+        # 반영된 뒤에 누르면 DB 의 상태를 기준으로 다시 기록합니다.
+        self.assertEqual(self.toggle(self.user), {"deleted"})
+        self.assertEqual(pending_likes([self.feed.pk]), {self.feed.pk: -1})
+
+    def test_my_likes_flush_own_buffer(self):
+        self.toggle(self.user)
+        self.client.force_login(self.user)
+        response = self.client.get("/api/v1/users/me/feedlike/")
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["results"][0]["id"], self.feed.pk)
+        self.assertEqual(response.data["results"][0]["like_count"], 2)
+        self.assertTrue(Feedlike.objects.filter(user=self.user).exists())
+        self.assertEqual(pending_likes([self.feed.pk]), {})
+        self.toggle(self.user)
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get("/api/v1/users/me/feedlike/").data, [])
+
+    def test_like_list_flushes_own_buffer(self):
+        self.toggle(self.user)
+        self.client.force_login(self.user)
+        response = self.client.get("/api/v1/users/me/likelist/", {"cursor": ""})
+        self.assertEqual(
+            [(like["type"], like["target"]["id"]) for like in response.data["results"]],
+            [("feed", self.feed.pk)],
+        )
+        self.assertEqual(response.data["results"][0]["target"]["like_count"], 2)
+        self.assertEqual(pending_likes([self.feed.pk]), {})
+
+
+@override_settings(LIKE_WRITE_BUFFER=True)
+class LikeWriteBufferWithoutSharedCache(APITestCase):
+    def test_refuses_local_memory_cache(self):
+        self.assertEqual(
+            [error.id for error in check_like_write_buffer(None)], ["likes.E001"]
+        )
+        with self.assertRaises(ImproperlyConfigured):
+            pending_likes([1])
+
+
+class LikeStatusView(APITestCase):
+    URL = "/api/v1/likes/status/"
+
+    def setUp(self):
+        cache.clear()
+        self.group = Group.objects.create(name="oz")
+        self.other_group = Group.objects.create(name="other")
+        self.user = User.objects.create(
+            username="TestUser", email="test@test.com", group=self.group
+        )
+        self.category = Category.objects.get(group=self.group, name="일반글")
+        self.feeds = [
+            Feed.objects.create(
+                user=self.user,
+                group=self.group,
+                category=self.category,
+                title=f"feed {index}",
+                like_count=index,
+            )
+            for index in range(3)
+        ]
+        self.other_feed = Feed.objects.create(
+            user=self.user,
+            group=self.other_group,
+            category=Category.objects.get(group=self.other_group, name="일반글"),
+            title="other",
+        )
+        self.comments = [
+            Comment.objects.create(feed=self.feeds[0], user=self.user) for _ in range(2)
+        ]
+        self.recomments = [
+            Recomment.objects.create(comment=self.comments[0], user=self.user)
+            for _ in range(2)
+        ]
+        Feedlike.objects.create(user=self.user, feed=self.feeds[1])
+        Commentlike.objects.create(user=self.user, comment=self.comments[1])
+        Commentlike.objects.create(user=self.user, recomment=self.recomments[0])
+        self.client.force_login(self.user)
+
+    def get_status(self, feeds=(), comments=(), recomments=()):
+        return self.client.get(
+            self.URL,
+            {
+                "feeds": ",".join(map(str, feeds)),
+                "comments": ",".join(map(str, comments)),
+                "recomments": ",".join(map(str, recomments)),
+            },
+        )
+
+    def test_status(self):
+        feed_pks = [feed.pk for feed in self.feeds]
+        response = self.get_status(
+            [*reversed(feed_pks), self.other_feed.pk, 999],
+            [comment.pk for comment in self.comments],
+            [recomment.pk for recomment in self.recomments],
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data["feeds"],
+            {
+                "liked": [feed_pks[1]],
+                "counts": {feed_pks[2]: 2, feed_pks[1]: 1, feed_pks[0]: 0},
+            },
+        )
+        self.assertEqual(
+            response.data["comments"],
+            {
+                "liked": [self.comments[1].pk],
+                "counts": {self.comments[0].pk: 0, self.comments[1].pk: 1},
+            },
+        )
+        self.assertEqual(
+            response.data["recomments"],
+            {
+                "liked": [self.recomments[0].pk],
+                "counts": {self.recomments[0].pk: 1, self.recomments[1].pk: 0},
+            },
+        )
+
+    def test_constant_queries(self):
+        # 세션 / 유저 조회 + 피드, 피드 좋아요, 댓글, 대댓글, 댓글 좋아요
+        with self.assertNumQueries(7):
+            self.get_status(
+                [self.feeds[0].pk], [self.comments[0].pk], [self.recomments[0].pk]
+            )
+        with self.assertNumQueries(7):
+            self.get_status(
+                [feed.pk for feed in self.feeds],
+                [comment.pk for comment in self.comments],
+                [recomment.pk for recomment in self.recomments],
+            )
+
+    def test_invalid_ids(self):
+        self.assertEqual(self.get_status().status_code, 400)
+        self.assertEqual(self.client.get(self.URL, {"feeds": "a"}).status_code, 400)
+        response = self.get_status(range(1, 102))
+        self.assertEqual(response.status_code, 400)
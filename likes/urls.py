@@ -5,4 +5,5 @@ urlpatterns = [
     path("feedlike/<int:pk>", views.FeedLikes.as_view()),
     path("commentlike/<int:pk>", views.CommentLikes.as_view()),
     path("recommentlike/<int:pk>", views.ReCommentLikes.as_view()),
+    path("status/", views.LikeStatus.as_view()),
 ]
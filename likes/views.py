@@ -5,10 +5,14 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import NotFound, ParseError
 from . import serializers
-from .models import Feedlike, Commentlike
+from .models import Commentlike
 from feeds.models import Feed
+from .buffer import liked_feed_ids, pending_likes, toggle_feed_like
 from django.shortcuts import get_object_or_404
+from django.db.models import Q
 from comments.models import Comment, Recomment
+from comments.caches import bump_thread_version
+from comments.querysets import with_like_count
 
 
 class FeedLikes(APIView):
@@ -24,9 +28,9 @@ class FeedLikes(APIView):
     )
     def post(self, request, pk):
         feed = get_object_or_404(Feed, pk=pk)
-        like, created = Feedlike.objects.get_or_create(user=request.user, feed=feed)
-        like.delete() if not created else None
-        return Response({"created" if created else "deleted"})
+        # LIKE_WRITE_BUFFER 가 켜져 있으면 캐시에 기록하고 모아서 반영합니다.
+        liked = toggle_feed_like(request.user, feed)
+        return Response({"created" if liked else "deleted"})
 
 
 class CommentLikes(APIView):
@@ -42,11 +46,11 @@ class CommentLikes(APIView):
     )
     def post(self, request, pk):
         comment = get_object_or_404(Comment, pk=pk)
-        like, created = Commentlike.objects.get_or_create(
-            user=request.user, comment=comment
-        )
-        like.delete() if not created else None
-        return Response({"created" if created else "deleted"})
+        # 댓글 좋아요 수와 베스트 댓글은 signals 에서 갱신합니다.
+        liked, changed = Commentlike.objects.toggle(request.user, comment=comment)
+        if changed:
+            bump_thread_version(comment.feed_id)
+        return Response({"created" if liked else "deleted"})
 
 
 class ReCommentLikes(APIView):
@@ -61,9 +65,137 @@ class ReCommentLikes(APIView):
         },
     )
     def post(self, request, pk):
-        recomment = get_object_or_404(Recomment, pk=pk)
-        like, created = Commentlike.objects.get_or_create(
-            user=request.user, recomment=recomment
+        recomment = get_object_or_404(
+            Recomment.objects.select_related("comment"), pk=pk
+        )
+        liked, changed = Commentlike.objects.toggle(request.user, recomment=recomment)
+        if changed:
+            bump_thread_version(recomment.comment.feed_id)
+        return Response({"created" if liked else "deleted"})
+
+
+status_schema = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        "liked": openapi.Schema(
+            type=openapi.TYPE_ARRAY,
+            items=openapi.Schema(type=openapi.TYPE_INTEGER),
+            description="좋아요를 누른 pk",
+        ),
+        "counts": openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            description="pk 별 좋아요 수 ex) {1: 3}",
+        ),
+    },
+)
+
+
+class LikeStatus(APIView):
+    permission_classes = [IsAuthenticated]
+    max_ids = 100
+
+    @swagger_auto_schema(
+        operation_summary="여러 피드 / 댓글 / 대댓글의 좋아요 여부와 좋아요 수 조회",
+        operation_description="유저의 그룹이 아니거나 존재하지 않는 pk 는 결과에서 빠집니다.",
+        manual_parameters=[
+            openapi.Parameter(
+                name,
+                openapi.IN_QUERY,
+                description=f"{label} pk 목록 (쉼표로 구분, 최대 100개) ex) 1,2,3",
+                type=openapi.TYPE_STRING,
+            )
+            for name, label in (
+                ("feeds", "피드"),
+                ("comments", "댓글"),
+                ("recomments", "대댓글"),
+            )
+        ],
+        responses={
+            200: openapi.Response(
+                description="Successful Response",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        "feeds": status_schema,
+                        "comments": status_schema,
+                        "recomments": status_schema,
+                    },
+                ),
+            ),
+            400: "pk 목록이 올바르지 않거나 100개를 넘는 경우",
+        },
+    )
+    def get(self, request):
+        feed_ids = self.get_ids(request, "feeds")
+        comment_ids = self.get_ids(request, "comments")
+        recomment_ids = self.get_ids(request, "recomments")
+        if not (feed_ids or comment_ids or recomment_ids):
+            raise ParseError("feeds, comments or recomments is required")
+
+        user = request.user
+        feeds = Feed.objects.filter(pk__in=feed_ids)
+        comments = Comment.objects.filter(pk__in=comment_ids)
+        recomments = Recomment.objects.filter(pk__in=recomment_ids)
+        if not user.is_staff:
+            feeds = feeds.filter(group_id=user.group_id)
+            comments = comments.filter(feed__group_id=user.group_id)
+            recomments = recomments.filter(comment__feed__group_id=user.group_id)
+
+        # 종류마다 좋아요 수 한번, 좋아요 여부 한번 (댓글 / 대댓글은 함께) 조회합니다.
+        feed_counts = dict(feeds.values_list("pk", "like_count")) if feed_ids else {}
+        for pk, pending in pending_likes(list(feed_counts)).items():
+            feed_counts[pk] = max(feed_counts[pk] + pending, 0)
+        comment_counts = (
+            dict(comments.values_list("pk", "like_count")) if comment_ids else {}
+        )
+        recomment_counts = (
+            dict(with_like_count(recomments).values_list("pk", "like_count"))
+            if recomment_ids
+            else {}
         )
-        like.delete() if not created else None
-        return Response({"created" if created else "deleted"})
+
+        liked_comments, liked_recomments = set(), set()
+        if comment_counts or recomment_counts:
+            for comment_pk, recomment_pk in Commentlike.objects.filter(
+                Q(comment_id__in=list(comment_counts))
+                | Q(recomment_id__in=list(recomment_counts)),
+                user=user,
+            ).values_list("comment_id", "recomment_id"):
+                if comment_pk is not None:
+                    liked_comments.add(comment_pk)
+                if recomment_pk is not None:
+                    liked_recomments.add(recomment_pk)
+
+        return Response(
+            {
+                "feeds": self.get_status(
+                    feed_ids, feed_counts, liked_feed_ids(user, list(feed_counts))
+                ),
+                "comments": self.get_status(
+                    comment_ids, comment_counts, liked_comments
+                ),
+                "recomments": self.get_status(
+                    recomment_ids, recomment_counts, liked_recomments
+                ),
+            }
+        )
+
+    def get_ids(self, request, name):
+        try:
+            ids = list(
+                dict.fromkeys(
+                    int(pk) for pk in request.GET.get(name, "").split(",") if pk
+                )
+            )
+        except ValueError:
+            raise ParseError(f"{name} must be comma separated integers")
+        if len(ids) > self.max_ids:
+            raise ParseError(f"{name} can contain at most {self.max_ids} ids")
+        return ids
+
+    def get_status(self, ids, counts, liked):
+        # 요청한 순서대로 돌려줍니다.
+        return {
+            "liked": [pk for pk in ids if pk in counts and pk in liked],
+            "counts": {pk: counts[pk] for pk in ids if pk in counts},
+        }
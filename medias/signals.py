@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from feeds.models import Feed
+from .models import Image
+
+
+@receiver(post_save, sender=Image)
+@receiver(post_delete, sender=Image)
+def update_feed_thumbnail(sender, instance, **kwargs):
+    # 피드의 첫번째 이미지를 썸네일로 저장
+    thumbnail = (
+        Image.objects.filter(feed_id=instance.feed_id)
+        .order_by("pk")
+        .values_list("url", flat=True)
+        .first()
+    )
+    Feed.objects.filter(pk=instance.feed_id).update(thumbnail=thumbnail)
@@ -0,0 +1,132 @@
+from django.db.models import F, Value
+from rest_framework.fields import DateTimeField
+from comments.models import Comment, Recomment
+from comments.querysets import with_like_count
+from common.pagination import UnionCursorPaginator
+from feeds.models import Feed
+from likes.buffer import add_pending_likes
+from likes.models import Commentlike, Feedlike
+
+# 내 댓글 / 내 좋아요 목록은 종류별 queryset 을 UNION ALL 해서 시간순으로 합칩니다.
+# 같은 시간에 만들어진 경우 (kind, id) 순서로 정렬합니다.
+ACTIVITY_ORDERING = ("created_at", "kind", "id")
+BRANCH_ORDERING = ("created_at", "id")
+ACTIVITY_PAGE_SIZE = 20
+
+FEED, COMMENT, RECOMMENT = 0, 1, 2
+KIND_NAMES = {FEED: "feed", COMMENT: "comment", RECOMMENT: "recomment"}
+
+_created_at_field = DateTimeField()
+
+
+def _branch(queryset, kind, target):
+    return queryset.values("created_at", "id", kind=Value(kind), target=F(target))
+
+
+def comment_branches(user):
+    return [
+        _branch(Comment.objects.filter(user=user), COMMENT, "id"),
+        _branch(Recomment.objects.filter(user=user), RECOMMENT, "id"),
+    ]
+
+
+def like_branches(user, kinds=(FEED, COMMENT, RECOMMENT)):
+    branches = {
+        FEED: _branch(Feedlike.objects.filter(user=user), FEED, "feed_id"),
+        COMMENT: _branch(
+            Commentlike.objects.filter(user=user, comment__isnull=False),
+            COMMENT,
+            "comment_id",
+        ),
+        RECOMMENT: _branch(
+            Commentlike.objects.filter(user=user, recomment__isnull=False),
+            RECOMMENT,
+            "recomment_id",
+        ),
+    }
+    return [branches[kind] for kind in kinds]
+
+
+def activity_page(branches, cursor=None, per_page=ACTIVITY_PAGE_SIZE):
+    paginator = UnionCursorPaginator(
+        branches, ACTIVITY_ORDERING, per_page, BRANCH_ORDERING
+    )
+    return paginator.page(cursor)
+
+
+def _load_targets(rows):
+    # 종류마다 한번씩만 조회합니다.
+    pks = {kind: [] for kind in KIND_NAMES}
+    for row in rows:
+        pks[row["kind"]].append(row["target"])
+    targets = {kind: {} for kind in KIND_NAMES}
+    if pks[FEED]:
+        feeds = [
+            {
+                "id": feed["id"],
+                "title": feed["title"],
+                "thumbnail": feed["thumbnail"],
+                "like_count": feed["like_count"],
+                "comments_count": feed["comments_count"],
+            }
+            for feed in Feed.objects.filter(pk__in=pks[FEED]).values(
+                "id", "title", "thumbnail", "like_count", "comments_count"
+            )
+        ]
+        targets[FEED] = {feed["id"]: feed for feed in add_pending_likes(feeds)}
+    if pks[COMMENT]:
+        for comment in Comment.objects.filter(pk__in=pks[COMMENT]).values(
+            "id",
+            "description",
+            "created_at",
+            "like_count",
+            "feed_id",
+            feed_title=F("feed__title"),
+        ):
+            targets[COMMENT][comment["id"]] = _comment_data(comment)
+    if pks[RECOMMENT]:
+        recomments = with_like_count(Recomment.objects.filter(pk__in=pks[RECOMMENT]))
+        for recomment in recomments.values(
+            "id",
+            "description",
+            "created_at",
+            "like_count",
+            "comment_id",
+            feed_id=F("comment__feed_id"),
+            feed_title=F("comment__feed__title"),
+        ):
+            targets[RECOMMENT][recomment["id"]] = _comment_data(recomment)
+    return targets
+
+
+def _comment_data(row):
+    return {
+        "id": row["id"],
+        "description": row["description"],
+        "created_at": _created_at_field.to_representation(row["created_at"]),
+        "commentlikeCount": row["like_count"],
+        "comment": row.get("comment_id"),
+        "feed": {"id": row["feed_id"], "title": row["feed_title"]},
+    }
+
+
+def serialize_comments(rows):
+    targets = _load_targets(rows)
+    return [
+        {"type": KIND_NAMES[row["kind"]], **targets[row["kind"]][row["target"]]}
+        for row in rows
+        if row["target"] in targets[row["kind"]]
+    ]
+
+
+def serialize_likes(rows):
+    targets = _load_targets(rows)
+    return [
+        {
+            "type": KIND_NAMES[row["kind"]],
+            "liked_at": _created_at_field.to_representation(row["created_at"]),
+            "target": targets[row["kind"]][row["target"]],
+        }
+        for row in rows
+        if row["target"] in targets[row["kind"]]
+    ]
@@ -1,6 +1,8 @@
+from django.core.cache import cache
 from rest_framework.test import APITestCase
 from .models import User
-from likes.models import Feedlike
+from likes.models import Commentlike, Feedlike
+from comments.models import Comment, Recomment
 from feeds.models import Feed
 from groups.models import Group
 from categories.models import Category
@@ -98,6 +100,201 @@ class SelfUsersFeedLikeView(APITestCase):
         )
 
 
+# 좋아요 누른 게시글 목록 페이지네이션
+class SelfUsersFeedLikePagination(APITestCase):
+    URL = "/api/v1/users/me/feedlike/"
+
+    def setUp(self):
+        cache.clear()
+        self.group = Group.objects.create(name="Testgroup")
+        self.user = User.objects.create(username="TestUser", group=self.group)
+        self.category = Category.objects.get(group=self.group, name="일반글")
+        self.client.force_login(self.user)
+
+    def like_feeds(self, count):
+        feeds = [
+            Feed.objects.create(
+                user=self.user,
+                group=self.group,
+                category=self.category,
+                title=f"feed {index}",
+            )
+            for index in range(count)
+        ]
+        # 게시글 작성 순서와 반대로 좋아요를 누릅니다.
+        for feed in reversed(feeds):
+            Feedlike.objects.create(user=self.user, feed=feed)
+        return feeds
+
+    def test_ordered_by_like_time(self):
+        feeds = self.like_feeds(15)
+        response = self.client.get(self.URL)
+        self.assertEqual(response.data["count"], 15)
+        self.assertEqual(
+            [feed["id"] for feed in response.data["results"]],
+            [feed.pk for feed in feeds[:12]],
+        )
+        self.assertEqual(
+            set(response.data["results"][0]),
+            {"id", "title", "thumbnail", "like_count", "comments_count"},
+        )
+
+        response = self.client.get(self.URL, {"cursor": ""})
+        pks = [feed["id"] for feed in response.data["results"]]
+        response = self.client.get(self.URL, {"cursor": response.data["next"]})
+        pks += [feed["id"] for feed in response.data["results"]]
+        self.assertIsNone(response.data["next"])
+        self.assertEqual(pks, [feed.pk for feed in feeds])
+
+    def test_queries_independent_of_like_count(self):
+        self.like_feeds(3)
+        # 세션 / 유저 + 페이지 조회 (페이지 번호 방식은 캐시된 개수가 없을 때 COUNT 추가)
+        with self.assertNumQueries(3):
+            self.client.get(self.URL, {"cursor": ""})
+        with self.assertNumQueries(4):
+            self.client.get(self.URL)
+        with self.assertNumQueries(3):
+            self.client.get(self.URL)
+        self.like_feeds(40)
+        with self.assertNumQueries(3):
+            response = self.client.get(self.URL, {"cursor": ""})
+        with self.assertNumQueries(3):
+            self.client.get(self.URL, {"cursor": response.data["next"]})
+        with self.assertNumQueries(4):
+            response = self.client.get(self.URL, {"page": 3})
+        self.assertEqual(response.data["count"], 43)
+        with self.assertNumQueries(3):
+            self.client.get(self.URL, {"page": 2})
+
+    def test_count_follows_unlike(self):
+        feed = self.like_feeds(2)[0]
+        self.assertEqual(self.client.get(self.URL).data["count"], 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.URL, {"feed": feed.pk})
+        self.assertEqual(self.client.get(self.URL).data["count"], 1)
+
+
+# 내 댓글 / 내 좋아요 목록
+class SelfUsersActivity(APITestCase):
+    def setUp(self):
+        self.group = Group.objects.create(name="Testgroup")
+        self.user = User.objects.create(
+            username="TestUser", email="test@test.com", group=self.group
+        )
+        self.writer = User.objects.create(
+            username="Writer", email="writer@test.com", group=self.group
+        )
+        self.category = Category.objects.get(group=self.group, name="일반글")
+        self.client.force_login(self.user)
+
+    def create_activity(self, count):
+        # 게시글 좋아요 -> 댓글 -> 댓글 좋아요 -> 대댓글 -> 대댓글 좋아요 순서로 만듭니다.
+        items = []
+        for index in range(count):
+            feed = Feed.objects.create(
+                user=self.writer,
+                group=self.group,
+                category=self.category,
+                title=f"feed {index}",
+            )
+            feed_like = Feedlike.objects.create(user=self.user, feed=feed)
+            comment = Comment.objects.create(
+                feed=feed, user=self.user, description=f"comment {index}"
+            )
+            Commentlike.objects.create(user=self.user, comment=comment)
+            recomment = Recomment.objects.create(
+                comment=comment, user=self.user, description=f"recomment {index}"
+            )
+            Commentlike.objects.create(user=self.user, recomment=recomment)
+            items.append((feed, feed_like, comment, recomment))
+        return items
+
+    def read_all(self, url):
+        results, cursor = [], ""
+        while cursor is not None:
+            response = self.client.get(url, {"cursor": cursor})
+            self.assertEqual(response.status_code, 200)
+            results += response.data["results"]
+            cursor = response.data["next"]
+        return results
+
+    def test_comment_list(self):
+        items = self.create_activity(12)
+        results = self.read_all("/api/v1/users/me/commentlist/")
+        expected = []
+        for feed, _, comment, recomment in reversed(items):
+            expected += [("recomment", recomment.pk), ("comment", comment.pk)]
+        self.assertEqual([(item["type"], item["id"]) for item in results], expected)
+        feed, _, comment, recomment = items[-1]
+        self.assertEqual(results[0]["comment"], comment.pk)
+        self.assertEqual(results[0]["commentlikeCount"], 1)
+        self.assertEqual(results[0]["feed"], {"id": feed.pk, "title": feed.title})
+        self.assertEqual(results[1]["description"], comment.description)
+
+    def test_like_list(self):
+        items = self.create_activity(8)
+        results = self.read_all("/api/v1/users/me/likelist/")
+        expected = []
+        for feed, _, comment, recomment in reversed(items):
+            expected += [
+                ("recomment", recomment.pk),
+                ("comment", comment.pk),
+                ("feed", feed.pk),
+            ]
+        self.assertEqual(
+            [(item["type"], item["target"]["id"]) for item in results], expected
+        )
+        self.assertEqual(results[2]["target"]["title"], items[-1][0].title)
+
+        results = self.read_all("/api/v1/users/me/commentlike/")
+        self.assertEqual(
+            [item["type"] for item in results], ["recomment", "comment"] * 8
+        )
+
+    def test_queries_independent_of_activity(self):
+        self.create_activity(2)
+        # 세션 / 유저 + UNION 1번 + 종류별 조회
+        with self.assertNumQueries(5):
+            self.client.get("/api/v1/users/me/commentlist/")
+        with self.assertNumQueries(6):
+            self.client.get("/api/v1/users/me/likelist/")
+        self.create_activity(30)
+        with self.assertNumQueries(5):
+            response = self.client.get("/api/v1/users/me/commentlist/")
+        with self.assertNumQueries(5):
+            self.client.get(
+                "/api/v1/users/me/commentlist/", {"cursor": response.data["next"]}
+            )
+        with self.assertNumQueries(6):
+            response = self.client.get("/api/v1/users/me/likelist/")
+        with self.assertNumQueries(6):
+            self.client.get(
+                "/api/v1/users/me/likelist/", {"cursor": response.data["next"]}
+            )
+
+    def test_previous_cursor(self):
+        self.create_activity(15)
+        first = self.client.get("/api/v1/users/me/commentlist/")
+        second = self.client.get(
+            "/api/v1/users/me/commentlist/", {"cursor": first.data["next"]}
+        )
+        back = self.client.get(
+            "/api/v1/users/me/commentlist/", {"cursor": second.data["previous"]}
+        )
+        self.assertEqual(back.data["results"], first.data["results"])
+
+    def test_toggle_comment_like(self):
+        _, _, comment, _ = self.create_activity(1)[0]
+        url = "/api/v1/users/me/commentlike/"
+        response = self.client.post(url, {"comment": comment.pk})
+        self.assertEqual(response.data, {"result": "delete success"})
+        response = self.client.post(url, {"comment": comment.pk})
+        self.assertEqual(response.data, {"result": "create success"})
+        comment.refresh_from_db()
+        self.assertEqual(comment.like_count, 1)
+        self.assertEqual(self.client.post(url, {"comment": 0}).status_code, 404)
+
+
 class SelfUsersFeedListView(APITestCase):
     URL = "/api/v1/users/me/feedlist/"
 
@@ -5,10 +5,10 @@ from rest_framework_simplejwt.views import TokenRefreshView
 urlpatterns = [
     path("me/", views.Me.as_view()),
     path("me/feedlike/", views.FeedLikes.as_view()),
-    # path("me/commentlike/", views.CommentLikes.as_view()),
+    path("me/commentlike/", views.CommentLikes.as_view()),
     path("me/feedlist/", views.FeedList.as_view()),
-    # path("me/commentlist/", views.CommentList.as_view()),
-    # path("me/likelist/", views.LikeList.as_view()),
+    path("me/commentlist/", views.CommentList.as_view()),
+    path("me/likelist/", views.LikeList.as_view()),
     # path("@<str:username>/", views.UserDetail.as_view()),
     path("login/", views.LogIn.as_view()),
     path("logout/", views.LogOut.as_view()),
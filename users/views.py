@@ -12,20 +12,40 @@ from .models import User
 from django.contrib.auth import authenticate, login, logout
 from likes.models import Feedlike, Commentlike
 from feeds.models import Feed
-from likes.serializers import FeedLikeSerializer, CommentLikeSerializer
+from feeds.caches import get_group_version
+from likes.serializers import FeedLikeSerializer
 import re
 from rest_framework_simplejwt.tokens import RefreshToken
-from django.core.paginator import Paginator
-from feeds.serializers import FeedSerializer, TinyFeedSerializer
+from feeds.serializers import (
+    TinyFeedSerializer,
+    feed_rows,
+    serialize_feed_rows,
+)
 from comments.models import Comment
-from comments.serializers import CommentSerializer, TinyCommentSerializer
-from django.db.models import Q
 from likes.models import Feedlike, Commentlike
-from feeds.views import feed_schema
+from feeds.views import feed_schema, sparse_field_parameters
 from django.shortcuts import get_object_or_404
 from groups.models import Group
 from accessinfo.models import AccessInfo
 from django.core.cache import cache
+from common.pagination import CountedPaginator, CursorPaginator, cached_count
+from likes.buffer import (
+    add_pending_likes,
+    flush_user_likes,
+    like_count_key,
+    toggle_feed_like,
+)
+from comments.caches import bump_thread_version
+from .activity import (
+    COMMENT,
+    RECOMMENT,
+    activity_page,
+    comment_branches,
+    like_branches,
+    serialize_comments,
+    serialize_likes,
+)
+from common.serializers import filter_fields
 
 
 class Me(APIView):
@@ -131,6 +151,68 @@ class LogOut(APIView):
         return Response({"LogOut": True})
 
 
+activity_cursor_parameter = openapi.Parameter(
+    "cursor",
+    openapi.IN_QUERY,
+    description="커서 기반 페이지네이션 (1 페이지당 20개, 값이 없으면 첫 페이지) \n - next : 다음 페이지 커서 \n - previous : 이전 페이지 커서 \n - results : 최신순",
+    type=openapi.TYPE_STRING,
+)
+
+activity_comment_schema = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        "type": openapi.Schema(
+            type=openapi.TYPE_STRING, description="comment / recomment"
+        ),
+        "id": openapi.Schema(type=openapi.TYPE_INTEGER),
+        "description": openapi.Schema(type=openapi.TYPE_STRING),
+        "created_at": openapi.Schema(type=openapi.TYPE_STRING),
+        "commentlikeCount": openapi.Schema(type=openapi.TYPE_INTEGER),
+        "comment": openapi.Schema(
+            type=openapi.TYPE_INTEGER, description="대댓글인 경우 댓글 pk"
+        ),
+        "feed": openapi.Schema(type=openapi.TYPE_OBJECT, description="게시글 id / title"),
+    },
+)
+
+activity_like_schema = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        "type": openapi.Schema(
+            type=openapi.TYPE_STRING, description="feed / comment / recomment"
+        ),
+        "liked_at": openapi.Schema(type=openapi.TYPE_STRING),
+        "target": openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            description="좋아요를 누른 게시글(TinyFeed) / 댓글 / 대댓글",
+        ),
+    },
+)
+
+
+def activity_response(schema):
+    return openapi.Response(
+        description="Successful Response",
+        schema=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "next": openapi.Schema(type=openapi.TYPE_STRING),
+                "previous": openapi.Schema(type=openapi.TYPE_STRING),
+                "results": openapi.Schema(type=openapi.TYPE_ARRAY, items=schema),
+            },
+        ),
+    )
+
+
+LIKED_FEED_FIELDS = (
+    "feed_id",
+    "feed__title",
+    "feed__thumbnail",
+    "feed__like_count",
+    "feed__comments_count",
+)
+
+
 class FeedLikes(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -142,21 +224,54 @@ class FeedLikes(APIView):
 
     @swagger_auto_schema(
         operation_summary="피드 좋아요 조회 api",
+        operation_description="좋아요를 누른 순서(최신순)로 조회합니다.",
+        manual_parameters=[
+            openapi.Parameter(
+                "page",
+                openapi.IN_QUERY,
+                description="1 페이지당 12개의 데이터",
+                type=openapi.TYPE_INTEGER,
+            ),
+            openapi.Parameter(
+                "cursor",
+                openapi.IN_QUERY,
+                description="커서 기반 페이지네이션 (값이 없으면 첫 페이지) \n - next : 다음 페이지 커서 \n - previous : 이전 페이지 커서 \n - results : 순서",
+                type=openapi.TYPE_STRING,
+            ),
+            *sparse_field_parameters,
+        ],
         responses={
             200: openapi.Response(
                 description="Successful Response",
-                schema=FeedLikeSerializer(),
+                schema=TinyFeedSerializer(many=True),
             )
         },
     )
     def get(self, request):
-        feedlike = Feedlike.objects.filter(user=request.user)
-        if not feedlike:
+        # 아직 DB 에 반영되지 않은 내 좋아요를 먼저 반영합니다. (LIKE_WRITE_BUFFER)
+        flush_user_likes(request.user.pk)
+        # 좋아요와 게시글을 JOIN 해서 한 페이지만 조회합니다.
+        likes = Feedlike.objects.filter(user=request.user)
+        rows = likes.values("id", "created_at", *LIKED_FEED_FIELDS)
+        items_per_page = 12
+        if "cursor" in request.GET:
+            paginator = CursorPaginator(rows, ("created_at", "id"), items_per_page)
+            page = paginator.page(request.GET.get("cursor"))
+            return Response(
+                {
+                    "next": page.next_cursor,
+                    "previous": page.previous_cursor,
+                    "results": self.serialize_rows(page, request),
+                }
+            )
+
+        count = cached_count(likes, like_count_key(request.user.pk))
+        if not count:
             return Response([])
-        feedlike = [i.feed for i in feedlike]
         current_page = request.GET.get("page", 1)
-        items_per_page = 12
-        paginator = Paginator(feedlike, items_per_page)
+        paginator = CountedPaginator(
+            rows.order_by("-created_at", "-id"), items_per_page, count=count
+        )
         try:
             page = paginator.page(current_page)
         except:
@@ -164,18 +279,28 @@ class FeedLikes(APIView):
 
         if int(current_page) > int(paginator.num_pages):
             raise ParseError("that page is out of range")
-        serializer = TinyFeedSerializer(
-            page,
-            many=True,
-        )
         data = {
             "total_pages": paginator.num_pages,
             "now_page": page.number,
             "count": paginator.count,
-            "results": serializer.data,
+            "results": self.serialize_rows(page, request),
         }
         return Response(data)
 
+    def serialize_rows(self, rows, request):
+        # TinyFeedSerializer 와 같은 필드를 돌려줍니다.
+        results = [
+            {
+                "id": row["feed_id"],
+                "title": row["feed__title"],
+                "thumbnail": row["feed__thumbnail"],
+                "like_count": row["feed__like_count"],
+                "comments_count": row["feed__comments_count"],
+            }
+            for row in rows
+        ]
+        return filter_fields(add_pending_likes(results), request)
+
     @swagger_auto_schema(
         operation_summary="피드 좋아요 생성 api",
         request_body=openapi.Schema(
@@ -197,22 +322,10 @@ class FeedLikes(APIView):
         feed = self.get_object(request.data.get("feed"))
         serializer = FeedLikeSerializer(data=request.data)
         if serializer.is_valid():
-            if Feedlike.objects.filter(
-                user=request.user,
-                feed=feed,
-            ).exists():
-                Feedlike.objects.filter(
-                    user=request.user,
-                    feed=feed,
-                ).delete()
-                return Response({"result": "delete success"})
-            else:
-                feedlike = serializer.save(
-                    user=request.user,
-                    feed=feed,
-                )
-                serializer = FeedLikeSerializer(feedlike)
+            liked = toggle_feed_like(request.user, feed)
+            if liked:
                 return Response({"result": "create success"})
+            return Response({"result": "delete success"})
         else:
             return Response(serializer.errors, status=400)
 
@@ -220,28 +333,23 @@ class FeedLikes(APIView):
 class CommentLikes(APIView):
     permission_classes = [IsAuthenticated]
 
-    def get_object(self, pk):
-        try:
-            return Feed.objects.get(pk=pk)
-        except Feed.DoesNotExist:
-            raise NotFound
-
     @swagger_auto_schema(
         operation_summary="댓글 좋아요 조회 api",
-        responses={
-            200: openapi.Response(
-                description="Successful Response",
-                schema=CommentLikeSerializer(),
-            )
-        },
+        manual_parameters=[activity_cursor_parameter],
+        responses={200: activity_response(activity_like_schema)},
     )
     def get(self, request):
-        commentlike = Commentlike.objects.filter(user=request.user)
-        serializer = CommentLikeSerializer(
-            commentlike,
-            many=True,
+        page = activity_page(
+            like_branches(request.user, (COMMENT, RECOMMENT)),
+            request.GET.get("cursor"),
+        )
+        return Response(
+            {
+                "next": page.next_cursor,
+                "previous": page.previous_cursor,
+                "results": serialize_likes(page),
+            }
         )
-        return Response(serializer.data)
 
     @swagger_auto_schema(
         operation_summary="댓글 좋아요 생성 api",
@@ -256,32 +364,22 @@ class CommentLikes(APIView):
         ),
         responses={
             200: openapi.Response(description="OK"),
-            400: openapi.Response(description="Invalid request data"),
             401: openapi.Response(description="The user is not authenticated"),
+            404: openapi.Response(description="Not exist Pk"),
         },
     )
     def post(self, request):
-        feed = self.get_object(request.data.get("feed"))
-        serializer = CommentLikeSerializer(data=request.data)
-        if serializer.is_valid():
-            if Commentlike.objects.filter(
-                user=request.user,
-                feed=feed,
-            ).exists():
-                Commentlike.objects.filter(
-                    user=request.user,
-                    feed=feed,
-                ).delete()
-                return Response({"result": "delete success"})
-            else:
-                feedlike = serializer.save(
-                    user=request.user,
-                    feed=feed,
-                )
-                serializer = CommentLikeSerializer(feedlike)
-                return Response({"result": "create success"})
-        else:
-            return Response(serializer.errors, status=400)
+        try:
+            comment = Comment.objects.get(pk=request.data.get("comment"))
+        except (Comment.DoesNotExist, ValueError, TypeError):
+            raise NotFound
+        # 댓글 좋아요 수와 베스트 댓글은 signals 에서 갱신합니다.
+        liked, changed = Commentlike.objects.toggle(request.user, comment=comment)
+        if changed:
+            bump_thread_version(comment.feed_id)
+        if liked:
+            return Response({"result": "create success"})
+        return Response({"result": "delete success"})
 
 
 class CheckID(APIView):
@@ -708,6 +806,13 @@ class FeedList(APIView):
                 description="1 페이지당 24개의 데이터 \n - num_pages : 총 페이지수 \n - current_page : 현재 페이지 \n - count : 총 개수 \n - results : 순서",
                 type=openapi.TYPE_INTEGER,
             ),
+            openapi.Parameter(
+                "cursor",
+                openapi.IN_QUERY,
+                description="커서 기반 페이지네이션 (값이 없으면 첫 페이지) \n - next : 다음 페이지 커서 \n - previous : 이전 페이지 커서 \n - results : 순서",
+                type=openapi.TYPE_STRING,
+            ),
+            *sparse_field_parameters,
         ],
         responses={
             200: openapi.Response(
@@ -735,9 +840,25 @@ class FeedList(APIView):
     )
     def get(self, request):
         feed = Feed.objects.filter(user=request.user).order_by("-created_at")
+        rows = feed_rows(feed)
         current_page = request.GET.get("page", 1)
         items_per_page = 12
-        paginator = Paginator(feed, items_per_page)
+        if "cursor" in request.GET:
+            paginator = CursorPaginator(rows, ("created_at", "id"), items_per_page)
+            page = paginator.page(request.GET.get("cursor"))
+            data = {
+                "next": page.next_cursor,
+                "previous": page.previous_cursor,
+                "results": serialize_feed_rows(page, request),
+            }
+            return Response(data)
+        # 게시글 작성 / 삭제시 그룹 버전이 바뀌므로 버전별로 개수를 캐시합니다.
+        count_key = "feeds:count:user:{}:v{}".format(
+            request.user.pk, get_group_version(request.user.group_id)
+        )
+        paginator = CountedPaginator(
+            rows, items_per_page, count=cached_count(feed, count_key)
+        )
         try:
             page = paginator.page(current_page)
         except:
@@ -746,17 +867,11 @@ class FeedList(APIView):
         if int(current_page) > int(paginator.num_pages):
             raise ParseError("that page is out of range")
 
-        serializer = FeedSerializer(
-            page,
-            many=True,
-            context={"request": request},
-        )
-
         data = {
             "total_pages": paginator.num_pages,
             "now_page": page.number,
             "count": paginator.count,
-            "results": serializer.data,
+            "results": serialize_feed_rows(page, request),
         }
 
         return Response(data)
@@ -766,39 +881,37 @@ class CommentList(APIView):
     permission_classes = [IsAuthenticated]
 
     @swagger_auto_schema(
-        operation_summary="유저의 댓글 리스트",
-        responses={
-            200: openapi.Response(
-                description="Successful Response",
-                schema=TinyCommentSerializer(many=True),
-            ),
-        },
+        operation_summary="유저의 댓글 / 대댓글 리스트",
+        manual_parameters=[activity_cursor_parameter],
+        responses={200: activity_response(activity_comment_schema)},
     )
     def get(self, request):
-        comments = (
-            Comment.objects.filter(
-                Q(user=request.user) | Q(recomment__user=request.user)
-            )
-            .distinct()
-            .order_by("created_at")
-        )
-        serializer = TinyCommentSerializer(
-            comments, many=True, context={"request": request}
+        page = activity_page(comment_branches(request.user), request.GET.get("cursor"))
+        return Response(
+            {
+                "next": page.next_cursor,
+                "previous": page.previous_cursor,
+                "results": serialize_comments(page),
+            }
         )
-        return Response(serializer.data)
 
 
 class LikeList(APIView):
     permission_classes = [IsAuthenticated]
 
+    @swagger_auto_schema(
+        operation_summary="유저가 좋아요를 누른 게시글 / 댓글 / 대댓글 리스트",
+        manual_parameters=[activity_cursor_parameter],
+        responses={200: activity_response(activity_like_schema)},
+    )
     def get(self, request):
-        comments = Commentlike.objects.filter(user=request.user)
-        comment_serializer = CommentSerializer(comments, many=True)
-        feeds = Feedlike.objects.filter(user=request.user)
-        feed_serializer = FeedSerializer(feeds, many=True)
+        # 아직 DB 에 반영되지 않은 내 피드 좋아요를 먼저 반영합니다. (LIKE_WRITE_BUFFER)
+        flush_user_likes(request.user.pk)
+        page = activity_page(like_branches(request.user), request.GET.get("cursor"))
         return Response(
             {
-                "like_comments": comment_serializer.data,
-                "like_feeds": feed_serializer.data,
+                "next": page.next_cursor,
+                "previous": page.previous_cursor,
+                "results": serialize_likes(page),
             }
         )